@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark the svgapi fetch path of ``generate_icons.py`` offline.
+
+Starts the local svgapi stand-in (``src/pipeline/stub_server.py``) and runs
+``fetch_row`` for every row with the same subject plan and run-wide caches
+``generate_icons.main`` builds (search and download LRUs, the negative cache
+and, with ``--adaptive-queries``, query statistics), reporting throughput,
+per-row tail latency and cache hit rates as JSON. The negative cache and
+query statistics start empty unless ``--negative-cache``/``--query-stats``
+name files from an earlier run; the benchmark never writes them back.
+
+Usage:
+    python benchmarks/bench_fetch.py --rows 10000 --latency 0.002 --error-rate 0.01
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from common import BUNDLED_CSV, percentile, scaled_rows, write_results
+
+from generate_icons import fetch_row, new_fetch_caches  # noqa: E402
+from pipeline.client import ResilientSession, endpoint_key  # noqa: E402
+from pipeline.metrics import RunMetrics  # noqa: E402
+from pipeline.negative_cache import DEFAULT_TTL_HOURS, NegativeCache  # noqa: E402
+from pipeline.planning import SubjectPlan  # noqa: E402
+from pipeline.query_stats import QueryStats  # noqa: E402
+from pipeline.stub_server import StubConfig, SvgapiStub  # noqa: E402
+from taxonomy.resolver import deepest_category  # noqa: E402
+
+API_KEY = "bench"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark fetch_icon_svg against the svgapi stand-in")
+    parser.add_argument("--rows", type=int, default=10_000, help="Number of taxonomy rows to fetch")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stub latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests failing with 503")
+    parser.add_argument("--miss-rate", type=float, default=0.3, help="Fraction of unmatched queries with no icons")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Stub throttle in requests per second")
+    parser.add_argument("--row-budget", type=float, default=10.0, help="Wall-clock budget per row in seconds")
+    parser.add_argument("--search-limit", type=int, default=50, help="Number of results to request per search")
+    parser.add_argument(
+        "--negative-ttl",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help="Hours to remember empty searches, as in generate_icons.py (0 disables the negative cache)",
+    )
+    parser.add_argument("--negative-cache", type=Path, help="Start from this negative cache file instead of empty")
+    parser.add_argument("--adaptive-queries", action="store_true", help="Order queries by hit-rate statistics")
+    parser.add_argument("--query-stats", type=Path, help="Start --adaptive-queries from this statistics file")
+    parser.add_argument("--split-compounds", action="store_true", help="Split Dutch compounds before searching")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=BUNDLED_CSV,
+        help="Taxonomy CSV/XLSX to draw rows from (e.g. a synthetic export)",
+    )
+    parser.add_argument("--out", type=Path, default=Path("benchmarks/results/fetch.json"), help="JSON output path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    rows = scaled_rows(args.rows, args.source)
+    subjects = []
+    for row in rows:
+        name = deepest_category(row) or row.get("Root category") or "Unknown"
+        subjects.append((row["Catid"], name.strip()))
+    config = StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        miss_rate=args.miss_rate,
+        rate_limit=args.rate_limit,
+    )
+    latencies = []
+    found = aborted = 0
+    metrics = RunMetrics()
+    with SvgapiStub(config) as stub:
+        args.api_key = API_KEY
+        args.api_base = stub.base_url
+        endpoint = endpoint_key(stub.base_url, API_KEY)
+        negative = None
+        if args.negative_ttl > 0:
+            ttl = args.negative_ttl * 3600
+            if args.negative_cache:
+                negative = NegativeCache.load(args.negative_cache, ttl, endpoint=endpoint)
+            else:
+                negative = NegativeCache(None, ttl, endpoint=endpoint)
+        caches = new_fetch_caches(negative)
+        query_stats = None
+        if args.adaptive_queries:
+            query_stats = QueryStats(endpoint=endpoint)
+            if args.query_stats:
+                query_stats = QueryStats.load(args.query_stats, endpoint)
+        session = ResilientSession(backoff_base=0.01, backoff_cap=0.1)
+        started = time.perf_counter()
+        plan = SubjectPlan(name for _, name in subjects)
+        for position, (catid, subject) in enumerate(subjects):
+            row_start = time.perf_counter()
+            svg, _, _, failure = fetch_row(
+                catid, subject, session, args, metrics, plan.state(position), caches, query_stats
+            )
+            plan.done(position)
+            found += bool(svg)
+            aborted += failure.startswith("fetch aborted")
+            latencies.append(time.perf_counter() - row_start)
+        elapsed = time.perf_counter() - started
+        requests_served = stub.requests_served
+
+    results = {
+        "rows": len(rows),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(rows) / elapsed, 1) if elapsed else 0.0,
+        "requests": requests_served,
+        "requests_per_row": round(requests_served / len(rows), 2) if rows else 0.0,
+        "found": found,
+        "aborted": aborted,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies, default=0.0) * 1000, 2),
+        },
+        "caches": metrics.to_dict()["caches"],
+        "queries_skipped": metrics.counters.get("queries_skipped", 0),
+        "stub": vars(config) | {"corpus_dir": str(config.corpus_dir)},
+    }
+    write_results(args.out, "fetch", results)
+    print(f"{results['rows']} rows in {results['seconds']}s ({results['rows_per_sec']} rows/s), "
+          f"{results['requests_per_row']} requests/row, p99 {results['latency_ms']['p99']} ms")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark the per-row hot paths of the icon pipeline at several sizes.
+
+Each stage runs once per row of a size tier (250, 10k and 100k rows by
+default). Stages are timed without tracing and then rerun under
+``tracemalloc`` to report the peak memory used while processing the tier;
+each result is discarded as it is made, so the peak excludes retained outputs.
+Results are written as JSON so runs can be compared as the taxonomy grows.
+
+Usage:
+    python benchmarks/bench_hot_paths.py --tiers 250,10000 --stages build_queries,restyle_svg
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from common import BUNDLED_CSV, ROOT, scaled_rows, write_results
+
+import generate_house_style_icons as house  # noqa: E402
+from taxonomy.resolver import deepest_category  # noqa: E402
+from taxonomy.synonyms import build_queries, expand_tokens, expansion_index, tokenize  # noqa: E402
+from update_background import update_svg  # noqa: E402
+from validate_outputs import check_style  # noqa: E402
+
+DEFAULT_TIERS = (250, 10_000, 100_000)
+FIXTURE_SVGS = ROOT / "tests" / "fixtures" / "svgapi" / "vector"
+
+# A stage turns the tier's rows into a list of inputs (untimed) and returns
+# the callable applied to each input (timed).
+Stage = Tuple[Callable[[List[Dict[str, str]], Path], List[Any]], Callable[[Any], Any]]
+
+
+def subjects(rows: List[Dict[str, str]]) -> List[str]:
+    return [deepest_category(row) or row["Catid"] for row in rows]
+
+
+def template_shapes(rows: List[Dict[str, str]]) -> List[List[house.Shape]]:
+    shapes = []
+    for row, subject in zip(rows, subjects(rows)):
+        ctx = house.IconContext(subject, house.sha_seed(row["Catid"]))
+        shapes.append(house.pick_template(subject)(ctx)[0])
+    return shapes
+
+
+def house_svgs(rows: List[Dict[str, str]]) -> List[str]:
+    return [house.svg_from_shapes(shapes)[0] for shapes in template_shapes(rows)]
+
+
+def downloaded_svgs(rows: List[Dict[str, str]]) -> List[str]:
+    corpus = []
+    for svg_path in sorted(FIXTURE_SVGS.glob("*.svg")):
+        text = svg_path.read_text("utf-8")
+        if text.rstrip().endswith("</svg>"):
+            corpus.append(text)
+    return [corpus[idx % len(corpus)] for idx in range(len(rows))]
+
+
+def svg_files(rows: List[Dict[str, str]], workdir: Path) -> List[Path]:
+    paths = []
+    for row, svg_text in zip(rows, house_svgs(rows)):
+        svg_path = workdir / f"{row['Catid']}.svg"
+        svg_path.write_text(svg_text, encoding="utf-8")
+        paths.append(svg_path)
+    return paths
+
+
+def indexed_subjects(rows: List[Dict[str, str]]) -> List[str]:
+    for lang in ("en", "nl"):
+        expansion_index(lang)  # built once per process; keep it out of the timing
+    return subjects(rows)
+
+
+def restyle_stage() -> Callable[[str], Any]:
+    from generate_icons import STYLE_VARIANTS, restyle_svg
+
+    params = STYLE_VARIANTS["brand"]
+    return lambda svg_text: restyle_svg(svg_text, params)
+
+
+STAGES: Dict[str, Callable[[], Stage]] = {
+    "deepest_category": lambda: (lambda rows, _: rows, deepest_category),
+    "build_queries": lambda: (lambda rows, _: indexed_subjects(rows), build_queries),
+    "expand_tokens": lambda: (lambda rows, _: [tokenize(s) for s in indexed_subjects(rows)], expand_tokens),
+    "pick_template": lambda: (lambda rows, _: subjects(rows), house.pick_template),
+    "svg_from_shapes": lambda: (lambda rows, _: template_shapes(rows), house.svg_from_shapes),
+    "restyle_svg": lambda: (lambda rows, _: downloaded_svgs(rows), restyle_stage()),
+    "check_style": lambda: (lambda rows, _: house_svgs(rows), check_style),
+    "update_svg": lambda: (svg_files, lambda svg_path: update_svg(svg_path, "#FFFFFF", None)),
+}
+
+
+def run_stage(name: str, rows: List[Dict[str, str]], measure_memory: bool) -> Dict[str, Any]:
+    prepare, func = STAGES[name]()
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+        inputs = prepare(rows, Path(tmp))
+        # Results are dropped as soon as they are made, so neither pass
+        # counts the cost of keeping every row's output alive.
+        started = time.perf_counter()
+        for item in inputs:
+            func(item)
+        elapsed = time.perf_counter() - started
+
+        peak = None
+        if measure_memory:
+            tracemalloc.start()
+            for item in inputs:
+                func(item)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    return {
+        "stage": name,
+        "rows": len(inputs),
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(len(inputs) / elapsed, 1) if elapsed else None,
+        "usec_per_op": round(elapsed / len(inputs) * 1e6, 2) if inputs else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def parse_list(value: str, choices: Sequence[str]) -> List[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}. Available: {', '.join(choices)}")
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark icon pipeline hot paths")
+    parser.add_argument(
+        "--tiers",
+        default=",".join(str(t) for t in DEFAULT_TIERS),
+        help="Comma-separated row counts to benchmark",
+    )
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=BUNDLED_CSV,
+        help="Taxonomy CSV/XLSX to draw rows from (e.g. a synthetic export)",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=Path("benchmarks/results/hot_paths.json"),
+        help="JSON output path",
+    )
+    args = parser.parse_args()
+
+    tiers = [int(t) for t in args.tiers.split(",") if t.strip()]
+    stages = parse_list(args.stages, list(STAGES))
+    results: List[Dict[str, Any]] = []
+    for tier in tiers:
+        rows = scaled_rows(tier, args.source)
+        for name in stages:
+            result = run_stage(name, rows, not args.no_memory)
+            result["tier"] = tier
+            results.append(result)
+            peak = result["peak_memory_bytes"]
+            peak_text = f"{peak / 1024:10.1f} KiB" if peak is not None else "         n/a"
+            print(f"{tier:>7} {name:<18} {result['ops_per_sec']:>12,.1f} ops/s {peak_text}", flush=True)
+
+    write_results(args.out, "hot_paths", results)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
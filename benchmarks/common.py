@@ -0,0 +1,56 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+
+import json
+import math
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+ROOT = Path(__file__).resolve().parents[1]
+for extra in (ROOT / "src", ROOT / "scripts"):
+    if str(extra) not in sys.path:
+        sys.path.append(str(extra))
+
+from taxonomy.loader import load_taxonomy_rows  # noqa: E402
+
+BUNDLED_CSV = ROOT / "categories_250.csv"
+
+
+def scaled_rows(count: int, source: Path = BUNDLED_CSV) -> List[Dict[str, str]]:
+    """Return ``count`` taxonomy rows by cycling ``source`` with fresh Catids.
+
+    Pass a file from ``scripts/generate_synthetic_taxonomy.py`` as ``source``
+    for representative large inputs instead of repeating the bundled sample.
+    """
+
+    template = load_taxonomy_rows(source)
+    rows: List[Dict[str, str]] = []
+    for idx in range(count):
+        row = dict(template[idx % len(template)])
+        row["Catid"] = str(1_000_000 + idx)
+        rows.append(row)
+    return rows
+
+
+def percentile(samples: Iterable[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def write_results(path: Path, benchmark: str, results: Any) -> None:
+    """Write ``results`` with run metadata as JSON to ``path``."""
+
+    payload = {
+        "benchmark": benchmark,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
@@ -8,18 +8,27 @@ import csv
 import hashlib
 import logging
 import math
+import os
+import random
 import sys
+import time
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Sequence, Tuple
-
-import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
 
+from pipeline.atomic import SyncBatch, atomic_open, atomic_write_text
+from pipeline.counter_rng import DEFAULT_RNG, RNG_CHOICES, CounterRandom, RngMismatch, resolve_rng, write_rng_file
+from pipeline.hash_index import HashIndex, batch_name
+from pipeline.metrics import RunMetrics
+from pipeline.planning import SubjectPlan
+from pipeline.sharding import Shard, parse_shard, write_shard_file
+from taxonomy.diff import TaxonomyDiff, diff_snapshots, read_catid_filter, snapshot
 from taxonomy.resolver import deepest_category
+from taxonomy.store import DEFAULT_CACHE_DIR, TaxonomyColumns, load_taxonomy_columns
 
 SVG_NS = "http://www.w3.org/2000/svg"
 HOUSE_STYLE = {
@@ -32,8 +41,19 @@ HOUSE_STYLE = {
     "stroke-linecap": "round",
     "stroke-linejoin": "round",
 }
-
-Shape = Tuple[str, Dict[str, str]]
+MANIFEST_FIELDS = [
+    "Catid",
+    "title_selected",
+    "concept_notes",
+    "primitives_used",
+    "path_hash",
+    "width",
+    "height",
+    "stroke_width",
+    "color_hex",
+    "validation_passed",
+    "source_icon",
+]
 
 
 def fmt(value: float) -> str:
@@ -47,44 +67,98 @@ def fmt(value: float) -> str:
     return f"{as_float:.3f}".rstrip("0").rstrip(".")
 
 
+Point = Tuple[float, float]
+# An attribute value: a number, a point list (polygon/polyline) or literal text (path data).
+Value = Union[float, Tuple[Point, ...], str]
+
+
+def format_value(value: Value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, tuple):
+        return " ".join(f"{fmt(x)},{fmt(y)}" for x, y in value)
+    return fmt(value)
+
+
+def escape_attr(text: str) -> str:
+    """Escape an attribute value the way :func:`xml.etree.ElementTree.tostring` does."""
+
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"),
+                         ("\r", "&#13;"), ("\n", "&#10;"), ("\t", "&#09;")):
+        if char in text:
+            text = text.replace(char, entity)
+    return text
+
+
+class Shape:
+    """One SVG element holding raw numbers; they are formatted once, when first needed.
+
+    Iterating yields ``(tag, attrs)``, so code written against the old
+    ``(tag, dict)`` tuples keeps working.
+    """
+
+    __slots__ = ("tag", "names", "values", "_attrs")
+
+    def __init__(self, tag: str, names: Tuple[str, ...], values: Tuple[Value, ...]):
+        self.tag = tag
+        self.names = names
+        self.values = values
+        self._attrs: Optional[Dict[str, str]] = None
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        attrs = self._attrs
+        if attrs is None:
+            attrs = self._attrs = {name: format_value(value) for name, value in zip(self.names, self.values)}
+        return attrs
+
+    def __iter__(self) -> Iterator[object]:
+        return iter((self.tag, self.attrs))
+
+    def __repr__(self) -> str:
+        return f"Shape({self.tag!r}, {self.attrs!r})"
+
+    def signature(self) -> str:
+        attrs = self.attrs
+        return self.tag + ":" + ",".join(f"{name}={attrs[name]}" for name in sorted(attrs))
+
+    def markup(self) -> str:
+        # Formatted numbers never need escaping; only literal text (path data) can.
+        attrs = "".join(
+            f' {name}="{escape_attr(text) if isinstance(value, str) else text}"'
+            for name, value, text in zip(self.names, self.values, self.attrs.values())
+        )
+        return f"<{self.tag}{attrs} />"
+
+
 def circle(cx: float, cy: float, r: float) -> Shape:
-    return ("circle", {"cx": fmt(cx), "cy": fmt(cy), "r": fmt(r)})
+    return Shape("circle", ("cx", "cy", "r"), (cx, cy, r))
 
 
 def line(x1: float, y1: float, x2: float, y2: float) -> Shape:
-    return (
-        "line",
-        {
-            "x1": fmt(x1),
-            "y1": fmt(y1),
-            "x2": fmt(x2),
-            "y2": fmt(y2),
-        },
-    )
+    return Shape("line", ("x1", "y1", "x2", "y2"), (x1, y1, x2, y2))
 
 
 def rect(x: float, y: float, w: float, h: float, rx: float = 0.0, ry: float = 0.0) -> Shape:
-    attrs = {"x": fmt(x), "y": fmt(y), "width": fmt(w), "height": fmt(h)}
+    names: Tuple[str, ...] = ("x", "y", "width", "height")
+    values: Tuple[Value, ...] = (x, y, w, h)
     if rx:
-        attrs["rx"] = fmt(rx)
+        names, values = names + ("rx",), values + (rx,)
     if ry:
-        attrs["ry"] = fmt(ry)
-    return ("rect", attrs)
+        names, values = names + ("ry",), values + (ry,)
+    return Shape("rect", names, values)
 
 
 def path(*commands: str) -> Shape:
-    d = " ".join(commands)
-    return ("path", {"d": d})
+    return Shape("path", ("d",), (" ".join(commands),))
 
 
-def polygon(points: Sequence[Tuple[float, float]]) -> Shape:
-    pts = " ".join(f"{fmt(x)},{fmt(y)}" for x, y in points)
-    return ("polygon", {"points": pts})
+def polygon(points: Sequence[Point]) -> Shape:
+    return Shape("polygon", ("points",), (tuple(points),))
 
 
-def polyline(points: Sequence[Tuple[float, float]]) -> Shape:
-    pts = " ".join(f"{fmt(x)},{fmt(y)}" for x, y in points)
-    return ("polyline", {"points": pts})
+def polyline(points: Sequence[Point]) -> Shape:
+    return Shape("polyline", ("points",), (tuple(points),))
 
 
 def sha_seed(text: str) -> int:
@@ -92,38 +166,38 @@ def sha_seed(text: str) -> int:
 
 
 def canonical_signature(shapes: Iterable[Shape]) -> str:
-    parts: List[str] = []
-    for tag, attrs in shapes:
-        ordered = ",".join(f"{k}={attrs[k]}" for k in sorted(attrs))
-        parts.append(f"{tag}:{ordered}")
-    return "|".join(parts)
+    return "|".join(shape.signature() for shape in shapes)
+
+
+SVG_OPEN = "<svg" + "".join(f' {name}="{escape_attr(value)}"' for name, value in HOUSE_STYLE.items()) + ">"
 
 
 def svg_from_shapes(shapes: Iterable[Shape]) -> Tuple[str, List[str], str]:
-    elements: List[ET.Element] = []
+    """Serialise ``shapes`` exactly as ``ElementTree.tostring`` would; returns SVG, primitives, path hash."""
+
+    shapes = list(shapes)
     primitive_order: List[str] = []
-    for tag, attrs in shapes:
-        elements.append(ET.Element(tag, attrs))
-        if tag not in primitive_order:
-            primitive_order.append(tag)
-    svg_root = ET.Element("svg", HOUSE_STYLE)
-    for el in elements:
-        svg_root.append(el)
-    xml = ET.tostring(svg_root, encoding="unicode")
+    for shape in shapes:
+        if shape.tag not in primitive_order:
+            primitive_order.append(shape.tag)
+    xml = SVG_OPEN + "".join(shape.markup() for shape in shapes) + "</svg>"
     signature = canonical_signature(shapes)
     path_hash = hashlib.sha256(signature.encode("utf-8")).hexdigest()
     return xml, primitive_order, path_hash
 
 
 class IconContext:
-    """Helper providing deterministic randomness per category."""
+    """Helper providing deterministic randomness per category.
 
-    def __init__(self, subject: str, seed: int):
-        import random
+    ``rng="mt"`` draws from :class:`random.Random`, as icons always have;
+    ``rng="counter"`` uses :class:`CounterRandom`, which is cheaper to seed
+    and gives the same icons on every Python version, but different ones.
+    """
 
+    def __init__(self, subject: str, seed: int, rng: str = "mt"):
         self.subject = subject
         self.seed = seed
-        self.random = random.Random(seed)
+        self.random = CounterRandom(seed) if rng == "counter" else random.Random(seed)
 
     def jitter(self, base: float, spread: float) -> float:
         return base + self.random.uniform(-spread, spread)
@@ -1374,10 +1448,58 @@ def pick_template(subject: str) -> TemplateFunc:
             return func
     return icon_generic
 
+
+def template_vocabulary() -> Dict[str, Tuple[str, ...]]:
+    """Map each keyword template's concept note to the subject keywords that select it.
+
+    The notes are English and most subjects Dutch, so ``validate_outputs.py``
+    scores house-style rows against these keywords as well as the note.
+    """
+
+    ctx = IconContext("", 0)
+    vocabulary: Dict[str, Tuple[str, ...]] = {}
+    for keywords, func in KEYWORD_TEMPLATES:
+        note = func(ctx)[1]
+        vocabulary[note] = tuple(dict.fromkeys(vocabulary.get(note, ()) + keywords))
+    return vocabulary
+
 def concept_for(subject: str, template_note: str, ctx: IconContext) -> str:
     return f"{template_note} to represent {subject.strip()}."
 
 
+def row_subject(row: Mapping[str, str]) -> str:
+    return deepest_category(row) or row.get("Root category", "").strip()
+
+
+def manifest_entry(
+    catid: str, subject: str, concept_notes: str, primitives: List[str], path_hash: str
+) -> Dict[str, object]:
+    return {
+        "Catid": catid,
+        "title_selected": subject,
+        "concept_notes": concept_notes,
+        "primitives_used": ",".join(primitives),
+        "path_hash": path_hash,
+        "width": HOUSE_STYLE["width"],
+        "height": HOUSE_STYLE["height"],
+        "stroke_width": HOUSE_STYLE["stroke-width"],
+        "color_hex": HOUSE_STYLE["stroke"],
+        "validation_passed": "TRUE",
+        "source_icon": "generated",
+    }
+
+
+def render_row(
+    catid: str, subject: str, template: Optional[TemplateFunc] = None, rng: str = "mt"
+) -> Tuple[str, List[str], str, str]:
+    """Render one row; returns SVG text, primitives, path hash and concept notes."""
+
+    ctx = IconContext(subject, sha_seed(catid), rng)
+    shapes, note = (template or pick_template(subject))(ctx)
+    svg_text, primitives, path_hash = svg_from_shapes(shapes)
+    return svg_text, primitives, path_hash, concept_for(subject, note, ctx)
+
+
 def ensure_output_dir(out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
     existing = list(out_dir.glob("*.svg"))
@@ -1389,84 +1511,417 @@ def ensure_output_dir(out_dir: Path) -> None:
         manifest.unlink()
 
 
-def write_svg(path: Path, svg_text: str) -> None:
-    path.write_text(svg_text, encoding="utf-8")
+def write_svg(path: Path, svg_text: str, sync: Optional[SyncBatch] = None) -> None:
+    atomic_write_text(path, svg_text, sync=sync)
 
 
-def generate_icons(csv_path: Path, out_dir: Path) -> None:
-    ensure_output_dir(out_dir)
-    log_path = out_dir / "generation.log"
+def index_svg(hash_index: Optional[HashIndex], out_dir: Path, catid: str, svg_text: str) -> bool:
+    """Record the icon in ``hash_index``; returns ``True`` if its geometry was already indexed."""
+
+    if hash_index is None:
+        return False
+    same = hash_index.record_svg(batch_name(out_dir), catid, f"{catid}.svg", svg_text)
+    if same:
+        logging.warning(
+            "%s has the same geometry as %s", catid, ", ".join(f"{e.batch}/{e.file}" for e in same)
+        )
+    return bool(same)
+
+
+def configure_logging(out_dir: Path, mode: str = "w") -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
         handlers=[
-            logging.FileHandler(log_path, mode="w", encoding="utf-8"),
+            logging.FileHandler(out_dir / "generation.log", mode=mode, encoding="utf-8"),
             logging.StreamHandler(),
         ],
     )
+
+
+def generate_icons(
+    csv_path: Path,
+    out_dir: Path,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    fsync_every: int = 0,
+    shard: Optional[Shard] = None,
+    rng: str = "mt",
+    hash_index: Optional[HashIndex] = None,
+) -> TaxonomyColumns:
+    """Regenerate every icon and the manifest; returns the rows that were read."""
+
+    ensure_output_dir(out_dir)
+    configure_logging(out_dir)
+    write_rng_file(out_dir, rng)
     logging.info("Reading categories from %s", csv_path)
-    with csv_path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    logging.info("Generating icons for %d categories", len(rows))
-    manifest_path = out_dir / "manifest.csv"
-    fieldnames = [
-        "Catid",
-        "title_selected",
-        "concept_notes",
-        "primitives_used",
-        "path_hash",
-        "width",
-        "height",
-        "stroke_width",
-        "color_hex",
-        "validation_passed",
-        "source_icon",
-    ]
-    with manifest_path.open("w", newline="", encoding="utf-8") as mf:
-        writer = csv.DictWriter(mf, fieldnames=fieldnames)
-        writer.writeheader()
+    metrics = RunMetrics()
+    with metrics.stage("read"):
+        rows = load_taxonomy_columns(csv_path, cache_dir)
+    with metrics.stage("plan"):
+        subjects: List[Tuple[str, str]] = []
         for row in rows:
             catid = str(row["Catid"]).strip()
-            subject = deepest_category(row) or row.get("Root category", "").strip()
+            if shard is not None and not shard.owns(catid):
+                continue
+            subject = row_subject(row)
             if not subject:
                 logging.warning("Row %s missing subject, using Catid", catid)
                 subject = catid
-            ctx = IconContext(subject, sha_seed(catid))
-            template = pick_template(subject)
-            shapes, note = template(ctx)
-            svg_text, primitives, path_hash = svg_from_shapes(shapes)
-            svg_path = out_dir / f"{catid}.svg"
-            write_svg(svg_path, svg_text)
-            concept_notes = concept_for(subject, note, ctx)
-            writer.writerow(
-                {
-                    "Catid": catid,
-                    "title_selected": subject,
-                    "concept_notes": concept_notes,
-                    "primitives_used": ",".join(primitives),
-                    "path_hash": path_hash,
-                    "width": HOUSE_STYLE["width"],
-                    "height": HOUSE_STYLE["height"],
-                    "stroke_width": HOUSE_STYLE["stroke-width"],
-                    "color_hex": HOUSE_STYLE["stroke"],
-                    "validation_passed": "TRUE",
-                    "source_icon": "generated",
-                }
-            )
-            logging.info("Generated %s (%s) with template %s", catid, subject, template.__name__)
+            subjects.append((catid, subject))
+        plan = SubjectPlan(subject for _, subject in subjects)
+    logging.info("Generating icons for %d categories (%d distinct subjects)", plan.rows, len(plan))
+    if shard is not None:
+        write_shard_file(out_dir, shard)
+        logging.info("Processing shard %s", shard)
+    manifest_path = out_dir / "manifest.csv"
+    if hash_index is not None:
+        hash_index.remove_batch(batch_name(out_dir))
+    try:
+        sync = SyncBatch(fsync_every)
+        # The manifest replaces the previous one only after every icon it
+        # lists has been written (and synced, with --fsync-every).
+        with atomic_open(manifest_path, newline="", fsync=sync.enabled) as mf:
+            writer = csv.DictWriter(mf, fieldnames=MANIFEST_FIELDS)
+            writer.writeheader()
+            for position, (catid, subject) in enumerate(subjects):
+                with metrics.row(catid, subject):
+                    with metrics.stage("template"):
+                        shared = plan.state(position)
+                        template = shared.get("template")
+                        metrics.cache("template", template is not None)
+                        if template is None:
+                            template = shared["template"] = pick_template(subject)
+                        plan.done(position)
+                    with metrics.stage("render"):
+                        svg_text, primitives, path_hash, concept_notes = render_row(catid, subject, template, rng)
+                    svg_path = out_dir / f"{catid}.svg"
+                    with metrics.stage("write"):
+                        write_svg(svg_path, svg_text, sync)
+                    if hash_index is not None:
+                        with metrics.stage("hash_index"):
+                            if index_svg(hash_index, out_dir, catid, svg_text):
+                                metrics.count("duplicate_geometry")
+                    with metrics.stage("manifest"):
+                        writer.writerow(manifest_entry(catid, subject, concept_notes, primitives, path_hash))
+                logging.info("Generated %s (%s) with template %s", catid, subject, template.__name__)
+            sync.checkpoint()
+        if hash_index is not None:
+            hash_index.commit()
+    finally:
+        metrics_path = metrics.write(out_dir / "run_metrics.json")
+        print(metrics.summary_table())
+        logging.info("Wrote %s", metrics_path)
+    return rows
+
+
+def input_stat(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def update_changed_rows(
+    rows: TaxonomyColumns,
+    out_dir: Path,
+    previous: Dict[str, str],
+    entries: Dict[Tuple[str, str], Dict[str, object]],
+    fsync_every: int = 0,
+    shard: Optional[Shard] = None,
+    rng: str = "mt",
+    hash_index: Optional[HashIndex] = None,
+) -> Tuple[Dict[str, str], TaxonomyDiff]:
+    """Bring ``out_dir`` up to date with ``rows`` given the previous snapshot.
+
+    Only Catids whose row hash changed (or that are new) are rendered and
+    written, and SVGs of removed Catids are deleted. ``entries`` holds the
+    manifest row for each ``(Catid, subject)`` and is updated in place; the
+    manifest is always rewritten from it in the new input order, since an
+    edit that only reorders rows changes no row hash. The result is
+    identical to a full run over ``rows``.
+    """
+
+    owned = owned_rows(rows, shard)
+    current = snapshot(owned)
+    changes = diff_snapshots(previous, current)
+    affected = set(changes.added) | set(changes.changed)
+    apply_changes(owned, out_dir, affected, changes.removed, entries, fsync_every, rng, hash_index)
+    return current, changes
+
+
+def owned_rows(rows: Iterable[Mapping[str, str]], shard: Optional[Shard] = None) -> List[Mapping[str, str]]:
+    return [row for row in rows if shard is None or shard.owns(str(row["Catid"]).strip())]
+
+
+def read_manifest_entries(out_dir: Path) -> Dict[Tuple[str, str], Dict[str, object]]:
+    with (out_dir / "manifest.csv").open(newline="", encoding="utf-8") as mf:
+        return {(row["Catid"], row["title_selected"]): row for row in csv.DictReader(mf)}
+
+
+def apply_changes(
+    owned: List[Mapping[str, str]],
+    out_dir: Path,
+    affected: Set[str],
+    removed: Iterable[str],
+    entries: Dict[Tuple[str, str], Dict[str, object]],
+    fsync_every: int = 0,
+    rng: str = "mt",
+    hash_index: Optional[HashIndex] = None,
+) -> None:
+    """Re-render ``affected`` Catids, delete SVGs of ``removed`` ones and rewrite the manifest.
+
+    A row outside ``affected`` whose ``(Catid, subject)`` has no manifest
+    entry (its subject changed) is rendered too, and its SVG written, so the
+    output never pairs a new manifest row with an old icon.
+    """
+
+    rendered: Dict[Tuple[str, str], str] = {}
+    last: Dict[str, Tuple[str, str]] = {}  # the row whose SVG a full run leaves for each Catid
+    manifest_rows: List[Dict[str, object]] = []
+    kept: Dict[Tuple[str, str], Dict[str, object]] = {}
+    for row in owned:
+        catid = str(row["Catid"]).strip()
+        subject = row_subject(row) or catid
+        key = (catid, subject)
+        entry = kept.get(key)
+        if entry is None and catid not in affected:
+            entry = entries.get(key)
+        if entry is None:
+            svg_text, primitives, path_hash, concept_notes = render_row(catid, subject, rng=rng)
+            entry = manifest_entry(catid, subject, concept_notes, primitives, path_hash)
+            rendered[key] = svg_text
+        last[catid] = key
+        kept[key] = entry
+        manifest_rows.append(entry)
+    entries.clear()
+    entries.update(kept)
+
+    sync = SyncBatch(fsync_every)
+    stale = affected | {catid for catid, _ in rendered}
+    for catid, key in last.items():
+        if catid not in stale:
+            continue
+        svg_text = rendered.get(key)
+        if svg_text is None:
+            svg_text = render_row(*key, rng=rng)[0]
+        write_svg(out_dir / f"{catid}.svg", svg_text, sync)
+        index_svg(hash_index, out_dir, catid, svg_text)
+    for catid in removed:
+        (out_dir / f"{catid}.svg").unlink(missing_ok=True)
+    if hash_index is not None:
+        hash_index.remove(batch_name(out_dir), removed)
+        hash_index.commit()
+    sync.checkpoint()
+    with atomic_open(out_dir / "manifest.csv", newline="", fsync=sync.enabled) as mf:
+        writer = csv.DictWriter(mf, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        writer.writerows(manifest_rows)
+
+
+def update_listed_rows(
+    csv_path: Path,
+    out_dir: Path,
+    catids: Set[str],
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    fsync_every: int = 0,
+    shard: Optional[Shard] = None,
+    rng: Optional[str] = None,
+    hash_index: Optional[HashIndex] = None,
+) -> None:
+    """Regenerate only ``catids`` (e.g. from ``taxonomy_diff.py --catids``) in an existing output.
+
+    Listed Catids that are no longer in the input lose their SVG. Without a
+    previous manifest in ``out_dir`` this falls back to a full run. ``rng``
+    defaults to the generator ``out_dir`` was made with; a different one
+    raises :class:`RngMismatch` rather than mixing two kinds of icons.
+    """
+
+    if not (out_dir / "manifest.csv").exists():
+        generate_icons(csv_path, out_dir, cache_dir, fsync_every, shard, rng or DEFAULT_RNG, hash_index)
+        return
+    rng = resolve_rng(rng, out_dir)
+    configure_logging(out_dir, mode="a")
+    started = time.perf_counter()
+    owned = owned_rows(load_taxonomy_columns(csv_path, cache_dir), shard)
+    present = {str(row["Catid"]).strip() for row in owned}
+    affected = catids & present
+    removed = sorted(catids - present)
+    apply_changes(owned, out_dir, affected, removed, read_manifest_entries(out_dir), fsync_every, rng, hash_index)
+    logging.info(
+        "Regenerated %d listed rows and removed %d in %s (%.2fs)",
+        len(affected), len(removed), out_dir, time.perf_counter() - started,
+    )
+
+
+def watch(
+    csv_path: Path,
+    out_dir: Path,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    fsync_every: int = 0,
+    shard: Optional[Shard] = None,
+    interval: float = 1.0,
+    rng: str = "mt",
+    hash_index: Optional[HashIndex] = None,
+) -> None:
+    """Generate once, then regenerate only the rows an edit to ``csv_path`` touches."""
+
+    seen = input_stat(csv_path)
+    rows = generate_icons(csv_path, out_dir, cache_dir, fsync_every, shard, rng, hash_index)
+    previous = snapshot(owned_rows(rows, shard))
+    entries = read_manifest_entries(out_dir)
+    logging.info("Watching %s for changes every %.1fs", csv_path, interval)
+    while True:
+        time.sleep(interval)
+        try:
+            stat = input_stat(csv_path)
+        except FileNotFoundError:
+            continue  # editors may replace the file; wait for it to reappear
+        if stat == seen:
+            continue
+        # Let the writer finish before reading a half-saved export.
+        time.sleep(min(interval, 0.2))
+        if input_stat(csv_path) != stat:
+            continue
+        seen = stat
+        started = time.perf_counter()
+        try:
+            rows = load_taxonomy_columns(csv_path, cache_dir)
+        except (OSError, ValueError) as exc:
+            logging.warning("Could not read %s: %s", csv_path, exc)
+            continue
+        previous, changes = update_changed_rows(
+            rows, out_dir, previous, entries, fsync_every, shard, rng, hash_index
+        )
+        logging.info(
+            "Updated %s after edit (%s) in %.2fs", out_dir, changes.summary(), time.perf_counter() - started
+        )
+
+
+RNG_REPORT_FIELDS = ["Catid", "title_selected", "template", "path_hash_mt", "path_hash_counter", "changed"]
+
+
+def write_rng_report(
+    csv_path: Path,
+    report_path: Path,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    shard: Optional[Shard] = None,
+) -> Tuple[int, int]:
+    """Render every row with both generators and list which icons ``--rng counter`` changes.
+
+    Returns the number of changed icons and the number of rows compared.
+    """
+
+    changed = total = 0
+    templates: Dict[str, TemplateFunc] = {}
+    with atomic_open(report_path, newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=RNG_REPORT_FIELDS)
+        writer.writeheader()
+        for row in owned_rows(load_taxonomy_columns(csv_path, cache_dir), shard):
+            catid = str(row["Catid"]).strip()
+            subject = row_subject(row) or catid
+            template = templates.get(subject)
+            if template is None:
+                template = templates[subject] = pick_template(subject)
+            before = render_row(catid, subject, template, "mt")[2]
+            after = render_row(catid, subject, template, "counter")[2]
+            total += 1
+            changed += before != after
+            writer.writerow({
+                "Catid": catid,
+                "title_selected": subject,
+                "template": template.__name__,
+                "path_hash_mt": before,
+                "path_hash_counter": after,
+                "changed": "TRUE" if before != after else "FALSE",
+            })
+    return changed, total
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate house-style icons for categories")
-    parser.add_argument("--csv", type=Path, required=True, help="Input CSV with taxonomy rows")
+    parser.add_argument("--csv", type=Path, required=True, help="Input taxonomy file (CSV or XLSX)")
     parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="Parse XLSX input directly instead of using the converted copy in TAXONOMY_CACHE_DIR",
+    )
+    parser.add_argument(
+        "--fsync-every",
+        type=int,
+        default=int(os.environ.get("ICON_FSYNC_EVERY", "0")),
+        help="fsync written SVGs in batches of this many files and before the manifest is written (0 disables)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        help="Only process rows whose Catid hashes to shard i of N (e.g. 0/4); "
+        "combine shard outputs with scripts/manifest_tool.py merge",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the first run keep polling --csv and regenerate only the rows an edit changes",
+    )
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between --watch polls")
+    parser.add_argument(
+        "--only-catids",
+        type=Path,
+        help="Regenerate only the Catids listed in this file (one per line, see scripts/taxonomy_diff.py) "
+        "and keep the rest of --out",
+    )
+    parser.add_argument(
+        "--rng",
+        choices=RNG_CHOICES,
+        default=os.environ.get("ICON_RNG"),
+        help="Random generator behind template jitter: 'mt' (random.Random, the original icons; default) or "
+        "'counter' (faster, identical on every Python version, but different icons). --only-catids "
+        "defaults to, and requires, the one recorded in --out/rng.json",
+    )
+    parser.add_argument(
+        "--rng-report",
+        type=Path,
+        help="Write a CSV listing which icons --rng counter would change, instead of generating",
+    )
+    parser.add_argument(
+        "--hash-index",
+        type=Path,
+        default=os.environ.get("ICON_HASH_INDEX"),
+        help="Record every written icon's geometry hash in this index shared by all batches and "
+        "warn when it matches an earlier icon (env ICON_HASH_INDEX)",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    generate_icons(args.csv, args.out)
+    cache_dir = None if args.no_input_cache else DEFAULT_CACHE_DIR
+    if args.rng_report:
+        changed, total = write_rng_report(args.csv, args.rng_report, cache_dir, args.shard)
+        print(f"{changed} of {total} icons change with --rng counter; wrote {args.rng_report}")
+        return
+    rng = args.rng or DEFAULT_RNG
+    hash_index = HashIndex(args.hash_index) if args.hash_index else None
+    try:
+        if args.only_catids:
+            catids = read_catid_filter(args.only_catids)
+            try:
+                update_listed_rows(
+                    args.csv, args.out, catids, cache_dir, args.fsync_every, args.shard, args.rng, hash_index
+                )
+            except RngMismatch as exc:
+                raise SystemExit(str(exc))
+        elif args.watch:
+            try:
+                watch(
+                    args.csv, args.out, cache_dir, args.fsync_every, args.shard, args.interval, rng,
+                    hash_index,
+                )
+            except KeyboardInterrupt:
+                pass
+        else:
+            generate_icons(args.csv, args.out, cache_dir, args.fsync_every, args.shard, rng, hash_index)
+    finally:
+        if hash_index is not None:
+            hash_index.close()
 
 
 if __name__ == "__main__":
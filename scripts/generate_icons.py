@@ -20,8 +20,11 @@ import logging
 import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
 import requests
 import xml.etree.ElementTree as ET
@@ -31,7 +34,19 @@ SRC_PATH = ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.append(str(SRC_PATH))
 
+from pipeline.atomic import SyncBatch, atomic_open, atomic_write_text  # noqa: E402
+from pipeline.client import Deadline, FetchAborted, ResilientSession, endpoint_key  # noqa: E402
+from pipeline.completion import CompletionIndex  # noqa: E402
+from pipeline.hash_index import HashIndex, batch_name  # noqa: E402
+from pipeline.manifest_store import MANIFEST_DB_NAME, ManifestStore  # noqa: E402
+from pipeline.metrics import RunMetrics  # noqa: E402
+from pipeline.negative_cache import DEFAULT_NEGATIVE_CACHE_PATH, DEFAULT_TTL_HOURS, NegativeCache  # noqa: E402
+from pipeline.planning import LRUCache, SubjectPlan  # noqa: E402
+from pipeline.query_stats import DEFAULT_STATS_PATH, QueryStats  # noqa: E402
+from pipeline.sharding import parse_shard, write_shard_file  # noqa: E402
+from taxonomy.diff import read_catid_filter  # noqa: E402
 from taxonomy.resolver import deepest_category  # noqa: E402
+from taxonomy.store import DEFAULT_CACHE_DIR, load_taxonomy_columns  # noqa: E402
 from taxonomy.synonyms import build_queries  # noqa: E402
 
 
@@ -72,8 +87,24 @@ STYLE_ALIASES = {"classic": "original"}
 
 DEFAULT_STYLES = ("original", "brand", "thin", "thick", "mono")
 
+MANIFEST_FIELDS = [
+    'Catid', 'category', 'title_selected', 'concept_notes', 'primitives_used',
+    'path_hash', 'width', 'height', 'stroke_width', 'color_hex',
+    'validation_passed', 'source_icon'
+]
+
 SVG_NS = "http://www.w3.org/2000/svg"
-SVGAPI_LIST_URL = "https://api.svgapi.com/v1/{key}/list/"
+SVGAPI_BASE_URL = "https://api.svgapi.com"
+SVGAPI_LIST_PATH = "/v1/{key}/list/"
+
+# Run-wide caches for search responses (by query) and SVG bodies (by URL).
+SEARCH_CACHE_SIZE = 4096
+DOWNLOAD_CACHE_SIZE = 1024
+
+# Generic searches tried after a subject's own queries.
+BABY_FALLBACK_QUERIES = ("baby care", "baby icon", "baby")
+CHILD_FALLBACK_QUERIES = ("child icon", "children toys")
+UNIVERSAL_FALLBACK_QUERIES = ("baby icon", "baby")
 
 
 def configure_logging(out_dir: Path, level: str) -> Path:
@@ -111,11 +142,18 @@ def slugify(name: str) -> str:
     return slug or "category"
 
 
-def iter_search_queries(category: str) -> List[str]:
-    """Generate prioritized search queries for ``category``."""
+def search_query_groups(category: str, split_compounds: bool = False) -> Tuple[List[str], List[str]]:
+    """Return the prioritized queries for ``category`` and the generic fallbacks after them.
+
+    With ``split_compounds`` the lexicon-driven queries are built from the
+    parts of Dutch compounds ("babyschommelstoelen" -> "schommelstoelen baby");
+    the unsplit subject is still tried as a later fallback. A generic term
+    that is also one of the subject's own queries ("baby" for "Baby") stays
+    with the subject's queries.
+    """
 
     queries: List[str] = []
-    for candidate in build_queries(category):
+    for candidate in build_queries(category, split_compounds=split_compounds):
         sanitized = candidate.strip()
         if sanitized and sanitized not in queries:
             queries.append(sanitized)
@@ -131,70 +169,23 @@ def iter_search_queries(category: str) -> List[str]:
     lower = category.lower()
     fallback_terms: List[str] = []
     if "baby" in lower:
-        fallback_terms.extend(["baby care", "baby icon", "baby"])
+        fallback_terms.extend(BABY_FALLBACK_QUERIES)
     if "kind" in lower or "child" in lower:
-        fallback_terms.extend(["child icon", "children toys"])
+        fallback_terms.extend(CHILD_FALLBACK_QUERIES)
+    fallback_terms.extend(UNIVERSAL_FALLBACK_QUERIES)
 
+    fallbacks: List[str] = []
     for term in fallback_terms:
-        if term not in queries:
-            queries.append(term)
-
-    universal_fallbacks = ["baby icon", "baby"]
-    for term in universal_fallbacks:
-        if term not in queries:
-            queries.append(term)
-    return queries
+        if term not in queries and term not in fallbacks:
+            fallbacks.append(term)
+    return queries, fallbacks
 
 
-def load_taxonomy_rows(path: Path) -> List[Dict[str, str]]:
-    """Return taxonomy rows from ``path`` supporting CSV and XLSX files."""
+def iter_search_queries(category: str, split_compounds: bool = False) -> List[str]:
+    """Generate prioritized search queries for ``category``, fallbacks last."""
 
-    suffix = path.suffix.lower()
-    if suffix == ".xlsx":
-        try:
-            from openpyxl import load_workbook
-        except ImportError as exc:  # pragma: no cover - import guard
-            raise SystemExit(
-                "Reading .xlsx files requires openpyxl. Install it with 'pip install openpyxl'."
-            ) from exc
-
-        workbook = load_workbook(path, read_only=True, data_only=True)
-        worksheet = workbook.active
-        rows: List[Dict[str, str]] = []
-        header_row = next(worksheet.iter_rows(values_only=True), None)
-        if not header_row:
-            workbook.close()
-            return rows
-
-        headers: List[str] = []
-        for idx, cell in enumerate(header_row):
-            header = str(cell).strip() if cell is not None else ""
-            if not header:
-                header = f"column_{idx}"
-            headers.append(header)
-
-        for excel_row in worksheet.iter_rows(min_row=2, values_only=True):
-            if excel_row is None:
-                continue
-            if all(cell is None for cell in excel_row):
-                continue
-            row_dict: Dict[str, str] = {}
-            for idx, header in enumerate(headers):
-                if not header:
-                    continue
-                value = excel_row[idx] if idx < len(excel_row) else None
-                if value is None:
-                    row_dict[header] = ""
-                else:
-                    row_dict[header] = str(value).strip()
-            rows.append(row_dict)
-
-        workbook.close()
-        return rows
-
-    with path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return list(reader)
+    queries, fallbacks = search_query_groups(category, split_compounds)
+    return queries + fallbacks
 
 
 def load_existing_manifest(path: Path) -> Tuple[List[Dict[str, str]], Dict[str, int], Set[str]]:
@@ -226,14 +217,35 @@ def load_existing_manifest(path: Path) -> Tuple[List[Dict[str, str]], Dict[str,
     return entries, index, completed
 
 
+def open_manifest_store(style_dir: Path, resume: bool, durable: bool = False) -> Tuple[ManifestStore, Set[str]]:
+    """Open the SQLite manifest of a style and return it with its completed IDs.
+
+    Without ``resume`` the store starts empty, like a fresh CSV manifest. A
+    resumed run that has only a ``manifest.csv`` imports it first.
+    """
+
+    store = ManifestStore(style_dir / MANIFEST_DB_NAME, MANIFEST_FIELDS, durable)
+    csv_path = style_dir / "manifest.csv"
+    if not resume:
+        store.clear()
+    elif not len(store) and csv_path.exists():
+        logging.info("Imported %d manifest rows from %s", store.import_csv(csv_path), csv_path)
+    completed = store.completed_catids()
+    logging.info("Opened %s with %d rows", store.path, len(store))
+    return store, completed
+
+
 def record_manifest_entry(info: Dict[str, Any], entry: Dict[str, Any]) -> None:
     """Upsert ``entry`` into the manifest bookkeeping for a style."""
 
     catid = (entry.get("Catid") or "").strip()
+    store: Optional[ManifestStore] = info.get("store")
     manifest: List[Dict[str, Any]] = info["manifest"]
     manifest_index: Dict[str, int] = info["manifest_index"]
 
-    if catid and catid in manifest_index:
+    if store is not None:
+        store.upsert(entry)
+    elif catid and catid in manifest_index:
         manifest[manifest_index[catid]] = entry
     else:
         if catid:
@@ -249,17 +261,96 @@ def record_manifest_entry(info: Dict[str, Any], entry: Dict[str, Any]) -> None:
             completed.discard(catid)
 
 
+def record_failed_row(
+    style_state: Dict[str, Dict[str, Any]],
+    catid: str,
+    category_slug: str,
+    category_name: str,
+    note: str,
+    source_url: str = "",
+) -> None:
+    """Record a ``validation_passed=FALSE`` manifest row for every style."""
+
+    for info in style_state.values():
+        if info["hash_index"] is not None:
+            info["hash_index"].remove(info["batch"], [catid])
+        record_manifest_entry(
+            info,
+            {
+                'Catid': catid,
+                'category': category_slug,
+                'title_selected': category_name,
+                'concept_notes': note,
+                'primitives_used': '',
+                'path_hash': '',
+                'width': 0,
+                'height': 0,
+                'stroke_width': info['stroke_width'],
+                'color_hex': info['color'],
+                'validation_passed': 'FALSE',
+                'source_icon': source_url,
+            },
+        )
+
+
+def manifest_entry_for(info: Dict[str, Any], catid: str) -> Optional[Dict[str, Any]]:
+    store: Optional[ManifestStore] = info.get("store")
+    if store is not None:
+        return store.get(catid)
+    idx = info["manifest_index"].get(catid)
+    return None if idx is None else info["manifest"][idx]
+
+
+def unlink_entry_svg(info: Dict[str, Any], entry: Mapping[str, Any]) -> None:
+    """Delete the SVG a manifest entry points at, and its category folder once empty."""
+
+    cat_dir: Path = info["dir"] / (entry.get("category") or "")
+    (cat_dir / f"{info['file_prefix']}{str(entry['Catid']).strip()}.svg").unlink(missing_ok=True)
+    if cat_dir != info["dir"] and cat_dir.is_dir() and not any(cat_dir.iterdir()):
+        cat_dir.rmdir()
+
+
+def drop_manifest_entries(style_state: Dict[str, Dict[str, Any]], catids: Set[str]) -> int:
+    """Remove ``catids`` from every style's manifest and delete their SVGs."""
+
+    dropped = 0
+    for info in style_state.values():
+        entries = [entry for entry in (manifest_entry_for(info, catid) for catid in sorted(catids)) if entry]
+        store: Optional[ManifestStore] = info.get("store")
+        if store is not None:
+            store.delete(catids)
+        else:
+            manifest: List[Dict[str, Any]] = info["manifest"]
+            manifest[:] = [entry for entry in manifest if (entry.get("Catid") or "").strip() not in catids]
+            info["manifest_index"].clear()
+            for idx, entry in enumerate(manifest):
+                catid = (entry.get("Catid") or "").strip()
+                if catid:
+                    info["manifest_index"][catid] = idx
+        if info["hash_index"] is not None:
+            info["hash_index"].remove(info["batch"], catids)
+        for entry in entries:
+            unlink_entry_svg(info, entry)
+            info["completed_catids"].discard(entry["Catid"].strip())
+        dropped += len(entries)
+    return dropped
+
+
+def drop_moved_svgs(style_state: Dict[str, Dict[str, Any]], subjects: Iterable[Tuple[str, str]]) -> None:
+    """Delete SVGs of rows whose category slug changed, before they are refetched."""
+
+    for catid, category_name in subjects:
+        slug = slugify(category_name)
+        for info in style_state.values():
+            entry = manifest_entry_for(info, catid)
+            if entry is not None and (entry.get("category") or "") != slug:
+                unlink_entry_svg(info, entry)
+
+
 def row_outputs_complete(catid: str, category_slug: str, styles: Dict[str, Dict[str, Any]]) -> bool:
     """Return ``True`` when every requested style already produced ``catid``."""
 
-    for info in styles.values():
-        file_prefix: str = info["file_prefix"]
-        file_path = info["dir"] / category_slug / f"{file_prefix}{catid}.svg"
-        if not file_path.exists():
-            return False
-        if catid not in info["completed_catids"]:
-            return False
-    return True
+    return all((category_slug, catid) in info["completion"] for info in styles.values())
 
 
 def parse_dimension(value: Optional[str]) -> float:
@@ -291,50 +382,102 @@ def viewbox_dimensions(value: Optional[str]) -> Tuple[float, float]:
     return width, height
 
 
+def new_fetch_caches(negative: Optional[NegativeCache] = None) -> Dict[str, Any]:
+    return {
+        "searches": LRUCache(SEARCH_CACHE_SIZE),
+        "downloads": LRUCache(DOWNLOAD_CACHE_SIZE),
+        "negative": negative,
+    }
+
+
 def fetch_icon_svg(
     category: str,
     catid: str,
-    session: requests.Session,
+    session: ResilientSession,
     api_key: str,
     limit: int,
+    deadline: Optional[Deadline] = None,
+    api_base: str = SVGAPI_BASE_URL,
+    metrics: Optional[RunMetrics] = None,
+    shared: Optional[Dict[str, Any]] = None,
+    caches: Optional[Dict[str, Any]] = None,
+    query_stats: Optional[QueryStats] = None,
 ) -> Tuple[str, str, str]:
     """Return SVG data, source URL and title for ``category``.
 
     Returns empty strings when the lookup fails so the caller can record
-    metadata about the missing public icon.
+    metadata about the missing public icon. :class:`FetchAborted` propagates
+    when the row budget runs out or the endpoint's circuit breaker is open.
+
+    ``shared`` is the subject group's scratch dict from
+    :class:`pipeline.planning.SubjectPlan`, so query expansion runs once per
+    subject. ``caches`` holds run-wide ``searches`` (by query) and
+    ``downloads`` (by URL) caches; every row of a group, and every subject
+    sharing a fallback query, reuses them so only the Catid-based icon choice
+    is repeated per row. Its optional ``negative`` entry is a persistent
+    :class:`NegativeCache` of searches that returned nothing in earlier runs;
+    those are skipped without a request. Failed requests are not cached. Each network search
+    outcome is recorded in ``query_stats`` when given.
     """
 
-    search_url = SVGAPI_LIST_URL.format(key=api_key)
-    queries = iter_search_queries(category)
+    metrics = metrics or RunMetrics()
+    shared = shared if shared is not None else {}
+    caches = caches if caches is not None else new_fetch_caches()
+    search_url = api_base.rstrip("/") + SVGAPI_LIST_PATH.format(key=api_key)
+    queries = shared.get("queries")
+    if queries is None:
+        own, fallbacks = search_query_groups(category)
+        queries = shared["queries"] = own + fallbacks
+        shared["fallbacks"] = frozenset(fallbacks)
+    fallbacks = shared.get("fallbacks", frozenset())
+    searches = caches["searches"]
+    downloads = caches["downloads"]
+    negative: Optional[NegativeCache] = caches.get("negative")
     for query in queries:
-        try:
-            response = session.get(
-                search_url,
-                params={"search": query, "limit": limit},
-                timeout=10,
-            )
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            logging.warning(
-                "[svgapi] search failed for '%s' (query '%s'): %s",
-                category,
-                query,
-                exc,
-            )
-            continue
+        icons = searches.get(query)
+        metrics.cache("search", icons is not None)
+        if icons is None and negative is not None:
+            known_empty = negative.contains(query, limit)
+            metrics.cache("negative", known_empty)
+            if known_empty:
+                logging.debug("[svgapi] skipping '%s' (query '%s'): empty in an earlier run", category, query)
+                continue
+        if icons is None:
+            metrics.count("searches")
+            try:
+                with metrics.stage("search"):
+                    response = session.get(
+                        search_url,
+                        params={"search": query, "limit": limit},
+                        deadline=deadline,
+                    )
+            except requests.RequestException as exc:
+                logging.warning(
+                    "[svgapi] search failed for '%s' (query '%s'): %s",
+                    category,
+                    query,
+                    exc,
+                )
+                continue
 
-        try:
-            payload = response.json()
-        except ValueError as exc:
-            logging.warning(
-                "[svgapi] invalid JSON for '%s' (query '%s'): %s",
-                category,
-                query,
-                exc,
-            )
-            continue
+            metrics.add_bytes(len(response.content))
+            try:
+                payload = response.json()
+            except ValueError as exc:
+                logging.warning(
+                    "[svgapi] invalid JSON for '%s' (query '%s'): %s",
+                    category,
+                    query,
+                    exc,
+                )
+                continue
 
-        icons = payload.get("icons") or []
+            icons = payload.get("icons") or []
+            searches.put(query, icons)
+            if query_stats is not None:
+                query_stats.record(query, bool(icons), query in fallbacks)
+            if not icons and negative is not None:
+                negative.add(query, limit)
         if not icons:
             logging.info("[svgapi] no icons found for '%s' (query '%s')", category, query)
             continue
@@ -350,16 +493,23 @@ def fetch_icon_svg(
             )
             continue
 
-        try:
-            svg_resp = session.get(svg_url, timeout=10)
-            svg_resp.raise_for_status()
-        except requests.RequestException as exc:
-            logging.warning("[svgapi] download failed for '%s': %s", svg_url, exc)
-            continue
+        svg_text = downloads.get(svg_url)
+        metrics.cache("download", svg_text is not None)
+        if svg_text is None:
+            metrics.count("downloads")
+            try:
+                with metrics.stage("download"):
+                    svg_resp = session.get(svg_url, deadline=deadline)
+            except requests.RequestException as exc:
+                logging.warning("[svgapi] download failed for '%s': %s", svg_url, exc)
+                continue
+            metrics.add_bytes(len(svg_resp.content))
+            svg_text = svg_resp.text
+            downloads.put(svg_url, svg_text)
 
         title = selected.get("title") or selected.get("slug") or category
         logging.info("[svgapi] using '%s' for '%s' via query '%s'", title, category, query)
-        return svg_resp.text, svg_url, title
+        return svg_text, svg_url, title
 
     logging.info("[svgapi] no icons found for '%s' after trying %d queries", category, len(queries))
     return "", "", ""
@@ -442,6 +592,170 @@ def restyle_svg(svg_data: str, params: dict) -> Tuple[str, List[str], str, int,
     return svg_content, primitives, path_hash, 256, 256
 
 
+def fetch_row(
+    catid: str,
+    category_name: str,
+    session: ResilientSession,
+    args: argparse.Namespace,
+    metrics: RunMetrics,
+    shared: Optional[Dict[str, Any]] = None,
+    caches: Optional[Dict[str, Any]] = None,
+    query_stats: Optional[QueryStats] = None,
+) -> Tuple[str, str, str, str]:
+    """Run the network part of a row; safe to call from fetch worker threads.
+
+    Returns ``(svg, source_url, title, failure_note)``; the note is empty on
+    success. Rows sharing ``shared`` (one subject group) hold its lock, so
+    they run one at a time and reuse each other's queries and results.
+    """
+
+    shared = shared if shared is not None else {}
+    with shared.get("lock") or nullcontext():
+        if "queries" not in shared:
+            own, fallbacks = search_query_groups(category_name, args.split_compounds)
+            queries = own + fallbacks
+            if query_stats is not None:
+                ordered = query_stats.order(queries, fallbacks)
+                metrics.count("queries_skipped", len(queries) - len(ordered))
+                queries = ordered
+            shared["queries"] = queries
+            shared["fallbacks"] = frozenset(fallbacks)
+        try:
+            svg_raw, source_url, icon_title = fetch_icon_svg(
+                category_name,
+                catid,
+                session,
+                args.api_key,
+                args.search_limit,
+                Deadline(args.row_budget or None),
+                args.api_base,
+                metrics,
+                shared,
+                caches,
+                query_stats,
+            )
+        except FetchAborted as exc:
+            logging.warning("Giving up on %s (%s): %s", catid, category_name, exc)
+            return "", "", "", f"fetch aborted: {exc}"
+
+    if not svg_raw:
+        return "", "", "", "no public icon found"
+    return svg_raw, source_url, icon_title, ""
+
+
+def process_row(
+    catid: str,
+    category_name: str,
+    category_slug: str,
+    style_state: Dict[str, Dict[str, Any]],
+    fetched: Tuple[str, str, str, str],
+    metrics: RunMetrics,
+    sync: Optional[SyncBatch] = None,
+) -> bool:
+    """Restyle and write a fetched row for every style; return success."""
+
+    svg_raw, source_url, icon_title, failure = fetched
+    if failure:
+        record_failed_row(style_state, catid, category_slug, category_name, failure)
+        return False
+
+    try:
+        restyled: Dict[str, Tuple[str, List[str], str, int, int]] = {}
+        with metrics.stage("restyle"):
+            for style_name, info in style_state.items():
+                params = info['params']
+                restyled[style_name] = restyle_svg(svg_raw, params)
+    except ET.ParseError as exc:
+        logging.warning("Failed to parse SVG for %s (%s): %s", catid, source_url, exc)
+        record_failed_row(
+            style_state, catid, category_slug, category_name, 'svg parsing failed', source_url
+        )
+        return False
+
+    for style_name, info in style_state.items():
+        svg_content, primitives, path_hash, width_out, height_out = restyled[style_name]
+        style_dir: Path = info['dir']
+        cat_dir = style_dir / category_slug
+        cat_dir.mkdir(parents=True, exist_ok=True)
+        file_prefix = info['file_prefix']
+        file_path = cat_dir / f"{file_prefix}{catid}.svg"
+        with metrics.stage("write"):
+            atomic_write_text(file_path, svg_content, sync=sync)
+        index: Optional[HashIndex] = info["hash_index"]
+        if index is not None:
+            with metrics.stage("hash_index"):
+                same = index.record_svg(info["batch"], catid, str(file_path.relative_to(style_dir)), svg_content)
+            if same:
+                metrics.count("duplicate_geometry")
+                logging.warning(
+                    "%s (%s) has the same geometry as %s", catid, style_name,
+                    ", ".join(f"{e.batch}/{e.file}" for e in same[:3]),
+                )
+
+        concept = f"downloaded from svgapi ({icon_title})"
+        if info['params'].get('raw_output'):
+            concept += " [raw]"
+        record_manifest_entry(
+            info,
+            {
+                'Catid': catid,
+                'category': category_slug,
+                'title_selected': category_name,
+                'concept_notes': concept,
+                'primitives_used': ','.join(primitives),
+                'path_hash': path_hash,
+                'width': width_out,
+                'height': height_out,
+                'stroke_width': info['stroke_width'],
+                'color_hex': info['color'],
+                'validation_passed': 'TRUE',
+                'source_icon': source_url,
+            },
+        )
+    return True
+
+
+def order_manifests(style_state: Dict[str, Dict[str, Any]], catids: Sequence[str]) -> None:
+    """Put every style's manifest rows in ``catids`` order, as a full run over the input writes them."""
+
+    position = {catid: idx for idx, catid in enumerate(catids)}
+    for info in style_state.values():
+        store: Optional[ManifestStore] = info.get("store")
+        if store is not None:
+            store.reorder(catids)
+            continue
+        manifest: List[Dict[str, Any]] = info["manifest"]
+        manifest.sort(key=lambda entry: position.get((entry.get("Catid") or "").strip(), len(position)))
+        info["manifest_index"] = {
+            (entry.get("Catid") or "").strip(): idx for idx, entry in enumerate(manifest) if entry.get("Catid")
+        }
+
+
+def write_manifests(style_state: Dict[str, Dict[str, Any]], sync: Optional[SyncBatch] = None) -> None:
+    """Write the accumulated manifest rows of every style to disk.
+
+    With ``sync`` enabled the SVGs written so far are flushed first, so a
+    manifest never lists an icon that a crash could still lose.
+    """
+
+    durable = sync is not None and sync.enabled
+    if durable:
+        sync.checkpoint()
+    for style_name, info in style_state.items():
+        store: Optional[ManifestStore] = info.get("store")
+        if store is not None:
+            store.commit()
+            logging.info("Committed %d manifest rows to %s", len(store), store.path)
+            continue
+        manifest_path: Path = info['manifest_path']
+        with atomic_open(manifest_path, 'w', newline='', fsync=durable) as mf:
+            writer = csv.DictWriter(mf, fieldnames=MANIFEST_FIELDS)
+            writer.writeheader()
+            for row in info['manifest']:
+                writer.writerow({key: row.get(key, "") for key in MANIFEST_FIELDS})
+        logging.info("Wrote %s", manifest_path)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Download SVG icons with style variants")
     parser.add_argument(
@@ -460,6 +774,11 @@ def main():
         default=os.environ.get("SVGAPI_API_KEY", "Ty5WcDa63E"),
         help="SVGAPI key (defaults to example key or SVGAPI_API_KEY env var)",
     )
+    parser.add_argument(
+        "--api-base",
+        default=os.environ.get("SVGAPI_BASE_URL", SVGAPI_BASE_URL),
+        help="Base URL of the svgapi endpoint (point at scripts/svgapi_stub_server.py for offline runs)",
+    )
     parser.add_argument(
         "--search-limit",
         type=int,
@@ -476,6 +795,113 @@ def main():
         action="store_true",
         help="Skip categories whose manifest entries and SVG files already exist",
     )
+    parser.add_argument(
+        "--fsync-every",
+        type=int,
+        default=int(os.environ.get("ICON_FSYNC_EVERY", "0")),
+        help="fsync written SVGs in batches of this many files and before manifests are written (0 disables)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        help="Only process rows whose Catid hashes to shard i of N (e.g. 0/4); "
+        "combine shard outputs with scripts/manifest_tool.py merge",
+    )
+    parser.add_argument(
+        "--only-catids",
+        type=Path,
+        help="Refetch only the Catids listed in this file (one per line, see scripts/taxonomy_diff.py) "
+        "and keep the other manifest rows",
+    )
+    parser.add_argument(
+        "--hash-index",
+        type=Path,
+        default=os.environ.get("ICON_HASH_INDEX"),
+        help="Record every written icon's geometry hash in this index shared by all batches and "
+        "warn when it matches an earlier icon (env ICON_HASH_INDEX)",
+    )
+    parser.add_argument(
+        "--manifest-backend",
+        choices=("csv", "sqlite"),
+        default=os.environ.get("ICON_MANIFEST_BACKEND", "csv"),
+        help="Keep manifests as CSV files or in an indexed manifest.sqlite per style "
+        "(export with scripts/manifest_tool.py)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=float(os.environ.get("SVGAPI_TIMEOUT_SEC", "10")),
+        help="Read timeout in seconds for a single HTTP request",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries with jittered exponential backoff for transient HTTP errors",
+    )
+    parser.add_argument(
+        "--row-budget",
+        type=float,
+        default=60.0,
+        help="Wall-clock seconds allowed per row before it is recorded as failed (0 disables)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=16,
+        help="Maximum pooled HTTP connections per host",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("ICON_FETCH_WORKERS", "1")),
+        help="Concurrent fetch threads; rows are still written in input order",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=float(os.environ.get("SVGAPI_RATE_LIMIT", "0")),
+        help="Requests per second per host shared by all workers (default 0: off); halves on HTTP 429",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=10,
+        help="Requests allowed back to back before --rate-limit pacing applies",
+    )
+    parser.add_argument(
+        "--split-compounds",
+        action="store_true",
+        help="Split Dutch compound subjects into lexicon words when building search queries",
+    )
+    parser.add_argument(
+        "--adaptive-queries",
+        action="store_true",
+        help="Reorder and skip search queries using hit rates persisted from earlier runs",
+    )
+    parser.add_argument(
+        "--query-stats",
+        type=Path,
+        default=DEFAULT_STATS_PATH,
+        help="Query hit-rate statistics file used by --adaptive-queries (env ICON_QUERY_STATS)",
+    )
+    parser.add_argument(
+        "--negative-ttl",
+        type=float,
+        default=float(os.environ.get("ICON_NEGATIVE_TTL_HOURS", DEFAULT_TTL_HOURS)),
+        help="Hours to remember searches that returned no icons (0 disables the negative cache)",
+    )
+    parser.add_argument(
+        "--negative-cache",
+        type=Path,
+        default=DEFAULT_NEGATIVE_CACHE_PATH,
+        help="File holding empty searches for --negative-ttl (env ICON_NEGATIVE_CACHE)",
+    )
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="Parse XLSX input directly instead of using the converted copy in TAXONOMY_CACHE_DIR",
+    )
     args = parser.parse_args()
 
     input_path = Path(args.csv)
@@ -483,7 +909,11 @@ def main():
     log_path = configure_logging(out_root, args.log_level)
 
     logging.info("Reading categories from %s", input_path)
-    rows = load_taxonomy_rows(input_path)
+    metrics = RunMetrics()
+    with metrics.stage("read"):
+        rows = load_taxonomy_columns(input_path, None if args.no_input_cache else DEFAULT_CACHE_DIR)
+
+    only_catids = read_catid_filter(args.only_catids) if args.only_catids else None
 
     requested_styles: Iterable[str] = [s.strip() for s in args.styles.split(',') if s.strip()]
     styles: Dict[str, Dict[str, Any]] = {}
@@ -496,148 +926,172 @@ def main():
         style_params = dict(STYLE_VARIANTS[canonical_name])
         styles[style] = style_params
 
-    session = requests.Session()
+    if only_catids is not None:
+        missing = [
+            style for style in styles
+            if not any((out_root / style / name).exists() for name in ("manifest.csv", MANIFEST_DB_NAME))
+        ]
+        if missing:
+            logging.info(
+                "No manifest for %s in %s; ignoring --only-catids and running every row",
+                ", ".join(missing), out_root,
+            )
+            only_catids = None
+    keep_manifest = args.resume or only_catids is not None
+
+    session = ResilientSession(
+        pool_maxsize=max(args.pool_size, args.workers),
+        max_retries=args.retries,
+        read_timeout=args.timeout,
+        rate_limit=args.rate_limit or None,
+        burst=args.burst,
+    )
     logging.info("Writing logs to %s", log_path)
     logging.info("Generating icons for %d categories (%s)", len(rows), ", ".join(styles))
 
+    hash_index = HashIndex(args.hash_index) if args.hash_index else None
     style_state: Dict[str, Dict[str, Any]] = {}
     for style_name, params in styles.items():
         style_dir = out_root / style_name
         style_dir.mkdir(parents=True, exist_ok=True)
         manifest_path = style_dir / "manifest.csv"
-        if args.resume:
+        file_prefix = params.get("file_prefix", "")
+        manifest_rows, manifest_index, completed_catids = [], {}, set()
+        store = None
+        if args.manifest_backend == "sqlite":
+            store, completed_catids = open_manifest_store(style_dir, keep_manifest, args.fsync_every > 0)
+        elif keep_manifest:
             manifest_rows, manifest_index, completed_catids = load_existing_manifest(manifest_path)
+        if args.resume:
+            with metrics.stage("resume_index"):
+                completion = CompletionIndex.build(style_dir, file_prefix, completed_catids)
+            logging.info("%d rows of %s already complete", len(completion), style_name)
         else:
-            manifest_rows, manifest_index, completed_catids = [], {}, set()
+            completion = CompletionIndex()
+        if hash_index is not None and not keep_manifest:
+            hash_index.remove_batch(batch_name(style_dir))
         style_state[style_name] = {
             "params": params,
             "dir": style_dir,
             "manifest": manifest_rows,
             "manifest_index": manifest_index,
             "completed_catids": completed_catids,
-            "file_prefix": params.get("file_prefix", ""),
+            "completion": completion,
+            "file_prefix": file_prefix,
             "color": params.get("stroke_color") or "",
             "stroke_width": params.get("stroke_width") if params.get("stroke_width") is not None else "",
             "manifest_path": manifest_path,
+            "store": store,
+            "hash_index": hash_index,
+            "batch": batch_name(style_dir),
         }
 
-    for row in rows:
-        catid_value = row.get('Catid', '')
-        catid = str(catid_value).strip()
-        if not catid:
-            logging.warning("Skipping row without Catid: %s", row)
-            continue
-
-        category_name = deepest_category(row) or row.get('Root category') or 'Unknown'
-        category_name = category_name.strip() if isinstance(category_name, str) else str(category_name)
-        category_slug = slugify(category_name)
-        logging.debug("Processing %s (%s)", catid, category_name)
-
-        if args.resume and row_outputs_complete(catid, category_slug, style_state):
-            logging.info("Skipping %s (%s) -- already complete", catid, category_name)
-            continue
-
-        svg_raw, source_url, icon_title = fetch_icon_svg(
-            category_name,
-            catid,
-            session,
-            args.api_key,
-            args.search_limit,
+    with metrics.stage("plan"):
+        subjects: List[Tuple[str, str]] = []
+        seen_catids: Dict[str, None] = {}  # every owned Catid, in input order
+        for row in rows:
+            catid_value = row.get('Catid', '')
+            catid = str(catid_value).strip()
+            if not catid:
+                logging.warning("Skipping row without Catid: %s", row)
+                continue
+            if args.shard is not None and not args.shard.owns(catid):
+                continue
+            seen_catids[catid] = None
+            if only_catids is not None and catid not in only_catids:
+                continue
+            category_name = deepest_category(row) or row.get('Root category') or 'Unknown'
+            category_name = category_name.strip() if isinstance(category_name, str) else str(category_name)
+            subjects.append((catid, category_name))
+        plan = SubjectPlan(name for _, name in subjects)
+    logging.info("Planned %d rows as %d distinct subjects", plan.rows, len(plan))
+    if only_catids is not None:
+        gone = {catid for catid in only_catids.difference(seen_catids) if args.shard is None or args.shard.owns(catid)}
+        dropped = drop_manifest_entries(style_state, gone)
+        drop_moved_svgs(style_state, subjects)
+        logging.info("Refetching %d listed rows; dropped %d manifest rows no longer in the input", plan.rows, dropped)
+    if args.shard is not None:
+        write_shard_file(out_root, args.shard)
+        logging.info("Processing shard %s", args.shard)
+    endpoint = endpoint_key(args.api_base, args.api_key)
+    negative = None
+    if args.negative_ttl > 0:
+        negative = NegativeCache.load(args.negative_cache, args.negative_ttl * 3600, endpoint=endpoint)
+        logging.info("Loaded %d cached empty searches from %s", len(negative), args.negative_cache)
+    caches = new_fetch_caches(negative)
+    query_stats = QueryStats.load(args.query_stats, endpoint) if args.adaptive_queries else None
+    sync = SyncBatch(args.fsync_every)
+
+    def timed_fetch(position: int, catid: str, category_name: str) -> Tuple[Tuple[str, str, str, str], float]:
+        started = metrics.clock()
+        fetched = fetch_row(
+            catid, category_name, session, args, metrics, plan.state(position), caches, query_stats
         )
+        return fetched, metrics.clock() - started
+
+    def complete(position: int, catid: str, category_name: str, category_slug: str, future: Future) -> None:
+        fetched, fetch_seconds = future.result()
+        started = metrics.clock()
+        ok = process_row(catid, category_name, category_slug, style_state, fetched, metrics, sync)
+        metrics.record_row(catid, category_name, fetch_seconds + metrics.clock() - started)
+        plan.done(position)
+        metrics.count("rows_ok" if ok else "rows_failed")
+
+    # Workers fetch ahead; rows are restyled, written and added to the
+    # manifests on this thread in input order, so output does not depend on
+    # the number of workers.
+    workers = max(1, args.workers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+    pending: Deque[Tuple[int, str, str, str, Future]] = deque()
+    try:
+        for position, (catid, category_name) in enumerate(subjects):
+            category_slug = slugify(category_name)
+            logging.debug("Processing %s (%s)", catid, category_name)
+
+            # Listed rows are refetched even when their outputs exist.
+            if args.resume and only_catids is None and row_outputs_complete(catid, category_slug, style_state):
+                logging.info("Skipping %s (%s) -- already complete", catid, category_name)
+                metrics.count("rows_skipped")
+                plan.done(position)
+                continue
 
-        if not svg_raw:
-            for info in style_state.values():
-                record_manifest_entry(
-                    info,
-                    {
-                        'Catid': catid,
-                        'category': category_slug,
-                        'title_selected': category_name,
-                        'concept_notes': 'no public icon found',
-                        'primitives_used': '',
-                        'path_hash': '',
-                        'width': 0,
-                        'height': 0,
-                        'stroke_width': info['stroke_width'],
-                        'color_hex': info['color'],
-                        'validation_passed': 'FALSE',
-                        'source_icon': '',
-                    },
-                )
-            continue
-
-        try:
-            restyled: Dict[str, Tuple[str, List[str], str, int, int]] = {}
-            for style_name, info in style_state.items():
-                params = info['params']
-                restyled[style_name] = restyle_svg(svg_raw, params)
-        except ET.ParseError as exc:
-            logging.warning("Failed to parse SVG for %s (%s): %s", catid, source_url, exc)
-            for info in style_state.values():
-                record_manifest_entry(
-                    info,
-                    {
-                        'Catid': catid,
-                        'category': category_slug,
-                        'title_selected': category_name,
-                        'concept_notes': 'svg parsing failed',
-                        'primitives_used': '',
-                        'path_hash': '',
-                        'width': 0,
-                        'height': 0,
-                        'stroke_width': info['stroke_width'],
-                        'color_hex': info['color'],
-                        'validation_passed': 'FALSE',
-                        'source_icon': source_url,
-                    },
-                )
-            continue
-
-        for style_name, info in style_state.items():
-            svg_content, primitives, path_hash, width_out, height_out = restyled[style_name]
-            style_dir: Path = info['dir']
-            cat_dir = style_dir / category_slug
-            cat_dir.mkdir(parents=True, exist_ok=True)
-            file_prefix = info['file_prefix']
-            file_path = cat_dir / f"{file_prefix}{catid}.svg"
-            with open(file_path, 'w', encoding='utf-8') as sf:
-                sf.write(svg_content)
-
-            concept = f"downloaded from svgapi ({icon_title})"
-            if info['params'].get('raw_output'):
-                concept += " [raw]"
-            record_manifest_entry(
-                info,
-                {
-                    'Catid': catid,
-                    'category': category_slug,
-                    'title_selected': category_name,
-                    'concept_notes': concept,
-                    'primitives_used': ','.join(primitives),
-                    'path_hash': path_hash,
-                    'width': width_out,
-                    'height': height_out,
-                    'stroke_width': info['stroke_width'],
-                    'color_hex': info['color'],
-                    'validation_passed': 'TRUE',
-                    'source_icon': source_url,
-                },
+            future = pool.submit(timed_fetch, position, catid, category_name)
+            pending.append((position, catid, category_name, category_slug, future))
+            if len(pending) >= workers * 4:
+                complete(*pending.popleft())
+        while pending:
+            complete(*pending.popleft())
+        pool.shutdown()
+
+        with metrics.stage("manifest"):
+            if only_catids is not None:
+                order_manifests(style_state, list(seen_catids))
+            write_manifests(style_state, sync)
+        if sync.enabled:
+            metrics.count("fsynced", sync.synced)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        for host, limiter in session.limiters.items():
+            metrics.count("throttled", limiter.throttled)
+            logging.info(
+                "Rate limit for %s ended at %.2f req/s after %d throttled replies (%.1fs waiting)",
+                host, limiter.rate, limiter.throttled, limiter.waited,
             )
-
-    fieldnames = [
-        'Catid', 'category', 'title_selected', 'concept_notes', 'primitives_used',
-        'path_hash', 'width', 'height', 'stroke_width', 'color_hex',
-        'validation_passed', 'source_icon'
-    ]
-
-    for style_name, info in style_state.items():
-        manifest_path: Path = info['manifest_path']
-        with open(manifest_path, 'w', newline='', encoding='utf-8') as mf:
-            writer = csv.DictWriter(mf, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in info['manifest']:
-                writer.writerow({key: row.get(key, "") for key in fieldnames})
-        logging.info("Wrote %s", manifest_path)
+        for info in style_state.values():
+            if info["store"] is not None:
+                sync.checkpoint()
+                info["store"].close()
+        if hash_index is not None:
+            logging.info("Hash index %s holds %d icons", hash_index.path, len(hash_index))
+            hash_index.close()
+        if negative is not None:
+            negative.save()
+        if query_stats is not None:
+            query_stats.save(args.query_stats)
+            logging.info("Saved query statistics to %s", args.query_stats)
+        metrics_path = metrics.write(out_root / "run_metrics.json")
+        print(metrics.summary_table())
+        logging.info("Wrote %s", metrics_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Generate a synthetic taxonomy export for scale testing.
+
+Names are sampled per depth from ``--source`` (the bundled
+``category_tree_report.xlsx`` by default) and the lexicons in
+``src/taxonomy``. The output uses the exact column layout read by
+``load_taxonomy_rows`` and is reproducible for a given ``--seed``.
+
+Usage:
+    python scripts/generate_synthetic_taxonomy.py --rows 1000000 --out synthetic/1m.csv --xlsx synthetic/1m.xlsx
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from taxonomy.synthetic import (  # noqa: E402
+    DEFAULT_DEPTH_WEIGHTS,
+    Vocabulary,
+    generate_rows,
+    parse_depth_weights,
+    write_csv,
+    write_xlsx,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic 6-level taxonomy")
+    parser.add_argument("--rows", type=int, required=True, help="Number of rows to generate")
+    parser.add_argument("--out", type=Path, help="CSV output path")
+    parser.add_argument("--xlsx", type=Path, help="XLSX output path")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=ROOT / "category_tree_report.xlsx",
+        help="Taxonomy export (CSV or XLSX) to sample category names from",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; equal seeds give identical files")
+    parser.add_argument(
+        "--depth-weights",
+        default=",".join(f"{w:g}" for w in DEFAULT_DEPTH_WEIGHTS),
+        help="Comma-separated share of rows per depth, root first",
+    )
+    parser.add_argument(
+        "--english-ratio",
+        type=float,
+        default=0.1,
+        help="Fraction of names drawn from the English lexicon",
+    )
+    parser.add_argument(
+        "--compose-ratio",
+        type=float,
+        default=0.5,
+        help="Fraction of names extended with a connector and lexicon word",
+    )
+    args = parser.parse_args()
+
+    if not args.out and not args.xlsx:
+        parser.error("provide --out and/or --xlsx")
+    try:
+        weights = parse_depth_weights(args.depth_weights)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    vocabulary = Vocabulary.from_file(args.source)
+
+    def rows():
+        return generate_rows(
+            args.rows,
+            vocabulary,
+            seed=args.seed,
+            depth_weights=weights,
+            english_ratio=args.english_ratio,
+            compose_ratio=args.compose_ratio,
+        )
+
+    if args.out:
+        print(f"Wrote {write_csv(rows(), args.out)} rows to {args.out}")
+    if args.xlsx:
+        print(f"Wrote {write_xlsx(rows(), args.xlsx)} rows to {args.xlsx}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Serve house-style icons for a taxonomy over local HTTP.
+
+Usage:
+    python scripts/icon_service.py --csv category_tree_report.xlsx --port 8780
+    curl http://127.0.0.1:8780/icons/2084.svg
+
+The taxonomy is read once and every subject's template is picked at startup,
+so a request only renders (or hits the LRU). Responses are byte-identical to
+the files ``generate_house_style_icons.py`` writes for the same input.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+import generate_house_style_icons as house  # noqa: E402
+from pipeline.counter_rng import DEFAULT_RNG, RNG_CHOICES, RngMismatch, resolve_rng  # noqa: E402
+from pipeline.icon_service import IconServer, IconService  # noqa: E402
+from taxonomy.resolver import deepest_category  # noqa: E402
+from taxonomy.store import DEFAULT_CACHE_DIR, load_taxonomy_columns  # noqa: E402
+
+
+def build_service(csv_path: Path, cache_dir, cache_size: int, rng: str = "mt") -> IconService:
+    rows = load_taxonomy_columns(csv_path, cache_dir)
+    subjects: Dict[str, str] = {}
+    for row in rows:
+        catid = str(row["Catid"]).strip()
+        # Later rows win, as they overwrite earlier files in a batch run.
+        subjects[catid] = deepest_category(row) or row.get("Root category", "").strip() or catid
+    templates = {subject: house.pick_template(subject) for subject in set(subjects.values())}
+    logging.info("Loaded %d rows with %d distinct subjects from %s", len(subjects), len(templates), csv_path)
+
+    def render(catid: str, subject: str) -> str:
+        return house.render_row(catid, subject, templates[subject], rng)[0]
+
+    return IconService(subjects, render, cache_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve house-style icons over HTTP")
+    parser.add_argument("--csv", type=Path, required=True, help="Input taxonomy file (CSV or XLSX)")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8780, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--cache-size", type=int, default=4096, help="Rendered icons kept in memory")
+    parser.add_argument(
+        "--rng",
+        choices=RNG_CHOICES,
+        default=os.environ.get("ICON_RNG"),
+        help="Random generator the icons were generated with (see generate_house_style_icons.py --rng)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="Output directory the served icons must match; its recorded --rng is used and a "
+        "different --rng is refused",
+    )
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="Parse XLSX input directly instead of using the converted copy in TAXONOMY_CACHE_DIR",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    cache_dir = None if args.no_input_cache else DEFAULT_CACHE_DIR
+    rng = args.rng or DEFAULT_RNG
+    if args.batch:
+        try:
+            rng = resolve_rng(args.rng, args.batch)
+        except RngMismatch as exc:
+            raise SystemExit(str(exc))
+    service = build_service(args.csv, cache_dir, args.cache_size, rng)
+    server = IconServer(service, host=args.host, port=args.port)
+    print(f"icon service listening on {server.base_url}", flush=True)
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Inspect, convert and merge icon manifests.
+
+Usage:
+    python scripts/manifest_tool.py export output/test/brand
+    python scripts/manifest_tool.py import output/test/brand
+    python scripts/manifest_tool.py duplicates output/test/brand
+    python scripts/manifest_tool.py merge --csv categories.csv --out output/full output/shard-*
+
+``export``, ``import`` and ``duplicates`` take a style directory holding
+``manifest.sqlite``. ``export`` writes ``manifest.csv`` in the usual schema,
+``import`` loads an existing ``manifest.csv`` into the database and
+``duplicates`` lists Catids that share a path hash. ``merge`` combines the
+output trees of a run split with ``--shard`` into the tree an unsharded run
+would have written, after checking that every row is there exactly once.
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from pipeline.atomic import atomic_open  # noqa: E402
+from pipeline.counter_rng import RNG_FILE, read_rng_file, write_rng_file  # noqa: E402
+from pipeline.manifest_store import MANIFEST_DB_NAME, ManifestStore  # noqa: E402
+from pipeline.sharding import (  # noqa: E402
+    SHARD_FILE,
+    ShardMergeError,
+    check_shard_set,
+    merge_manifest_rows,
+    read_shard_file,
+)
+from taxonomy.store import DEFAULT_CACHE_DIR, load_taxonomy_columns  # noqa: E402
+
+# Per-run files that are not part of the merged output.
+RUN_FILES = {SHARD_FILE, RNG_FILE, "generation.log", "run_metrics.json"}
+
+
+def open_store(style_dir: Path) -> ManifestStore:
+    db_path = style_dir / MANIFEST_DB_NAME
+    if not db_path.exists():
+        raise SystemExit(f"{db_path} does not exist")
+    return ManifestStore(db_path, ())
+
+
+def export_manifest(args: argparse.Namespace) -> None:
+    store = open_store(args.style_dir)
+    out = args.out or args.style_dir / "manifest.csv"
+    print(f"Wrote {store.export_csv(out)} rows to {out}")
+    store.close()
+
+
+def import_manifest(args: argparse.Namespace) -> None:
+    source = args.csv or args.style_dir / "manifest.csv"
+    with source.open(newline="", encoding="utf-8") as handle:
+        fields = next(csv.reader(handle), [])
+    if "Catid" not in fields:
+        raise SystemExit(f"{source} has no Catid column")
+    store = ManifestStore(args.style_dir / MANIFEST_DB_NAME, fields)
+    print(f"Imported {store.import_csv(source)} rows into {store.path}")
+    store.close()
+
+
+def list_duplicates(args: argparse.Namespace) -> None:
+    store = open_store(args.style_dir)
+    duplicates = store.duplicate_hashes()
+    for path_hash, catids in duplicates.items():
+        print(f"{path_hash}\t{','.join(catids)}")
+    print(f"{len(duplicates)} duplicated path hashes", file=sys.stderr)
+    store.close()
+
+
+def read_manifest(directory: Path) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Return the field names and rows of the CSV or SQLite manifest in ``directory``."""
+
+    if (directory / MANIFEST_DB_NAME).exists():
+        store = ManifestStore(directory / MANIFEST_DB_NAME, ())
+        fields, rows = store.fields, list(store.rows())
+        store.close()
+        return fields, rows
+    with (directory / "manifest.csv").open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        return list(reader.fieldnames or []), list(reader)
+
+
+def scan_shard(root: Path) -> Tuple[List[Path], List[Path]]:
+    """Relative manifest directories and output files below a shard root."""
+
+    manifests: List[Path] = []
+    files: List[Path] = []
+    for dirpath, _, names in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root)
+        if "manifest.csv" in names or MANIFEST_DB_NAME in names:
+            manifests.append(rel_dir)
+        for name in names:
+            if name.startswith(("manifest.csv", MANIFEST_DB_NAME, ".")) or name.endswith(".tmp"):
+                continue
+            if rel_dir == Path(".") and name in RUN_FILES:
+                continue
+            files.append(rel_dir / name)
+    return sorted(manifests), files
+
+
+def merge_shards(args: argparse.Namespace) -> None:
+    shards = {}
+    for root in args.shard_dirs:
+        shard = read_shard_file(root)
+        if shard is None:
+            raise SystemExit(f"{root} has no {SHARD_FILE}; was it written with --shard?")
+        shards[root] = shard
+    try:
+        count = check_shard_set(shards.values())
+    except ShardMergeError as exc:
+        raise SystemExit(str(exc))
+    rngs = {read_rng_file(root) for root in args.shard_dirs}
+    if len(rngs) != 1:
+        raise SystemExit(f"shards were generated with different --rng values: {sorted(map(str, rngs))}")
+
+    scans = {root: scan_shard(root) for root in args.shard_dirs}
+    manifest_dirs = {tuple(manifests) for manifests, _ in scans.values()}
+    if len(manifest_dirs) != 1:
+        raise SystemExit("shards do not contain the same manifests")
+    owners: Dict[Path, Path] = {}
+    for root, (_, files) in scans.items():
+        for rel in files:
+            if rel in owners:
+                raise SystemExit(f"{rel} was written by both {owners[rel]} and {root}")
+            owners[rel] = root
+
+    rows = load_taxonomy_columns(args.csv, None if args.no_input_cache else DEFAULT_CACHE_DIR)
+    catids = [str(row.get("Catid", "")).strip() for row in rows]
+    merged: Dict[Path, Tuple[List[str], List[Dict[str, str]]]] = {}
+    for rel_dir in manifest_dirs.pop():
+        per_shard = {shards[root].index: read_manifest(root / rel_dir) for root in args.shard_dirs}
+        fields = {tuple(f) for f, _ in per_shard.values()}
+        if len(fields) != 1:
+            raise SystemExit(f"{rel_dir}/manifest.csv has different columns in different shards")
+        try:
+            rows_in_order = merge_manifest_rows(catids, {i: r for i, (_, r) in per_shard.items()}, count)
+        except ShardMergeError as exc:
+            raise SystemExit(f"{rel_dir}: {exc}")
+        merged[rel_dir] = (list(fields.pop()), rows_in_order)
+
+    rng = rngs.pop()
+    if rng is not None:
+        write_rng_file(args.out, rng)
+    for rel, root in owners.items():
+        target = args.out / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(root / rel, target)
+    for rel_dir, (fields, manifest_rows) in merged.items():
+        (args.out / rel_dir).mkdir(parents=True, exist_ok=True)
+        with atomic_open(args.out / rel_dir / "manifest.csv", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(manifest_rows)
+        print(f"Merged {len(manifest_rows)} rows into {args.out / rel_dir / 'manifest.csv'}")
+    print(f"Copied {len(owners)} files from {count} shards to {args.out}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect, convert and merge icon manifests")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write manifest.csv from manifest.sqlite")
+    export.add_argument("style_dir", type=Path)
+    export.add_argument("--out", type=Path, help="CSV path (default: manifest.csv in the style directory)")
+    export.set_defaults(func=export_manifest)
+
+    load = commands.add_parser("import", help="Load manifest.csv into manifest.sqlite")
+    load.add_argument("style_dir", type=Path)
+    load.add_argument("--csv", type=Path, help="CSV path (default: manifest.csv in the style directory)")
+    load.set_defaults(func=import_manifest)
+
+    duplicates = commands.add_parser("duplicates", help="List Catids that share a path hash")
+    duplicates.add_argument("style_dir", type=Path)
+    duplicates.set_defaults(func=list_duplicates)
+
+    merge = commands.add_parser("merge", help="Combine the outputs of a run split with --shard")
+    merge.add_argument("shard_dirs", type=Path, nargs="+", help="Output directories of every shard")
+    merge.add_argument("--csv", type=Path, required=True, help="Taxonomy file the shards were generated from")
+    merge.add_argument("--out", type=Path, required=True, help="Directory for the merged output")
+    merge.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="Parse XLSX input directly instead of using the converted copy in TAXONOMY_CACHE_DIR",
+    )
+    merge.set_defaults(func=merge_shards)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Serve a local svgapi.com stand-in backed by the recorded fixture corpus.
+
+Usage:
+    python scripts/svgapi_stub_server.py --port 8765 --latency 0.05 --error-rate 0.02
+    python scripts/generate_icons.py --api-base http://127.0.0.1:8765 --csv categories_250.csv
+
+See ``tests/fixtures/svgapi/README.md`` for the corpus layout.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.append(str(SRC_PATH))
+
+from pipeline.stub_server import DEFAULT_CORPUS, StubConfig, SvgapiStub  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Fixture corpus directory")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay in seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument(
+        "--miss-rate",
+        type=float,
+        default=0.3,
+        help="Fraction of unrecorded, unmatched queries that return no icons",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Requests per second before answering 429 (0 disables throttling)",
+    )
+    parser.add_argument("--burst", type=int, default=10, help="Burst size allowed by the throttle")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and error injection")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        corpus_dir=args.corpus,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        miss_rate=args.miss_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+    stub = SvgapiStub(config, host=args.host, port=args.port)
+    print(f"svgapi stub listening on {stub.base_url}", flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Show what changed between two taxonomy exports.
+
+Usage:
+    python scripts/taxonomy_diff.py old/category_tree_report.xlsx category_tree_report.xlsx \\
+        --catids changed.txt --report changes.csv
+    python scripts/generate_house_style_icons.py --csv category_tree_report.xlsx --out output/house_style \\
+        --only-catids changed.txt
+
+Rows are matched by Catid and classified as added, removed, renamed (own
+category name differs) or moved (parent or depth differs). ``--catids``
+writes every affected Catid one per line, the format both generators accept
+with ``--only-catids``; ``--report`` writes one CSV line per change with the
+old and new name and parent.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+from pipeline.atomic import atomic_open, atomic_write_text  # noqa: E402
+from taxonomy.diff import compare_placements, load_placements  # noqa: E402
+from taxonomy.store import DEFAULT_CACHE_DIR  # noqa: E402
+
+REPORT_FIELDS = ["change", "Catid", "old_name", "new_name", "old_parent", "new_parent"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two taxonomy exports by Catid")
+    parser.add_argument("old", type=Path, help="Earlier export (CSV or XLSX)")
+    parser.add_argument("new", type=Path, help="Later export (CSV or XLSX)")
+    parser.add_argument("--catids", type=Path, help="Write affected Catids here, one per line")
+    parser.add_argument("--report", type=Path, help="Write a CSV with one line per change")
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="Parse XLSX input directly instead of using the converted copy in TAXONOMY_CACHE_DIR",
+    )
+    args = parser.parse_args()
+    cache_dir = None if args.no_input_cache else DEFAULT_CACHE_DIR
+
+    started = time.perf_counter()
+    old = load_placements(args.old, cache_dir)
+    new = load_placements(args.new, cache_dir)
+    changes = compare_placements(old, new)
+    print(f"{changes.summary()} ({len(old)} -> {len(new)} rows, {time.perf_counter() - started:.2f}s)")
+
+    if args.catids:
+        atomic_write_text(args.catids, "".join(f"{catid}\n" for catid in changes.catids()))
+        print(f"Wrote {len(changes.catids())} Catids to {args.catids}")
+    if args.report:
+        with atomic_open(args.report, newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for kind in ("added", "removed", "renamed", "moved"):
+                for catid in getattr(changes, kind):
+                    old_name, _, old_parent = old.get(catid, ("", -1, ""))
+                    new_name, _, new_parent = new.get(catid, ("", -1, ""))
+                    writer.writerow({
+                        "change": kind,
+                        "Catid": catid,
+                        "old_name": old_name,
+                        "new_name": new_name,
+                        "old_parent": old_parent,
+                        "new_parent": new_parent,
+                    })
+        print(f"Wrote {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,47 @@
 #!/usr/bin/env python3
-"""Validate SVG outputs for style and basic semantic hints.
+"""Validate SVG outputs for style and semantic fit.
 
 Usage:
     python scripts/validate_outputs.py output/test output/test2
+    python scripts/validate_outputs.py output/house_style --low-fidelity refetch.txt
 
 The script scans each provided directory. If the directory directly
-contains a ``manifest.csv`` it will validate the icons in that folder.
-Otherwise each immediate subdirectory containing a ``manifest.csv`` is
-processed. A consolidated ``validation_report.csv`` is written to the
-current working directory.
+contains a ``manifest.csv`` (or a ``manifest.sqlite`` written with
+``--manifest-backend sqlite``) it will validate the icons in that folder.
+Otherwise each immediate subdirectory containing a manifest is processed. A consolidated ``validation_report.csv`` is written to the
+current working directory. Icons are read both from flat house-style
+batches (``<Catid>.svg``) and from the ``<category>/<prefix><Catid>.svg``
+layout of ``generate_icons.py`` style folders; the Catid of a nested file is
+taken from the manifest row of its category folder.
+
+Every manifest row is scored in bulk for how well the icon's description
+(the svgapi title or the house-style template note) matches
+``title_selected`` (see :mod:`taxonomy.semantic`). A house-style note is
+scored together with the subject keywords that select its template, since the
+notes are English and the subjects mostly Dutch. ``sem_score`` reports it
+and ``sem_match`` is ``FAIL`` below ``--sem-threshold``. ``--low-fidelity``
+writes the failing Catids one per line, ready for ``--only-catids``.
 """
 from __future__ import annotations
 
+import argparse
 import csv
-import hashlib
+import os
 import pathlib
 import re
 import sys
 from collections import defaultdict
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+SRC = pathlib.Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.append(str(SRC))
+
+import generate_house_style_icons as house  # noqa: E402
+from pipeline.atomic import atomic_write_text  # noqa: E402
+from pipeline.hash_index import HashIndex, batch_name, geometry_hash  # noqa: E402
+from pipeline.manifest_store import MANIFEST_DB_NAME, ManifestStore  # noqa: E402
+from taxonomy.semantic import SemanticScorer  # noqa: E402
 
 STYLE = {
     "stroke": "#E63B14",
@@ -32,13 +55,7 @@ STYLE = {
 FORBIDDEN_TAGS = {"style", "script", "defs", "mask", "clipPath"}
 FORBIDDEN_ATTRS = {"class", "style"}
 
-# Semantic hint keywords per token; extend as the taxonomy grows
-SEM_HINTS: Dict[str, List[str]] = {
-    "drill": ["drill", "tool", "bit"],
-    "screw": ["screw", "bolt", "nut"],
-    "laptop": ["laptop", "computer"],
-}
-
+SVGAPI_NOTE = re.compile(r"^downloaded from svgapi \((?P<title>.*)\)(?: \[raw\])?$")
 SVG_TAG = re.compile(r"<svg[^>]*>", re.I)
 ATTR = lambda k: re.compile(rf"\b{k}=['\"]([^'\"]+)['\"]", re.I)
 CLEAN_TAG = re.compile(r"</?([a-zA-Z0-9:-]+)[^>]*>")
@@ -68,25 +85,51 @@ def check_style(svg_text: str) -> Tuple[bool, List[str]]:
     return (not errors), errors
 
 
-def path_hash(svg_text: str) -> str:
-    """Compute a stable hash for geometry."""
-    norm = re.sub(r"(-?\d+\.\d{3})\d+", r"\1", svg_text)
-    return hashlib.sha256(norm.encode("utf-8")).hexdigest()[:16]
+def icon_description(row: Dict[str, str]) -> str:
+    """What the icon depicts, from its manifest row: svgapi title or template note."""
+    notes = (row.get("concept_notes") or "").strip()
+    match = SVGAPI_NOTE.match(notes)
+    if match:
+        return match.group("title")
+    suffix = f" to represent {(row.get('title_selected') or '').strip()}."
+    return notes[: -len(suffix)] if notes.endswith(suffix) else notes
+
+
+def icon_keywords(row: Dict[str, str], vocabulary: Mapping[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Subject keywords of the house-style template a row was drawn with, if any."""
+    notes = (row.get("concept_notes") or "").strip()
+    if SVGAPI_NOTE.match(notes):
+        return ()
+    return vocabulary.get(icon_description(row), ())
+
 
+def semantic_scores(man: Dict[str, Dict[str, str]],
+                    scorer: SemanticScorer,
+                    vocabulary: Optional[Mapping[str, Tuple[str, ...]]] = None) -> Dict[str, Optional[float]]:
+    """Score every manifest row in one pass."""
+    vocabulary = house.template_vocabulary() if vocabulary is None else vocabulary
+    rows = (
+        (row.get("title_selected") or "", icon_description(row), icon_keywords(row, vocabulary))
+        for row in man.values()
+    )
+    return dict(zip(man, scorer.score_many(rows)))
 
-def semantic_hint_ok(subject: str, svg_text: str):
-    tokens = re.findall(r"[a-z0-9]+", subject.lower())
-    for t in tokens:
-        for hint in SEM_HINTS.get(t, []):
-            if re.search(rf"\b{hint}\b", svg_text, re.I):
-                return True
-    return None  # unknown
+
+def sem_match(score: Optional[float], threshold: float) -> str:
+    if score is None:
+        return "UNKNOWN"
+    return "PASS" if score >= threshold else "FAIL"
 
 
 def load_manifest(p: pathlib.Path) -> Dict[str, Dict[str, str]]:
     man: Dict[str, Dict[str, str]] = {}
+    db_path = p / MANIFEST_DB_NAME
     mf = p / "manifest.csv"
-    if mf.exists():
+    if db_path.exists():
+        store = ManifestStore(db_path, ())
+        man = {row["Catid"]: row for row in store.rows()}
+        store.close()
+    elif mf.exists():
         with mf.open("r", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -94,18 +137,45 @@ def load_manifest(p: pathlib.Path) -> Dict[str, Dict[str, str]]:
     return man
 
 
+def catid_for(stem: str, catids: Set[str]) -> str:
+    """The Catid named by an SVG file stem, dropping a style prefix such as ``test-``."""
+    name = stem
+    while name not in catids and "-" in name:
+        name = name.partition("-")[2]
+    return name if name in catids else stem
+
+
+def icon_files(base: pathlib.Path, man: Dict[str, Dict[str, str]]) -> Iterable[Tuple[str, pathlib.Path]]:
+    """Yield ``(catid, path)`` for the flat and category-folder SVGs of a batch."""
+    folders: Dict[str, Set[str]] = defaultdict(set)
+    for catid, row in man.items():
+        folders[(row.get("category") or "").strip()].add(catid)
+    for svg in sorted(base.glob("*.svg")):
+        yield catid_for(svg.stem, folders[""]), svg
+    for svg in sorted(base.glob("*/*.svg")):
+        yield catid_for(svg.stem, folders[svg.parent.name]), svg
+
+
 def process_dir(base: pathlib.Path,
                 report: List[Dict[str, str]],
-                dup_hashes: defaultdict) -> None:
+                dup_hashes: defaultdict,
+                scorer: SemanticScorer,
+                threshold: float,
+                low_fidelity: Set[str],
+                index: Optional[HashIndex] = None,
+                vocabulary: Optional[Mapping[str, Tuple[str, ...]]] = None) -> None:
     man = load_manifest(base)
-    for svg in base.glob("*.svg"):
-        catid = svg.stem
+    batch = batch_name(base)
+    scores = semantic_scores(man, scorer, vocabulary)
+    low_fidelity.update(catid for catid, score in scores.items() if catid and sem_match(score, threshold) == "FAIL")
+    for catid, svg in icon_files(base, man):
         svg_text = svg.read_text("utf-8", errors="ignore")
         ok_style, errs = check_style(svg_text)
-        ph = path_hash(svg_text)
+        ph = geometry_hash(svg_text)
         dup_hashes[ph].append(str(svg))
+        earlier = index.record(ph, batch, catid, str(svg.relative_to(base))) if index is not None else []
         subject = man.get(catid, {}).get("title_selected") or man.get(catid, {}).get("concept_notes") or ""
-        sem = semantic_hint_ok(subject, svg_text)
+        score = scores.get(catid)
         report.append({
             "dir": str(base),
             "catid": catid,
@@ -113,29 +183,59 @@ def process_dir(base: pathlib.Path,
             "style_ok": ok_style,
             "style_errors": ";".join(errs),
             "path_hash": ph,
-            "sem_match": {True: "PASS", False: "FAIL", None: "UNKNOWN"}[sem if sem is not None else None],
+            "sem_match": sem_match(score, threshold),
+            "sem_score": "" if score is None else f"{score:.2f}",
             "source_icon": man.get(catid, {}).get("source_icon", ""),
+            "duplicate_of": ";".join(str(pathlib.Path(e.batch) / e.file) for e in earlier),
         })
 
 
+def has_manifest(p: pathlib.Path) -> bool:
+    return (p / "manifest.csv").exists() or (p / MANIFEST_DB_NAME).exists()
+
+
 def iter_target_dirs(paths: Iterable[pathlib.Path]) -> Iterable[pathlib.Path]:
     for root in paths:
-        if (root / "manifest.csv").exists():
+        if has_manifest(root):
             yield root
         else:
             for child in sorted(root.iterdir()):
-                if child.is_dir() and (child / "manifest.csv").exists():
+                if child.is_dir() and has_manifest(child):
                     yield child
 
 
 def main(argv: List[str]) -> None:
-    if not argv:
-        argv = ["output/test", "output/test2"]
-    bases = list(iter_target_dirs(map(pathlib.Path, argv)))
+    parser = argparse.ArgumentParser(description="Validate SVG outputs for style and semantic fit")
+    parser.add_argument("dirs", nargs="*", type=pathlib.Path,
+                        default=[pathlib.Path("output/test"), pathlib.Path("output/test2")])
+    parser.add_argument("--sem-threshold", type=float, default=0.5,
+                        help="Share of subject words the icon description must match for sem_match=PASS")
+    parser.add_argument("--low-fidelity", type=pathlib.Path,
+                        help="Write Catids with sem_match=FAIL here, one per line (for --only-catids)")
+    parser.add_argument("--hash-index", type=pathlib.Path, default=os.environ.get("ICON_HASH_INDEX"),
+                        help="Check path hashes against (and add them to) this index of all earlier batches "
+                             "(env ICON_HASH_INDEX)")
+    args = parser.parse_args(argv)
+    bases = list(iter_target_dirs(args.dirs))
     report: List[Dict[str, str]] = []
     dup_hashes: defaultdict = defaultdict(list)
-    for base in bases:
-        process_dir(base, report, dup_hashes)
+    scorer = SemanticScorer()
+    vocabulary = house.template_vocabulary()
+    low_fidelity: Set[str] = set()
+    index = HashIndex(args.hash_index) if args.hash_index else None
+    try:
+        for base in bases:
+            process_dir(base, report, dup_hashes, scorer, args.sem_threshold, low_fidelity, index, vocabulary)
+    finally:
+        if index is not None:
+            index.close()
+    if index is not None:
+        indexed = sum(1 for row in report if row["duplicate_of"])
+        print(f"{indexed} icons share geometry with another indexed icon ({args.hash_index})")
+    print(f"{len(low_fidelity)} Catids scored below --sem-threshold {args.sem_threshold}")
+    if args.low_fidelity:
+        atomic_write_text(args.low_fidelity, "".join(f"{catid}\n" for catid in sorted(low_fidelity)))
+        print("Wrote", args.low_fidelity)
     for h, files in dup_hashes.items():
         if len(files) > 1:
             print("DUPLICATE_GEOMETRY:", h, files)
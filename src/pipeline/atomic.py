@@ -0,0 +1,110 @@
+"""Crash-safe file writes for generated icons, manifests and caches.
+
+Writing in place means an interrupted run can leave a truncated SVG that
+``--resume`` later treats as finished. :func:`atomic_write_text` and
+:func:`atomic_open` write to a hidden temporary file in the target directory
+and ``os.replace`` it over the target, so readers see either the old file or
+the complete new one.
+
+Renaming alone does not make the data durable across a power loss. Rather
+than pay an ``fsync`` per icon, callers pass a :class:`SyncBatch` that
+collects written paths and flushes them together every ``every`` files and
+at checkpoints; the manifest is written only after the icons it lists have
+been synced, so a manifest row never refers to data that was lost.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def fsync_path(path: Path) -> None:
+    """Flush ``path`` (a file or directory) to stable storage."""
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(
+    path: Path, mode: str = "w", encoding: Optional[str] = "utf-8", newline: Optional[str] = None, fsync: bool = False
+) -> Iterator[IO]:
+    """Open a temporary file that replaces ``path`` when the block exits cleanly."""
+
+    tmp_path = _tmp_path(path)
+    if "b" in mode:
+        encoding = None
+    try:
+        with open(tmp_path, mode, encoding=encoding, newline=newline) as handle:
+            yield handle
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync:
+        fsync_path(path.parent)
+
+
+def atomic_write_text(
+    path: Path, text: str, encoding: str = "utf-8", sync: Optional["SyncBatch"] = None, fsync: bool = False
+) -> None:
+    """Replace ``path`` with ``text``; ``sync`` defers the fsync to a batch."""
+
+    with atomic_open(path, "w", encoding=encoding, fsync=fsync) as handle:
+        handle.write(text)
+    if sync is not None:
+        sync.add(path)
+
+
+class SyncBatch:
+    """Paths written since the last checkpoint, fsynced together.
+
+    ``every`` is the number of files after which a checkpoint happens on its
+    own; ``0`` disables syncing, leaving writes atomic but not durable.
+    """
+
+    def __init__(self, every: int = 0):
+        self.every = every
+        self.synced = 0
+        self._pending: List[Path] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.every > 0
+
+    def add(self, path: Path) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.append(path)
+            full = len(self._pending) >= self.every
+        if full:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Flush every pending file, then the directories that hold them."""
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for path in pending:
+            fsync_path(path)
+        for directory in {path.parent for path in pending}:
+            fsync_path(directory)
+        with self._lock:
+            self.synced += len(pending)
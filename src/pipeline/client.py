@@ -0,0 +1,290 @@
+"""HTTP client layer used by the svgapi download pipeline.
+
+``ResilientSession`` wraps a pooled :class:`requests.Session` with jittered
+exponential backoff for transient failures, a per-host circuit breaker, an
+optional per-host :class:`~pipeline.ratelimit.TokenBucket` shared by all
+threads using the session, and an optional wall-clock :class:`Deadline` so a
+single row can never stall a batch.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import TokenBucket
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchAborted(Exception):
+    """Raised when a fetch must stop without trying further queries."""
+
+
+class DeadlineExceeded(FetchAborted):
+    """The wall-clock budget for the current row has been used up."""
+
+
+class CircuitOpenError(FetchAborted):
+    """The circuit breaker for a host is open and rejects new requests."""
+
+
+class Deadline:
+    """Wall-clock budget shared by every request made for one row."""
+
+    def __init__(self, budget: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self.budget = budget
+        self.clock = clock
+        self.expires_at = None if budget is None else clock() + budget
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0.0
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"row budget of {self.budget:.1f}s exhausted")
+
+    def cap(self, seconds: float) -> float:
+        """Return ``seconds`` clipped to the remaining budget."""
+
+        self.check()
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+
+class CircuitBreaker:
+    """Classic closed/open/half-open breaker guarding a single endpoint.
+
+    While half-open a single probe request is admitted; every other caller
+    is rejected until that probe reports back through :meth:`record_success`,
+    :meth:`record_failure` or, when it ended without a verdict, :meth:`release`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    return False
+                self.probing = True
+            return True
+
+    def release(self) -> None:
+        """Give up the half-open probe slot without judging the endpoint."""
+
+        with self._lock:
+            self.probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+def endpoint_key(api_base: str, api_key: str) -> str:
+    """Name an API endpoint for persisted state: its host plus a hash of the key."""
+
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    return f"{urlsplit(api_base).netloc}/{digest}"
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Callable[[], float] = random.random) -> float:
+    """Return a "full jitter" exponential backoff delay for ``attempt``."""
+
+    return rng() * min(cap, base * (2 ** attempt))
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a numeric ``Retry-After`` header, ignoring HTTP-date values."""
+
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class ResilientSession:
+    """Pooled session with retries, circuit breaking and deadline support."""
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        session: Optional[requests.Session] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+    ):
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.sleep = sleep
+        self.rng = rng
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.limiters: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+                self.breakers[host] = breaker
+            return breaker
+
+    def limiter_for(self, url: str) -> Optional[TokenBucket]:
+        if not self.rate_limit:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = TokenBucket(self.rate_limit, self.burst, sleep=self.sleep)
+                self.limiters[host] = limiter
+            return limiter
+
+    def _pause(self, seconds: float, deadline: Optional[Deadline]) -> None:
+        if deadline is not None:
+            seconds = deadline.cap(seconds)
+        if seconds > 0:
+            self.sleep(seconds)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> requests.Response:
+        """GET ``url`` and return a successful response.
+
+        Transient failures (connection errors, timeouts and 429/5xx replies)
+        are retried with jittered exponential backoff. Non-retryable HTTP
+        errors raise :class:`requests.HTTPError` immediately. ``Retry-After``
+        is honoured up to ``backoff_cap`` seconds. With a rate limit every
+        attempt waits for a token; a 429 slows the host's bucket for all
+        threads, and the retry waits only in the bucket.
+        """
+
+        breaker = self.breaker_for(url)
+        limiter = self.limiter_for(url)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit open for {urlsplit(url).netloc}")
+            try:
+                if limiter is not None and not limiter.acquire(deadline.remaining() if deadline else None):
+                    raise DeadlineExceeded("row budget exhausted waiting for the rate limiter")
+                read_timeout = self.read_timeout
+                if deadline is not None:
+                    read_timeout = deadline.cap(read_timeout)
+                response = self.session.get(
+                    url,
+                    params=params,
+                    timeout=(min(self.connect_timeout, read_timeout), read_timeout),
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                self._pause(backoff_delay(attempt, self.backoff_base, self.backoff_cap, self.rng), deadline)
+                attempt += 1
+                continue
+            except BaseException:
+                # No verdict on the host: hand a half-open probe slot back.
+                breaker.release()
+                raise
+
+            if response.status_code in RETRY_STATUSES:
+                delay = retry_after_seconds(response)
+                if delay is not None:
+                    # Never trust the server with an unbounded sleep, even
+                    # when there is no row deadline to cap it.
+                    delay = min(delay, self.backoff_cap)
+                throttled = limiter is not None and response.status_code == 429
+                if throttled:
+                    # Throttling is handled by slowing the shared bucket; it
+                    # says nothing about the host being down.
+                    limiter.on_throttle(delay)
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                if not throttled:
+                    # A throttled bucket already holds the next acquire() back
+                    # for the Retry-After, so only unthrottled retries sleep.
+                    if delay is None:
+                        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap, self.rng)
+                    self._pause(delay, deadline)
+                attempt += 1
+                continue
+
+            breaker.record_success()
+            if limiter is not None:
+                limiter.on_success()
+            response.raise_for_status()
+            return response
@@ -0,0 +1,52 @@
+"""In-memory index of rows a previous run already finished.
+
+``--resume`` used to call ``Path.exists()`` for every style of every row, which
+on a network filesystem means thousands of slow ``stat`` calls before any
+work starts. :class:`CompletionIndex` lists each style directory once with
+``os.scandir`` (the style directory plus one listing per category folder),
+joins the file names with the Catids the manifest marks as passed, and
+answers resume checks with a set lookup.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Set, Tuple
+
+
+def scan_style_dir(style_dir: Path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(category_slug, file_name)`` for every SVG under ``style_dir``."""
+
+    try:
+        with os.scandir(style_dir) as entries:
+            categories = [entry for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return
+    for category in categories:
+        with os.scandir(category.path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".svg"):
+                    yield category.name, entry.name
+
+
+class CompletionIndex:
+    """``(category_slug, catid)`` pairs with both an output file and a passed manifest row."""
+
+    def __init__(self, done: Iterable[Tuple[str, str]] = ()):
+        self._done: Set[Tuple[str, str]] = set(done)
+
+    @classmethod
+    def build(cls, style_dir: Path, file_prefix: str, completed_catids: Set[str]) -> "CompletionIndex":
+        done = []
+        for category_slug, name in scan_style_dir(style_dir):
+            if not name.startswith(file_prefix):
+                continue
+            catid = name[len(file_prefix):-len(".svg")]
+            if catid in completed_catids:
+                done.append((category_slug, catid))
+        return cls(done)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
@@ -0,0 +1,96 @@
+"""Counter-based random numbers that do not depend on the Python version.
+
+``random.Random(seed)`` runs the Mersenne Twister's seeding routine over a
+large integer on every construction, and the resulting sequence is only as
+stable as CPython's seeding algorithm. :class:`CounterRandom` folds the seed
+into a 64-bit key and derives the n-th output by running the SplitMix64
+finaliser over ``key + n * gamma``: building one is a few integer operations
+and the sequence is fixed by this module alone.
+
+The two generators give different icons, so an output directory records the
+one it was generated with in ``rng.json``; :func:`resolve_rng` refuses to
+extend it with the other.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from .atomic import atomic_write_text
+
+RNG_CHOICES = ("mt", "counter")
+DEFAULT_RNG = "mt"
+RNG_FILE = "rng.json"
+
+_MASK = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_TO_FLOAT = 1.0 / (1 << 53)
+
+
+def fold_seed(seed: int) -> int:
+    """Fold a non-negative ``seed`` into 64 bits, one word at a time from the low end.
+
+    A seed that fits in one word is its own key; multiplying before each
+    XOR keeps repeated words from cancelling out.
+    """
+
+    key = 0
+    while seed:
+        key = ((key * _GAMMA) ^ (seed & _MASK)) & _MASK
+        seed >>= 64
+    return key
+
+
+class CounterRandom:
+    """The subset of :class:`random.Random` the house-style templates use."""
+
+    __slots__ = ("key", "counter")
+
+    def __init__(self, seed: int):
+        self.key = fold_seed(seed)
+        self.counter = 0
+
+    def next64(self) -> int:
+        self.counter = counter = self.counter + 1
+        z = (self.key + counter * _GAMMA) & _MASK
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+        return z ^ (z >> 31)
+
+    def random(self) -> float:
+        """Float in ``[0, 1)`` with 53 random bits (the top bits of :meth:`next64`)."""
+
+        return (self.next64() >> 11) * _TO_FLOAT
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+
+class RngMismatch(ValueError):
+    """An output directory was generated with a different ``--rng``."""
+
+
+def write_rng_file(out_dir: Path, rng: str) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(out_dir / RNG_FILE, json.dumps({"rng": rng}) + "\n")
+
+
+def read_rng_file(out_dir: Path) -> Optional[str]:
+    path = out_dir / RNG_FILE
+    if not path.exists():
+        return None
+    return str(json.loads(path.read_text("utf-8"))["rng"])
+
+
+def resolve_rng(requested: Optional[str], out_dir: Path) -> str:
+    """Generator for adding icons to ``out_dir``: the one it records, which ``requested`` must match.
+
+    Without a record ``requested`` (or :data:`DEFAULT_RNG`) is used.
+    """
+
+    recorded = read_rng_file(out_dir)
+    if recorded is None:
+        return requested or DEFAULT_RNG
+    if requested and requested != recorded:
+        raise RngMismatch(f"{out_dir} was generated with --rng {recorded}, not --rng {requested}")
+    return recorded
@@ -0,0 +1,98 @@
+"""Persistent geometry-hash index across output batches.
+
+``validate_outputs.py`` used to find duplicate geometry only among the
+directories passed to one invocation, re-hashing every file each time.
+:class:`HashIndex` keeps ``path_hash -> (batch, Catid, file)`` in SQLite,
+where a batch is an output directory. The generators update it as they
+write icons, so checking a new icon against every earlier batch is one
+indexed lookup.
+
+:func:`geometry_hash` is the hash ``validate_outputs.py`` reports: SHA-256
+over the SVG text with coordinates cut to three decimals.
+"""
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+_DECIMALS = re.compile(r"(-?\d+\.\d{3})\d+")
+
+
+def geometry_hash(svg_text: str) -> str:
+    """Stable hash for geometry."""
+
+    return hashlib.sha256(_DECIMALS.sub(r"\1", svg_text).encode("utf-8")).hexdigest()[:16]
+
+
+def batch_name(directory: Path) -> str:
+    return str(directory.resolve())
+
+
+class HashEntry(NamedTuple):
+    batch: str
+    catid: str
+    file: str
+
+
+class HashIndex:
+    """One row per ``(batch, Catid)``, looked up by ``path_hash``."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "batch TEXT NOT NULL, Catid TEXT NOT NULL, file TEXT NOT NULL, path_hash TEXT NOT NULL, "
+            "PRIMARY KEY (batch, Catid)) WITHOUT ROWID"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS hashes_path_hash ON hashes (path_hash, batch, Catid)")
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    def record(self, path_hash: str, batch: str, catid: str, file: str, limit: int = 3) -> List[HashEntry]:
+        """Store the hash of ``catid`` in ``batch``; returns up to ``limit`` other entries with the same hash."""
+
+        others = self.lookup(path_hash, exclude=(batch, catid), limit=limit)
+        self.db.execute(
+            "INSERT INTO hashes (batch, Catid, file, path_hash) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(batch, Catid) DO UPDATE SET file = excluded.file, path_hash = excluded.path_hash",
+            (batch, catid, file, path_hash),
+        )
+        return others
+
+    def record_svg(self, batch: str, catid: str, file: str, svg_text: str, limit: int = 3) -> List[HashEntry]:
+        """:meth:`record` the :func:`geometry_hash` of ``svg_text``."""
+
+        return self.record(geometry_hash(svg_text), batch, catid, file, limit)
+
+    def lookup(
+        self, path_hash: str, exclude: Optional[Tuple[str, str]] = None, limit: Optional[int] = None
+    ) -> List[HashEntry]:
+        """Entries with ``path_hash`` by batch and Catid, optionally leaving out one ``(batch, Catid)``."""
+
+        batch, catid = exclude or ("", "")
+        cursor = self.db.execute(
+            "SELECT batch, Catid, file FROM hashes WHERE path_hash = ? AND NOT (batch = ? AND Catid = ?) "
+            "ORDER BY batch, Catid LIMIT ?",
+            (path_hash, batch, catid, -1 if limit is None else limit),
+        )
+        return [HashEntry(*row) for row in cursor]
+
+    def remove(self, batch: str, catids: Iterable[str]) -> None:
+        self.db.executemany("DELETE FROM hashes WHERE batch = ? AND Catid = ?", ((batch, c) for c in catids))
+
+    def remove_batch(self, batch: str) -> None:
+        self.db.execute("DELETE FROM hashes WHERE batch = ?", (batch,))
@@ -0,0 +1,141 @@
+"""Serve rendered icons over HTTP from a long-running process.
+
+A batch run reloads the taxonomy and rebuilds its lookup tables before it
+renders anything. :class:`IconService` keeps the Catid → subject index in
+memory, renders on request with the callable it is given and keeps the most
+recently used SVGs in an :class:`~pipeline.planning.LRUCache`.
+:class:`IconServer` exposes it on a local port:
+
+``GET /icons/{catid}.svg``
+    The SVG, with a strong ``ETag``; ``If-None-Match`` answers ``304``.
+``GET /healthz``
+    JSON with the number of rows, cached icons and cache hits and misses.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .planning import LRUCache
+
+ICON_PATH = re.compile(r"^/icons/(?P<catid>[^/]+)\.svg$")
+
+
+class IconService:
+    """Catid lookups with an LRU of rendered ``(etag, body)`` pairs.
+
+    ``render(catid, subject)`` returns SVG text; it must be deterministic,
+    since cached bodies and ETags are reused until evicted.
+    """
+
+    def __init__(self, subjects: Mapping[str, str], render: Callable[[str, str], str], cache_size: int = 4096):
+        self.subjects = subjects
+        self.render = render
+        self.cache = LRUCache(cache_size)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, catid: str) -> Optional[Tuple[str, bytes]]:
+        """Return ``(etag, svg_bytes)`` for ``catid``, or ``None`` if it is unknown."""
+
+        cached = self.cache.get(catid)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return cached
+        subject = self.subjects.get(catid)
+        if subject is None:
+            return None
+        body = self.render(catid, subject).encode("utf-8")
+        entry = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+        self.cache.put(catid, entry)
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"rows": len(self.subjects), "cached": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+
+class IconHandler(BaseHTTPRequestHandler):
+    server: "IconHTTPServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - signature from stdlib
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        service = self.server.service
+        path = urlsplit(self.path).path
+        if path == "/healthz":
+            self.send_body(200, json.dumps(service.stats()).encode("utf-8"), "application/json")
+            return
+        match = ICON_PATH.match(path)
+        entry = service.get(unquote(match.group("catid"))) if match else None
+        if entry is None:
+            self.send_body(404, b'{"error": "not found"}', "application/json")
+            return
+        etag, body = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_body(200, body, "image/svg+xml", headers)
+
+
+class IconHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: IconService):
+        super().__init__(address, IconHandler)
+        self.service = service
+
+
+class IconServer:
+    """Run :class:`IconHTTPServer` on a background thread; usable as a context manager."""
+
+    def __init__(self, service: IconService, host: str = "127.0.0.1", port: int = 0):
+        self.server = IconHTTPServer((host, port), service)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "IconServer":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> "IconServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,151 @@
+"""SQLite manifest backend for large runs.
+
+The CSV manifest is rewritten in full at the end of every run and re-read
+into lists and dicts by ``--resume`` and ``validate_outputs``. For runs with
+millions of rows :class:`ManifestStore` keeps the same columns in a SQLite
+table instead, with indexes on Catid, path hash, category and validation
+status. :meth:`ManifestStore.upsert` matches ``record_manifest_entry``: a
+row for a known Catid replaces it in place, rows without a Catid are always
+appended. :meth:`ManifestStore.export_csv` writes the usual ``manifest.csv``
+on demand, byte for byte as the CSV backend would.
+"""
+
+import csv
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set
+
+from .atomic import atomic_open
+
+MANIFEST_DB_NAME = "manifest.sqlite"
+INDEXED_COLUMNS = ("path_hash", "category", "validation_passed")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class ManifestStore:
+    """Manifest rows in insertion order, keyed by Catid.
+
+    ``fields`` fixes the column order for new databases; an existing
+    database keeps the columns it was created with. ``durable`` makes every
+    commit wait for the disk, as ``--fsync-every`` does for icons.
+    """
+
+    def __init__(self, path: Path, fields: Sequence[str], durable: bool = False):
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        columns = ["seq INTEGER PRIMARY KEY"] + [
+            f"{_quote(f)} TEXT UNIQUE" if f == "Catid" else f"{_quote(f)} TEXT NOT NULL DEFAULT ''" for f in fields
+        ]
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS manifest ({', '.join(columns)})")
+        self.fields = [row[1] for row in self.db.execute("PRAGMA table_info(manifest)") if row[1] != "seq"]
+        for column in INDEXED_COLUMNS:
+            if column in self.fields:
+                self.db.execute(
+                    f"CREATE INDEX IF NOT EXISTS manifest_{column} ON manifest ({_quote(column)})"
+                )
+        names = ", ".join(_quote(f) for f in self.fields)
+        marks = ", ".join("?" for _ in self.fields)
+        updates = ", ".join(f"{_quote(f)} = excluded.{_quote(f)}" for f in self.fields if f != "Catid")
+        self._upsert_sql = (
+            f"INSERT INTO manifest ({names}) VALUES ({marks}) ON CONFLICT(Catid) DO UPDATE SET {updates}"
+        )
+        self._select_sql = f"SELECT {names} FROM manifest"
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM manifest")
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM manifest").fetchone()[0]
+
+    def _values(self, entry: Mapping[str, Any]) -> List[Optional[str]]:
+        values: List[Optional[str]] = [_text(entry.get(field)) for field in self.fields]
+        catid = values[self.fields.index("Catid")].strip()
+        values[self.fields.index("Catid")] = catid or None  # NULLs never conflict
+        return values
+
+    def upsert(self, entry: Mapping[str, Any]) -> None:
+        self.db.execute(self._upsert_sql, self._values(entry))
+
+    def upsert_many(self, entries: Iterable[Mapping[str, Any]]) -> None:
+        self.db.executemany(self._upsert_sql, (self._values(entry) for entry in entries))
+
+    def delete(self, catids: Iterable[str]) -> int:
+        before = self.db.total_changes
+        self.db.executemany("DELETE FROM manifest WHERE Catid = ?", ((catid,) for catid in catids))
+        return self.db.total_changes - before
+
+    def reorder(self, catids: Sequence[str]) -> None:
+        """Renumber rows so listed Catids come first in ``catids`` order; the rest follow unchanged."""
+
+        position = {catid: idx for idx, catid in enumerate(catids)}
+        current = self.db.execute("SELECT seq, Catid FROM manifest ORDER BY seq").fetchall()
+        ranked = sorted(current, key=lambda row: (0, position[row[1]]) if row[1] in position else (1, 0))
+        # Move every row to a negative seq first so no renumbering collides.
+        self.db.executemany(
+            "UPDATE manifest SET seq = ? WHERE seq = ?", ((-idx - 1, seq) for idx, (seq, _) in enumerate(ranked))
+        )
+        self.db.execute("UPDATE manifest SET seq = -seq")
+
+    def _row(self, values: Sequence[Optional[str]]) -> Dict[str, str]:
+        return {field: value or "" for field, value in zip(self.fields, values)}
+
+    def get(self, catid: str) -> Optional[Dict[str, str]]:
+        values = self.db.execute(f"{self._select_sql} WHERE Catid = ?", (catid,)).fetchone()
+        return None if values is None else self._row(values)
+
+    def rows(self) -> Iterator[Dict[str, str]]:
+        for values in self.db.execute(f"{self._select_sql} ORDER BY seq"):
+            yield self._row(values)
+
+    def completed_catids(self) -> Set[str]:
+        """Catids whose latest row passed validation."""
+
+        cursor = self.db.execute(
+            "SELECT Catid FROM manifest WHERE validation_passed = 'TRUE' AND Catid IS NOT NULL"
+        )
+        return {catid for (catid,) in cursor}
+
+    def duplicate_hashes(self) -> Dict[str, List[str]]:
+        """Catids sharing a non-empty ``path_hash``, for hashes used more than once."""
+
+        cursor = self.db.execute(
+            "SELECT path_hash, Catid FROM manifest WHERE path_hash IN ("
+            "SELECT path_hash FROM manifest WHERE path_hash != '' GROUP BY path_hash HAVING COUNT(*) > 1"
+            ") ORDER BY path_hash, seq"
+        )
+        duplicates: Dict[str, List[str]] = {}
+        for path_hash, catid in cursor:
+            duplicates.setdefault(path_hash, []).append(catid or "")
+        return duplicates
+
+    def import_csv(self, csv_path: Path) -> int:
+        before = self.db.total_changes
+        with csv_path.open(newline="", encoding="utf-8") as handle:
+            self.upsert_many(csv.DictReader(handle))
+        return self.db.total_changes - before
+
+    def export_csv(self, csv_path: Path, fsync: bool = False) -> int:
+        count = 0
+        with atomic_open(csv_path, "w", newline="", fsync=fsync) as handle:
+            writer = csv.DictWriter(handle, fieldnames=self.fields)
+            writer.writeheader()
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
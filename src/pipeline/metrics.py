@@ -0,0 +1,172 @@
+"""Per-run timing and throughput metrics for the icon generators.
+
+Both generators time their stages (search, download, parse/restyle, render,
+disk writes) with :meth:`RunMetrics.stage`, count cache lookups and bytes
+downloaded, and keep the slowest rows. At exit they write
+``run_metrics.json`` next to ``generation.log`` and print
+:meth:`RunMetrics.summary_table`.
+"""
+
+import heapq
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class StageStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class RunMetrics:
+    """Thread-safe collector for stage durations, counters and slow rows."""
+
+    def __init__(self, slowest: int = 10, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.finished = None
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.caches: Dict[str, List[int]] = {}
+        self.bytes_downloaded = 0
+        self.slowest_limit = slowest
+        self._slowest: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the wrapped block as one occurrence of stage ``name``."""
+
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.record_stage(name, self.clock() - started)
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.add(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def cache(self, name: str, hit: bool) -> None:
+        """Record a lookup in cache ``name``."""
+
+        with self._lock:
+            hits_lookups = self.caches.setdefault(name, [0, 0])
+            hits_lookups[0] += int(hit)
+            hits_lookups[1] += 1
+
+    def add_bytes(self, amount: int) -> None:
+        with self._lock:
+            self.bytes_downloaded += amount
+
+    @contextmanager
+    def row(self, catid: str, subject: str) -> Iterator[None]:
+        """Time a whole row and keep it if it is among the slowest."""
+
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.record_row(catid, subject, self.clock() - started)
+
+    def record_row(self, catid: str, subject: str, seconds: float) -> None:
+        with self._lock:
+            self.counters["rows"] = self.counters.get("rows", 0) + 1
+            entry = (seconds, catid, subject)
+            if len(self._slowest) < self.slowest_limit:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def finish(self) -> None:
+        if self.finished is None:
+            self.finished = self.clock()
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else self.clock()
+        return end - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = self.elapsed
+            rows = self.counters.get("rows", 0)
+            return {
+                "elapsed_seconds": round(elapsed, 6),
+                "rows": rows,
+                "rows_per_sec": round(rows / elapsed, 3) if elapsed else 0.0,
+                "bytes_downloaded": self.bytes_downloaded,
+                "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+                "counters": dict(sorted(self.counters.items())),
+                "caches": {
+                    name: {
+                        "hits": hits,
+                        "lookups": lookups,
+                        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                    }
+                    for name, (hits, lookups) in sorted(self.caches.items())
+                },
+                "slowest_rows": [
+                    {"Catid": catid, "subject": subject, "seconds": round(seconds, 6)}
+                    for seconds, catid, subject in sorted(self._slowest, reverse=True)
+                ],
+            }
+
+    def write(self, path: Path) -> Path:
+        self.finish()
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        return path
+
+    def summary_table(self) -> str:
+        data = self.to_dict()
+        lines = [f"{'stage':<12} {'count':>8} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        for name, stats in data["stages"].items():
+            lines.append(
+                f"{name:<12} {stats['count']:>8} {stats['total_seconds']:>10.3f} "
+                f"{stats['mean_ms']:>10.2f} {stats['max_ms']:>10.2f}"
+            )
+        totals = f"rows: {data['rows']} in {data['elapsed_seconds']:.2f}s ({data['rows_per_sec']:.1f} rows/s)"
+        if data["bytes_downloaded"]:
+            totals += f", downloaded {data['bytes_downloaded'] / 1024:.1f} KiB"
+        lines.append(totals)
+        counters = {k: v for k, v in data["counters"].items() if k != "rows"}
+        if counters:
+            lines.append("counters: " + ", ".join(f"{k}={v}" for k, v in counters.items()))
+        for name, cache in data["caches"].items():
+            lines.append(
+                f"cache {name}: {cache['hits']}/{cache['lookups']} hits ({cache['hit_rate'] * 100:.1f}%)"
+            )
+        if data["slowest_rows"]:
+            slowest = ", ".join(
+                f"{row['Catid']} ({row['subject']}) {row['seconds']:.3f}s" for row in data["slowest_rows"][:3]
+            )
+            lines.append(f"slowest: {slowest}")
+        return "\n".join(lines)
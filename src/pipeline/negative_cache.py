@@ -0,0 +1,101 @@
+"""Persistent cache of svgapi searches that returned no icons.
+
+An empty search is otherwise repeated for every row and every run that
+produces the same query. :class:`NegativeCache` remembers ``(query, limit)``
+pairs that came back empty for ``ttl`` seconds, so ``fetch_icon_svg`` can
+skip them without a request. Entries expire so that icons added to the
+catalogue later are still found. Each entry also names the endpoint it was
+seen on (see :func:`pipeline.client.endpoint_key`), so misses from the local
+stub never suppress searches against the real API.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .atomic import atomic_write_text
+
+DEFAULT_NEGATIVE_CACHE_PATH = Path(
+    os.environ.get("ICON_NEGATIVE_CACHE") or Path.home() / ".cache" / "truedata" / "negative_searches.json"
+)
+DEFAULT_TTL_HOURS = 24.0
+
+
+class NegativeCache:
+    """Expiring set of empty ``(query, limit)`` searches per endpoint, stored as JSON."""
+
+    def __init__(self, path: Optional[Path], ttl: float, clock=time.time, endpoint: str = ""):
+        self.path = path
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self.clock = clock
+        self._expires: Dict[str, float] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _key(self, query: str, limit: int) -> str:
+        return f"{self.endpoint}\t{limit}\t{query}"
+
+    @staticmethod
+    def _read_live(path: Path, now: float) -> Dict[str, float]:
+        if not path.exists():
+            return {}
+        try:
+            entries = json.loads(path.read_text("utf-8"))
+            return {k: float(v) for k, v in entries.items() if float(v) > now}
+        except (ValueError, TypeError, AttributeError) as exc:
+            logging.warning("Ignoring unreadable negative cache %s: %s", path, exc)
+            return {}
+
+    @classmethod
+    def load(cls, path: Path, ttl: float, clock=time.time, endpoint: str = "") -> "NegativeCache":
+        cache = cls(path, ttl, clock, endpoint)
+        cache._expires = cls._read_live(path, clock())
+        return cache
+
+    def __len__(self) -> int:
+        """Entries for this cache's endpoint; others are only carried through :meth:`save`."""
+
+        prefix = self.endpoint + "\t"
+        return sum(1 for key in self._expires if key.startswith(prefix))
+
+    def contains(self, query: str, limit: int) -> bool:
+        key = self._key(query, limit)
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= self.clock():
+                del self._expires[key]
+                self._dirty = True
+                return False
+            return True
+
+    def add(self, query: str, limit: int) -> None:
+        if self.ttl > 0:
+            with self._lock:
+                self._expires[self._key(query, limit)] = self.clock() + self.ttl
+                self._dirty = True
+
+    def save(self) -> None:
+        """Merge live entries into the file, keeping ones other runs saved meanwhile.
+
+        A search recorded on both sides keeps the later expiry.
+        """
+
+        if self.path is None or not self._dirty:
+            return
+        now = self.clock()
+        live = self._read_live(self.path, now)
+        with self._lock:
+            for key, expires in self._expires.items():
+                if expires > now and expires > live.get(key, 0.0):
+                    live[key] = expires
+        live = {k: round(v, 3) for k, v in live.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(live, sort_keys=True, ensure_ascii=False) + "\n")
+        self._dirty = False
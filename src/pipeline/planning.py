@@ -0,0 +1,102 @@
+"""Group taxonomy rows by subject before the expensive per-row work.
+
+Many Catids resolve to the same deepest category name. :class:`SubjectPlan`
+groups row positions by subject so query expansion, API searches
+and template selection run once per group; only seed-dependent work (icon
+selection index, template jitter) stays per Catid. Each group gets a scratch
+dict for those shared results which is dropped once the group's last row has
+been processed, so memory follows the number of groups in flight rather than
+the size of the taxonomy. Results that do not depend on the subject, such as
+search responses for a shared fallback query, go in a run-wide
+:class:`LRUCache` instead.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+
+def subject_key(subject: str) -> str:
+    """Grouping key for ``subject``: the subject without surrounding whitespace.
+
+    Case and inner whitespace are kept. Query building, fallbacks and
+    template choice all read the subject as written, so rows whose subjects
+    differ only there could otherwise get another row's results depending on
+    which came first.
+    """
+
+    return subject.strip()
+
+
+class SubjectPlan:
+    """Row positions grouped by subject, in first-seen order."""
+
+    def __init__(self, subjects: Iterable[str]):
+        self.keys: List[str] = []
+        self.groups: Dict[str, List[int]] = {}
+        for position, subject in enumerate(subjects):
+            key = subject_key(subject)
+            self.keys.append(key)
+            self.groups.setdefault(key, []).append(position)
+        self._remaining = {key: len(positions) for key, positions in self.groups.items()}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    @property
+    def rows(self) -> int:
+        return len(self.keys)
+
+    def key(self, position: int) -> str:
+        return self.keys[position]
+
+    def state(self, position: int) -> Dict[str, Any]:
+        """Scratch dict shared by every row in the group of ``position``.
+
+        The dict carries a ``lock`` that fetch workers hold while they use it,
+        so rows of one group run one after another and reuse its results.
+        """
+
+        key = self.keys[position]
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = self._state[key] = {"lock": threading.Lock()}
+            return state
+
+    def done(self, position: int) -> None:
+        """Mark ``position`` processed; frees its group state after the last row."""
+
+        key = self.keys[position]
+        with self._lock:
+            self._remaining[key] -= 1
+            if not self._remaining[key]:
+                self._state.pop(key, None)
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used mapping with a fixed number of entries."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
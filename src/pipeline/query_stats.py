@@ -0,0 +1,141 @@
+"""Persisted hit-rate statistics for svgapi search queries.
+
+``iter_search_queries`` yields candidates from the longest lexicon query down
+to generic fallbacks, and most long queries come back empty. :class:`QueryStats`
+records, per query shape (number of terms, or ``fallback``) and per term,
+how often a search returned icons. With ``--adaptive-queries`` the generator
+reorders each row's candidates by predicted hit rate and skips those that
+are very unlikely to hit, then saves the statistics for the next run.
+
+Hit rates depend on the catalogue behind the API, so the file holds one set
+of counts per endpoint (see :func:`pipeline.client.endpoint_key`); a run
+against the local stub never changes how real runs order their queries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional
+
+from .atomic import atomic_write_text
+
+DEFAULT_STATS_PATH = Path(
+    os.environ.get("ICON_QUERY_STATS") or Path.home() / ".cache" / "truedata" / "query_stats.json"
+)
+MAX_SHAPE_TERMS = 6
+
+
+def query_shape(query: str, fallback: bool = False) -> str:
+    if fallback:
+        return "fallback"
+    return f"{min(len(query.split()), MAX_SHAPE_TERMS)}-term"
+
+
+def _rate(counts: Optional[List[int]]) -> float:
+    """Laplace-smoothed hit rate of ``[hits, tries]``."""
+
+    hits, tries = counts or (0, 0)
+    return (hits + 1) / (tries + 2)
+
+
+class QueryStats:
+    """Hit/try counts per query shape and per term.
+
+    ``skip_below`` is the predicted hit rate under which a candidate is
+    dropped, once its shape has ``min_samples`` tries. One candidate in
+    ``explore_every`` (chosen by a hash of the query) is never skipped, so
+    skipped shapes keep collecting evidence.
+    """
+
+    def __init__(
+        self, skip_below: float = 0.05, min_samples: int = 20, explore_every: int = 20, endpoint: str = ""
+    ):
+        self.endpoint = endpoint
+        self.skip_below = skip_below
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self.shapes: Dict[str, List[int]] = {}
+        self.terms: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read_endpoints(path: Path) -> Dict[str, dict]:
+        if not path.exists():
+            return {}
+        try:
+            payload = json.loads(path.read_text("utf-8"))
+            if payload.get("version") != 2:
+                # Version 1 files did not say which endpoint they measured.
+                logging.info("Ignoring query stats %s from an older version", path)
+                return {}
+            return dict(payload["endpoints"])
+        except (ValueError, TypeError, AttributeError, KeyError) as exc:
+            logging.warning("Ignoring unreadable query stats %s: %s", path, exc)
+            return {}
+
+    @classmethod
+    def load(cls, path: Path, endpoint: str = "", **kwargs) -> "QueryStats":
+        stats = cls(endpoint=endpoint, **kwargs)
+        entry = cls._read_endpoints(path).get(endpoint)
+        if entry:
+            try:
+                stats.shapes = {k: list(v) for k, v in entry.get("shapes", {}).items()}
+                stats.terms = {k: list(v) for k, v in entry.get("terms", {}).items()}
+            except (TypeError, AttributeError) as exc:
+                logging.warning("Ignoring unreadable query stats for %s in %s: %s", endpoint, path, exc)
+        return stats
+
+    def save(self, path: Path) -> None:
+        """Write this endpoint's counts, keeping the other endpoints in ``path``."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        endpoints = self._read_endpoints(path)
+        with self._lock:
+            endpoints[self.endpoint] = {"shapes": self.shapes, "terms": self.terms}
+            text = json.dumps({"version": 2, "endpoints": endpoints}, sort_keys=True) + "\n"
+        atomic_write_text(path, text)
+
+    def record(self, query: str, hit: bool, fallback: bool = False) -> None:
+        keys = [(self.shapes, query_shape(query, fallback))] + [(self.terms, t) for t in set(query.split())]
+        with self._lock:
+            for table, key in keys:
+                counts = table.setdefault(key, [0, 0])
+                counts[0] += int(hit)
+                counts[1] += 1
+
+    def predict(self, query: str) -> float:
+        """Predicted chance that searching ``query`` returns icons."""
+
+        shape_rate = _rate(self.shapes.get(query_shape(query)))
+        term_rates = [_rate(self.terms[t]) for t in set(query.split()) if t in self.terms]
+        if not term_rates:
+            return shape_rate
+        return (shape_rate + min(term_rates)) / 2
+
+    def _skippable(self, query: str, predicted: float) -> bool:
+        counts = self.shapes.get(query_shape(query))
+        if predicted >= self.skip_below or not counts or counts[1] < self.min_samples:
+            return False
+        digest = hashlib.sha256(query.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") % self.explore_every != 0
+
+    def order(self, queries: Iterable[str], fallbacks: Collection[str] = ()) -> List[str]:
+        """Best-first subject queries, then the generic ``fallbacks``.
+
+        Fallbacks ("baby icon", ...) almost always hit, so they keep their
+        place at the end rather than displacing the subject's own queries.
+        The original position breaks ties, and the best subject query is
+        always kept so a row is never left without a specific search.
+        """
+
+        queries = list(queries)
+        generic = [q for q in queries if q in fallbacks]
+        ranked = sorted(
+            ((self.predict(q), position, q) for position, q in enumerate(queries) if q not in fallbacks),
+            key=lambda item: (-item[0], item[1]),
+        )
+        kept = [q for predicted, _, q in ranked[1:] if not self._skippable(q, predicted)]
+        return ([ranked[0][2]] if ranked else []) + kept + generic
@@ -0,0 +1,108 @@
+"""Adaptive token-bucket rate limiting shared by concurrent fetch workers.
+
+:class:`TokenBucket` paces requests to ``rate`` per second with bursts of up
+to ``burst``. Every worker talking to a host draws from the same bucket, so
+adding workers raises concurrency without raising the request rate. The
+bucket adapts to throttling: a 429 halves the rate (at most once per
+``cooldown`` seconds, so a burst of 429s from parallel workers counts once)
+and a ``Retry-After`` value blocks all workers until it has passed. While
+requests succeed the rate climbs back by ``rate_step`` requests per second
+for every second elapsed up to 90% of the rate that was throttled, then ten
+times slower towards the configured rate, so the bucket settles just under
+the server's limit instead of oscillating across it.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+# Refill arithmetic can leave a token at 0.999...; treat that as a whole one
+# so a waiter never spins on a sub-nanosecond sleep.
+_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """Thread-safe token bucket with additive-increase/multiplicative-decrease."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        rate_step: Optional[float] = None,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate
+        self.rate = rate
+        self.ceiling = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate)
+        self.rate_step = rate_step if rate_step is not None else rate / 5
+        self.cooldown = cooldown
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(self.burst)
+        self.throttled = 0
+        self.waited = 0.0
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._last_increase = self._updated
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting for it; return False if ``timeout`` runs out first."""
+
+        started = self.clock()
+        while True:
+            with self._lock:
+                now = self.clock()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1 - _EPSILON:
+                        self.tokens = max(0.0, self.tokens - 1)
+                        self.waited += now - started
+                        return True
+                    wait = (1 - self.tokens) / self.rate
+            if timeout is not None and now + wait - started > timeout:
+                return False
+            self.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            now = self.clock()
+            if now <= self._last_increase:
+                return  # still inside a Retry-After pause
+            if self.rate < self.max_rate:
+                step = self.rate_step if self.rate < self.ceiling else self.rate_step / 10
+                self.rate = min(self.max_rate, self.rate + step * (now - self._last_increase))
+            self._last_increase = now
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """React to a 429: slow down and optionally pause every worker."""
+
+        with self._lock:
+            now = self.clock()
+            self.throttled += 1
+            self._refill(now)
+            if now - self._last_decrease >= self.cooldown:
+                self.ceiling = max(self.min_rate, self.rate * 0.9)
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._last_decrease = now
+                self._last_increase = now
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                self._last_increase = max(self._last_increase, self._blocked_until)
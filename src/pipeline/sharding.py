@@ -0,0 +1,116 @@
+"""Split a run across processes or hosts by a stable hash of Catid.
+
+``--shard i/N`` makes a generator process only the rows whose Catid hashes to
+shard ``i`` of ``N`` (counting from 0), so shards need no coordination and
+every Catid lands in exactly one of them whatever the input order. Each
+shard records its position in ``shard.json``. :func:`merge_manifest_rows`
+puts the shards' manifest rows back into input order and refuses to merge
+when a row is missing (a gap) or present in a shard that does not own it (an
+overlap), so the merged tree matches an unsharded run.
+"""
+
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+from .atomic import atomic_write_text
+
+SHARD_FILE = "shard.json"
+
+
+class Shard(NamedTuple):
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, catid: str) -> bool:
+        return shard_of(catid, self.count) == self.index
+
+
+class ShardMergeError(ValueError):
+    """Shard outputs do not add up to exactly one copy of every row."""
+
+
+def parse_shard(text: str) -> Shard:
+    """Parse ``"i/N"`` with ``0 <= i < N``."""
+
+    index, sep, count = text.partition("/")
+    try:
+        shard = Shard(int(index), int(count))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {text!r}") from None
+    if not sep or shard.count < 1 or not 0 <= shard.index < shard.count:
+        raise ValueError(f"shard must look like i/N with 0 <= i < N, got {text!r}")
+    return shard
+
+
+def shard_of(catid: str, count: int) -> int:
+    digest = hashlib.sha1(catid.strip().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def write_shard_file(out_dir: Path, shard: Shard) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(out_dir / SHARD_FILE, json.dumps({"index": shard.index, "count": shard.count}) + "\n")
+
+
+def read_shard_file(out_dir: Path) -> Optional[Shard]:
+    path = out_dir / SHARD_FILE
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text("utf-8"))
+    return Shard(int(payload["index"]), int(payload["count"]))
+
+
+def check_shard_set(shards: Iterable[Shard]) -> int:
+    """Return the shard count after checking that every shard appears exactly once."""
+
+    shards = list(shards)
+    counts = {shard.count for shard in shards}
+    if len(counts) != 1:
+        raise ShardMergeError(f"shards disagree on the shard count: {sorted(map(str, shards))}")
+    count = counts.pop()
+    indexes = sorted(shard.index for shard in shards)
+    if indexes != list(range(count)):
+        missing = sorted(set(range(count)) - set(indexes))
+        repeated = sorted({i for i in indexes if indexes.count(i) > 1})
+        raise ShardMergeError(f"need shards 0..{count - 1} once each; missing {missing}, repeated {repeated}")
+    return count
+
+
+def merge_manifest_rows(
+    catids: Sequence[str], shard_rows: Mapping[int, Sequence[Mapping[str, str]]], count: int
+) -> List[Mapping[str, str]]:
+    """Interleave per-shard manifest rows in the order of the input ``catids``.
+
+    A shard's rows are already in input order, so each input Catid consumes
+    the next row of the shard that owns it when the Catids match. Catids
+    listed more than once in the input are handled whether the generator
+    upserts them (one row) or writes one row per occurrence.
+    """
+
+    queues: Dict[int, Deque[Mapping[str, str]]] = {i: deque(rows) for i, rows in shard_rows.items()}
+    merged: List[Mapping[str, str]] = []
+    seen = set()
+    gaps: List[str] = []
+    for catid in catids:
+        queue = queues.get(shard_of(catid, count))
+        if queue and (queue[0].get("Catid") or "").strip() == catid:
+            merged.append(queue.popleft())
+            seen.add(catid)
+        elif catid and catid not in seen:
+            gaps.append(catid)
+    overlaps = [(i, (row.get("Catid") or "").strip()) for i, queue in sorted(queues.items()) for row in queue]
+    if gaps or overlaps:
+        details = []
+        if gaps:
+            details.append(f"{len(gaps)} rows missing (first: {', '.join(gaps[:5])})")
+        if overlaps:
+            shown = ", ".join(f"{catid} in shard {i}" for i, catid in overlaps[:5])
+            details.append(f"{len(overlaps)} rows not owned by their shard or out of order (first: {shown})")
+        raise ShardMergeError("; ".join(details))
+    return merged
@@ -0,0 +1,226 @@
+"""Local stand-in for the svgapi.com list endpoint and CDN.
+
+Serves ``/v1/{key}/list/`` search responses and ``/vector/{id}/{slug}.svg``
+bodies from the fixture corpus in ``tests/fixtures/svgapi`` so the download
+path of ``scripts/generate_icons.py`` can be exercised and benchmarked
+offline. Latency, error rate and throttling are configurable.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "svgapi"
+
+LIST_PATH = re.compile(r"^/v1/(?P<key>[^/]+)/list/?$")
+VECTOR_PATH = re.compile(r"^/vector/(?P<id>[^/]+)/[^/]+\.svg$")
+
+
+def stable_fraction(text: str) -> float:
+    """Map ``text`` to a reproducible value in ``[0, 1)``."""
+
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+
+
+class StubConfig:
+    """Behaviour knobs for :class:`SvgapiStub`."""
+
+    def __init__(
+        self,
+        corpus_dir: Path = DEFAULT_CORPUS,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        miss_rate: float = 0.3,
+        rate_limit: float = 0.0,
+        burst: int = 10,
+        seed: int = 0,
+    ):
+        self.corpus_dir = Path(corpus_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.miss_rate = miss_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.seed = seed
+
+
+class Corpus:
+    """Fixture icons and recorded searches loaded from ``corpus.json``."""
+
+    def __init__(self, corpus_dir: Path):
+        data = json.loads((corpus_dir / "corpus.json").read_text("utf-8"))
+        self.icons: List[Dict[str, str]] = data["icons"]
+        self.by_id: Dict[str, Dict[str, str]] = {icon["id"]: icon for icon in self.icons}
+        self.searches: Dict[str, List[str]] = data.get("searches", {})
+        self.bodies: Dict[str, bytes] = {
+            icon["id"]: (corpus_dir / "vector" / f"{icon['id']}.svg").read_bytes() for icon in self.icons
+        }
+        self.tag_index: Dict[str, List[str]] = {}
+        for icon in self.icons:
+            for tag in icon.get("tags", []):
+                self.tag_index.setdefault(tag, []).append(icon["id"])
+
+    def search(self, query: str, miss_rate: float) -> List[Dict[str, str]]:
+        normalized = " ".join(query.lower().split())
+        if normalized in self.searches:
+            ids = self.searches[normalized]
+        else:
+            ids = []
+            for term in normalized.split():
+                for icon_id in self.tag_index.get(term, []):
+                    if icon_id not in ids:
+                        ids.append(icon_id)
+            if not ids and stable_fraction(normalized) >= miss_rate:
+                start = int(stable_fraction("start:" + normalized) * len(self.icons))
+                size = 1 + int(stable_fraction("size:" + normalized) * 5)
+                ids = [self.icons[(start + i) % len(self.icons)]["id"] for i in range(size)]
+        return [self.by_id[icon_id] for icon_id in ids]
+
+
+class Throttle:
+    """Minimal server-side throttle answering excess requests with 429."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubHTTPServer"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - signature from stdlib
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        stub = self.server
+        config = stub.config
+        stub.count_request()
+        delay = config.latency + (stub.rng_uniform(0, config.jitter) if config.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if stub.throttle is not None and not stub.throttle.take():
+            self.send_body(429, b'{"error": "rate limited"}', "application/json", {"Retry-After": "1"})
+            return
+        if config.error_rate and stub.rng_uniform(0, 1) < config.error_rate:
+            self.send_body(503, b'{"error": "unavailable"}', "application/json")
+            return
+
+        parts = urlsplit(self.path)
+        list_match = LIST_PATH.match(parts.path)
+        if list_match:
+            params = parse_qs(parts.query)
+            query = (params.get("search") or [""])[0]
+            limit = int((params.get("limit") or ["10"])[0])
+            matches = stub.corpus.search(query, config.miss_rate)
+            base = f"http://{self.headers.get('Host') or '%s:%d' % stub.server_address[:2]}"
+            icons = [
+                {
+                    "id": icon["id"],
+                    "slug": icon["slug"],
+                    "title": icon["title"],
+                    "url": f"{base}/vector/{icon['id']}/{icon['slug']}.svg",
+                }
+                for icon in matches[:limit]
+            ]
+            payload = {"term": query, "count": len(matches), "limit": limit, "start": 0, "icons": icons}
+            self.send_body(200, json.dumps(payload).encode("utf-8"), "application/json")
+            return
+
+        vector_match = VECTOR_PATH.match(parts.path)
+        if vector_match and vector_match.group("id") in stub.corpus.bodies:
+            self.send_body(200, stub.corpus.bodies[vector_match.group("id")], "image/svg+xml")
+            return
+
+        self.send_body(404, b'{"error": "not found"}', "application/json")
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.corpus = Corpus(config.corpus_dir)
+        self.throttle = Throttle(config.rate_limit, config.burst) if config.rate_limit > 0 else None
+        self.requests_served = 0
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests_served += 1
+
+    def rng_uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._rng.uniform(low, high)
+
+
+class SvgapiStub:
+    """Run :class:`StubHTTPServer` on a background thread.
+
+    Use as a context manager; ``base_url`` is ready to pass to
+    ``generate_icons.py --api-base``.
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.server = StubHTTPServer((host, port), config or StubConfig())
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests_served(self) -> int:
+        return self.server.requests_served
+
+    def start(self) -> "SvgapiStub":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> "SvgapiStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
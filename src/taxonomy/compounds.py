@@ -0,0 +1,101 @@
+"""Split Dutch compound words into lexicon words.
+
+Dutch writes compounds as one word ("babyschommelstoelen"), so a subject can
+tokenize to words that appear in no lexicon even when every part does.
+:class:`CompoundSplitter` walks a character trie of known words and splits a
+token into the fewest known parts, preferring the longest match at each
+position. Linking morphemes ("s", "e", "en") may sit between parts and the
+last part may carry a plural "s", "n" or "en". Tokens that cannot be covered
+completely by at least two parts are returned unchanged; known words are
+split too, because many lexicon entries are themselves unexpanded compounds.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_END = ""
+LINKERS = ("", "s", "e", "en")
+PLURALS = ("", "s", "n", "en")
+
+
+class Trie:
+    """Character trie over a word list."""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: Dict[str, dict] = {}
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            node[_END] = True
+            self.size += 1
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return False
+        return _END in node
+
+    def prefix_ends(self, text: str, start: int = 0) -> List[int]:
+        """End offsets of known words starting at ``start``, longest first."""
+
+        ends = []
+        node = self.root
+        for pos in range(start, len(text)):
+            node = node.get(text[pos])
+            if node is None:
+                break
+            if _END in node:
+                ends.append(pos + 1)
+        ends.reverse()
+        return ends
+
+
+class CompoundSplitter:
+    """Longest-match compound splitter over a :class:`Trie` of known words."""
+
+    def __init__(self, words: Iterable[str], min_part: int = 3):
+        self.min_part = min_part
+        self.trie = Trie(w for w in words if len(w) >= min_part and w.isalpha())
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+
+    def split(self, token: str) -> Tuple[str, ...]:
+        parts = self._cache.get(token)
+        if parts is None:
+            parts = (token,)
+            if len(token) >= 2 * self.min_part:
+                parts = self._segment(token, 0, {}) or parts
+            self._cache[token] = parts
+        return parts
+
+    def _segment(self, word: str, start: int, memo: Dict[int, Optional[Tuple[str, ...]]]) -> Optional[Tuple[str, ...]]:
+        if start in memo:
+            return memo[start]
+        best: Optional[Tuple[str, ...]] = None
+        for end in self.trie.prefix_ends(word, start):
+            part = word[start:end]
+            if end - start < self.min_part:
+                continue
+            rest = word[end:]
+            if rest in PLURALS:
+                if start == 0:
+                    continue  # the whole word; only multi-part splits count
+                candidate: Optional[Tuple[str, ...]] = (word[start:],)
+            else:
+                candidate = None
+                for linker in LINKERS:
+                    if rest.startswith(linker) and len(rest) > len(linker):
+                        tail = self._segment(word, end + len(linker), memo)
+                        if tail is not None:
+                            candidate = (part,) + tail
+                            break
+            if candidate is not None and (best is None or len(candidate) < len(best)):
+                best = candidate
+        memo[start] = best
+        return best
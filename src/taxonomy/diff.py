@@ -0,0 +1,157 @@
+"""Compare two versions of a taxonomy export by Catid and row content.
+
+A snapshot maps each Catid to a hash of its row, so an edited export can be
+compared with the previous one without keeping the old rows around.
+:func:`diff_snapshots` reports which Catids were added, removed or changed;
+watch mode uses it to regenerate only those rows.
+
+:func:`compare_taxonomies` classifies the changes between two full exports
+for ``scripts/taxonomy_diff.py``: a changed row is *renamed* when its own
+category name differs and *moved* when its parent or depth differs (a row can
+be both). Each export is streamed once into a :class:`TaxonomyTree`, whose
+Catid → (name, depth, parent) placements are compared with dict lookups.
+"""
+
+import csv
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .resolver import DEPTH_COLUMNS, TaxonomyTree, row_entries
+from .store import TaxonomyColumns, load_taxonomy_columns
+
+# Catid -> (own category name, depth, parent Catid)
+Placement = Tuple[str, int, str]
+
+
+def row_hash(row: Mapping[str, object]) -> str:
+    """Stable hash over every column of ``row``."""
+
+    text = "\x1f".join(f"{key}\x1e{row.get(key) or ''}" for key in row)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def snapshot(rows: Iterable[Mapping[str, object]]) -> Dict[str, str]:
+    """Map each Catid to the hash of its row; a repeated Catid keeps its last row."""
+
+    hashes: Dict[str, str] = {}
+    for row in rows:
+        hashes[str(row.get("Catid") or "").strip()] = row_hash(row)
+    return hashes
+
+
+class TaxonomyDiff(NamedTuple):
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
+
+
+def diff_snapshots(old: Mapping[str, str], new: Mapping[str, str]) -> TaxonomyDiff:
+    """Catids only in ``new``, only in ``old``, and in both with different hashes."""
+
+    added = [catid for catid in new if catid not in old]
+    removed = [catid for catid in old if catid not in new]
+    changed = [catid for catid, digest in new.items() if catid in old and old[catid] != digest]
+    return TaxonomyDiff(added, removed, changed)
+
+
+class TaxonomyChanges(NamedTuple):
+    added: List[str]
+    removed: List[str]
+    renamed: List[str]
+    moved: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.renamed or self.moved)
+
+    def catids(self) -> List[str]:
+        """Every affected Catid once: added, renamed, moved, then removed."""
+
+        return list(dict.fromkeys(self.added + self.renamed + self.moved + self.removed))
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.renamed)} renamed, {len(self.moved)} moved"
+        )
+
+
+def column_entries(store: TaxonomyColumns) -> Iterator[Tuple[str, int, str]]:
+    for position in range(len(store)):
+        yield store.catid(position), store.depths[position], store.deepest(position)
+
+
+def csv_entries(path: Path) -> Iterator[Tuple[str, int, str]]:
+    """Like :func:`row_entries` over a CSV, reading columns by index."""
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = [name.strip() for name in next(reader, [])]
+        catid_at = header.index("Catid") if "Catid" in header else None
+        levels = [(level, header.index(column)) for level, column in enumerate(DEPTH_COLUMNS) if column in header]
+        levels.reverse()
+        for record in reader:
+            depth, name = -1, ""
+            for level, index in levels:
+                if index < len(record):
+                    value = record[index].strip()
+                    if value:
+                        depth, name = level, value
+                        break
+            catid = record[catid_at].strip() if catid_at is not None and catid_at < len(record) else ""
+            yield catid, depth, name
+
+
+def placements(entries: Iterable[Tuple[str, int, str]]) -> Dict[str, Placement]:
+    """Map each Catid to its name, depth and parent, via :class:`TaxonomyTree`."""
+
+    tree = TaxonomyTree.from_entries(entries)
+    names, depths, parents, catids = tree.names, tree.depths, tree.parents, tree.catids
+    return {
+        catid: (names[position], depths[position], catids[parents[position]] if parents[position] >= 0 else "")
+        for catid, position in tree.index.items()
+    }
+
+
+def load_placements(path: Path, cache_dir: Optional[Path] = None) -> Dict[str, Placement]:
+    """Stream a CSV export, or read an XLSX one through the taxonomy cache."""
+
+    if path.suffix.lower() == ".xlsx":
+        return placements(column_entries(load_taxonomy_columns(path, cache_dir)))
+    return placements(csv_entries(path))
+
+
+def compare_taxonomies(
+    old_rows: Iterable[Mapping[str, object]], new_rows: Iterable[Mapping[str, object]]
+) -> TaxonomyChanges:
+    return compare_placements(placements(row_entries(old_rows)), placements(row_entries(new_rows)))
+
+
+def compare_placements(old: Mapping[str, Placement], new: Mapping[str, Placement]) -> TaxonomyChanges:
+    added: List[str] = []
+    renamed: List[str] = []
+    moved: List[str] = []
+    for catid, (name, depth, parent) in new.items():
+        before = old.get(catid)
+        if before is None:
+            added.append(catid)
+            continue
+        if name != before[0]:
+            renamed.append(catid)
+        if depth != before[1] or parent != before[2]:
+            moved.append(catid)
+    removed = [catid for catid in old if catid not in new]
+    return TaxonomyChanges(added, removed, renamed, moved)
+
+
+def read_catid_filter(path: Path) -> Set[str]:
+    """Catids listed one per line (as written by ``taxonomy_diff.py --catids``)."""
+
+    with path.open(encoding="utf-8") as handle:
+        return {line.strip() for line in handle if line.strip() and not line.startswith("#")}
@@ -0,0 +1,64 @@
+"""Read taxonomy exports (CSV or XLSX) into row dictionaries."""
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from .resolver import DEPTH_COLUMNS
+
+TAXONOMY_COLUMNS = ["Catid"] + DEPTH_COLUMNS
+
+
+def iter_taxonomy_rows(path: Path) -> Iterator[Dict[str, str]]:
+    """Yield taxonomy rows from ``path`` one at a time (CSV or XLSX)."""
+
+    suffix = path.suffix.lower()
+    if suffix == ".xlsx":
+        try:
+            from openpyxl import load_workbook
+        except ImportError as exc:  # pragma: no cover - import guard
+            raise SystemExit(
+                "Reading .xlsx files requires openpyxl. Install it with 'pip install openpyxl'."
+            ) from exc
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.active
+            header_row = next(worksheet.iter_rows(values_only=True), None)
+            if not header_row:
+                return
+
+            headers: List[str] = []
+            for idx, cell in enumerate(header_row):
+                header = str(cell).strip() if cell is not None else ""
+                if not header:
+                    header = f"column_{idx}"
+                headers.append(header)
+
+            for excel_row in worksheet.iter_rows(min_row=2, values_only=True):
+                if excel_row is None:
+                    continue
+                if all(cell is None for cell in excel_row):
+                    continue
+                row_dict: Dict[str, str] = {}
+                for idx, header in enumerate(headers):
+                    if not header:
+                        continue
+                    value = excel_row[idx] if idx < len(excel_row) else None
+                    if value is None:
+                        row_dict[header] = ""
+                    else:
+                        row_dict[header] = str(value).strip()
+                yield row_dict
+        finally:
+            workbook.close()
+        return
+
+    with path.open(newline="", encoding="utf-8") as handle:
+        yield from csv.DictReader(handle)
+
+
+def load_taxonomy_rows(path: Path) -> List[Dict[str, str]]:
+    """Return taxonomy rows from ``path`` supporting CSV and XLSX files."""
+
+    return list(iter_taxonomy_rows(path))
@@ -1,3 +1,7 @@
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
 CATEGORY_ORDER = [
     "Sub-sub-sub-sub-sub category",
     "Sub-sub-sub-sub category",
@@ -6,6 +10,8 @@ CATEGORY_ORDER = [
     "Sub category",
     "Root category",
 ]
+# The same columns from the root (depth 0) down.
+DEPTH_COLUMNS = list(reversed(CATEGORY_ORDER))
 
 def deepest_category(row: dict) -> str:
     """Return the deepest non-empty category for a given CSV row."""
@@ -14,3 +20,143 @@ def deepest_category(row: dict) -> str:
         if v:
             return v
     return (row.get("Root category") or "").strip()
+
+
+def row_entries(rows: Iterable[Mapping[str, object]]) -> Iterator[Tuple[str, int, str]]:
+    """Yield ``(catid, depth, name)`` per row; depth is -1 for unnamed rows."""
+
+    for row in rows:
+        depth, name = -1, ""
+        for level, column in enumerate(DEPTH_COLUMNS):
+            value = row.get(column)
+            if value and str(value).strip():
+                depth, name = level, str(value).strip()
+        yield str(row.get("Catid") or "").strip(), depth, name
+
+
+class TaxonomyTree:
+    """Hierarchy index over rows in export order.
+
+    Exports list categories in pre-order with each row filling one category
+    column; a row's parent is the nearest preceding row one level up. The
+    tree is built in a single pass and stored in parallel arrays indexed by
+    row position, so depth, parent, ancestor path and children lookups for a
+    Catid cost one dict probe plus at most six array reads. The children
+    index is only built on the first :meth:`children` call.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, object]] = ()):
+        self._build(row_entries(rows))
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[str, int, str]]) -> "TaxonomyTree":
+        """Build from ``(catid, depth, name)`` tuples as :func:`row_entries` yields them."""
+
+        tree = cls()
+        tree._build(entries)
+        return tree
+
+    def _build(self, entries: Iterable[Tuple[str, int, str]]) -> None:
+        catids: List[str] = []
+        names: List[str] = []
+        index: Dict[str, int] = {}
+        depths: List[int] = []
+        parents: List[int] = []
+        levels = len(DEPTH_COLUMNS)
+        open_rows = [-1] * levels  # last row seen at each depth
+        intern = sys.intern
+        for position, (catid, depth, name) in enumerate(entries):
+            parent = -1
+            if depth >= 0:
+                level = depth - 1
+                while level >= 0:
+                    parent = open_rows[level]
+                    if parent >= 0:
+                        break
+                    level -= 1
+                open_rows[depth] = position
+                del open_rows[depth + 1:]
+                open_rows.extend([-1] * (levels - depth - 1))
+            catids.append(catid)
+            names.append(intern(name))
+            depths.append(depth)
+            parents.append(parent)
+            if catid:
+                index[catid] = position
+        self.catids = catids
+        self.names = names
+        self.index = index
+        self.depths = array("b", depths)
+        self.parents = array("l", parents)
+        self._children: Optional[Tuple[array, array]] = None
+
+    def _child_index(self) -> Tuple[array, array]:
+        """Children in CSR layout: ``ids[offsets[i]:offsets[i + 1]]``, built on first use."""
+
+        if self._children is None:
+            counts = array("l", [0]) * (len(self.catids) + 1)
+            for parent in self.parents:
+                if parent >= 0:
+                    counts[parent + 1] += 1
+            for position in range(1, len(counts)):
+                counts[position] += counts[position - 1]
+            child_ids = array("l", [0]) * counts[-1]
+            fill = array("l", counts[:-1])
+            for position, parent in enumerate(self.parents):
+                if parent >= 0:
+                    child_ids[fill[parent]] = position
+                    fill[parent] += 1
+            self._children = (counts, child_ids)
+        return self._children
+
+    def __len__(self) -> int:
+        return len(self.catids)
+
+    def __contains__(self, catid: object) -> bool:
+        return catid in self.index
+
+    def depth(self, catid: str) -> int:
+        """Return 0 for root categories, 5 for the deepest level, -1 if unnamed."""
+
+        return self.depths[self.index[catid]]
+
+    def name(self, catid: str) -> str:
+        return self.names[self.index[catid]]
+
+    def parent(self, catid: str) -> Optional[str]:
+        parent = self.parents[self.index[catid]]
+        return self.catids[parent] if parent >= 0 else None
+
+    def placement(self, catid: str) -> Tuple[str, int, str]:
+        """Return ``(name, depth, parent Catid)``; the parent is ``""`` for roots."""
+
+        position = self.index[catid]
+        parent = self.parents[position]
+        return self.names[position], self.depths[position], self.catids[parent] if parent >= 0 else ""
+
+    def ancestors(self, catid: str) -> List[str]:
+        """Return ancestor Catids from the root down, excluding ``catid``."""
+
+        chain: List[str] = []
+        parent = self.parents[self.index[catid]]
+        while parent >= 0:
+            chain.append(self.catids[parent])
+            parent = self.parents[parent]
+        chain.reverse()
+        return chain
+
+    def path(self, catid: str) -> List[str]:
+        """Return category names from the root down to ``catid``."""
+
+        position = self.index[catid]
+        names: List[str] = []
+        while position >= 0:
+            names.append(self.names[position])
+            position = self.parents[position]
+        names.reverse()
+        return names
+
+    def children(self, catid: str) -> List[str]:
+        position = self.index[catid]
+        offsets, child_ids = self._child_index()
+        return [self.catids[child] for child in child_ids[offsets[position]:offsets[position + 1]]]
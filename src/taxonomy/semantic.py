@@ -0,0 +1,133 @@
+"""Score how well an icon's description matches its category subject.
+
+Both sides are tokenized like search queries (Dutch compounds split into
+lexicon words) and every token is expanded with lemmas, nouns and synonyms
+from the lexicons. Subject words also carry the stems of their prefixes and
+suffixes of at least :data:`MIN_AFFIX` letters, which catches compounds the
+lexicon cannot split ("babyjumpers" matches "jumper"). Expanded words are
+interned as integer IDs, so a subject becomes one ID set per content word
+and a description one flat ID set. The score is the share of subject words
+that any description ID matches. A description can also bring subject-side
+``keywords`` (the words that select a house-style template, whose notes are
+English while most subjects are Dutch); a subject word containing one counts
+as matched.
+
+:class:`SemanticScorer` memoises tokens and whole texts, so scoring a full
+manifest costs one expansion per distinct word plus a few set
+intersections per row.
+"""
+
+import re
+from typing import Collection, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .synonyms import detect_lang, expansion_index, tokenize
+
+WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "de het een en of voor met op onder boven van in aan bij uit tot als te s "
+    "the a an and or for with on under over of in at to by from".split()
+)
+MIN_AFFIX = 4
+
+
+def stem(word: str) -> str:
+    """Drop a plural ``-en`` or ``-s``."""
+
+    if word.endswith("en") and len(word) > MIN_AFFIX + 1:
+        return word[:-2]
+    if word.endswith("s") and len(word) > MIN_AFFIX:
+        return word[:-1]
+    return word
+
+
+def affixes(word: str) -> List[str]:
+    """Stems of the prefixes and suffixes of ``word`` with at least :data:`MIN_AFFIX` letters."""
+
+    ends = range(MIN_AFFIX, len(word))
+    return [stem(word[:end]) for end in ends] + [stem(word[-end:]) for end in ends]
+
+
+class SemanticScorer:
+    def __init__(self, split_compounds: bool = True):
+        self.split_compounds = split_compounds
+        self.ids: Dict[str, int] = {}
+        self._words: Dict[Tuple[str, str, bool], FrozenSet[int]] = {}
+        self._subjects: Dict[str, Tuple[Tuple[str, ...], Tuple[FrozenSet[int], ...]]] = {}
+        self._descriptions: Dict[str, FrozenSet[int]] = {}
+
+    def intern(self, word: str) -> int:
+        ids = self.ids
+        word_id = ids.get(word)
+        if word_id is None:
+            word_id = ids[word] = len(ids)
+        return word_id
+
+    def word_ids(self, word: str, lang: str, with_affixes: bool = False) -> FrozenSet[int]:
+        """IDs of ``word``, its compound parts, their stems and lexicon expansions."""
+
+        key = (word, lang, with_affixes)
+        cached = self._words.get(key)
+        if cached is None:
+            index = expansion_index(lang)
+            expanded = {word}
+            for part in tokenize(word, self.split_compounds):
+                if part not in STOPWORDS:
+                    expanded.update(index.get(part, (part,)))
+            expanded.update([stem(token) for token in expanded])
+            if with_affixes:
+                expanded.update(affixes(word))
+            cached = self._words[key] = frozenset(map(self.intern, expanded))
+        return cached
+
+    @staticmethod
+    def _content_words(text: str) -> Tuple[str, Tuple[str, ...]]:
+        tokens = WORD.findall(text.lower())
+        words = dict.fromkeys(token for token in tokens if token not in STOPWORDS and len(token) > 1)
+        return detect_lang(tokens), tuple(words)
+
+    def _text_ids(self, text: str, with_affixes: bool) -> Tuple[FrozenSet[int], ...]:
+        lang, words = self._content_words(text)
+        return tuple(self.word_ids(word, lang, with_affixes) for word in words)
+
+    def _subject(self, text: str) -> Tuple[Tuple[str, ...], Tuple[FrozenSet[int], ...]]:
+        cached = self._subjects.get(text)
+        if cached is None:
+            lang, words = self._content_words(text)
+            ids = tuple(self.word_ids(word, lang, with_affixes=True) for word in words)
+            cached = self._subjects[text] = (words, ids)
+        return cached
+
+    def subject_ids(self, text: str) -> Tuple[FrozenSet[int], ...]:
+        """One ID set per content word of a subject."""
+
+        return self._subject(text)[1]
+
+    def description_ids(self, text: str) -> FrozenSet[int]:
+        cached = self._descriptions.get(text)
+        if cached is None:
+            ids: Set[int] = set()
+            for word_ids in self._text_ids(text, with_affixes=False):
+                ids |= word_ids
+            cached = self._descriptions[text] = frozenset(ids)
+        return cached
+
+    def score(self, subject: str, description: str, keywords: Collection[str] = ()) -> Optional[float]:
+        """Share of subject words matched by ``description``; ``None`` if either has no words.
+
+        A subject word containing one of ``keywords`` is matched as well.
+        """
+
+        words, word_ids = self._subject(subject)
+        icon = self.description_ids(description)
+        if not words or not icon:
+            return None
+        matched = sum(
+            1 for word, ids in zip(words, word_ids)
+            if not icon.isdisjoint(ids) or any(keyword in word for keyword in keywords)
+        )
+        return matched / len(words)
+
+    def score_many(self, rows: Iterable[Sequence]) -> List[Optional[float]]:
+        """:meth:`score` over ``(subject, description[, keywords])`` rows, e.g. a whole manifest."""
+
+        return [self.score(*row) for row in rows]
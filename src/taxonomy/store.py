@@ -0,0 +1,274 @@
+"""Columnar in-memory store for taxonomy rows.
+
+Each row of a taxonomy export is mostly empty strings, so holding rows as
+dicts costs several hundred bytes apiece. :class:`TaxonomyColumns` keeps one
+compact array per column instead: Catids as 64-bit integers (the odd empty or
+non-numeric id goes into a side table), every other column as indexes into a
+shared table of interned names, plus a depth byte per row. :class:`RowView` exposes a
+row through the read-only mapping interface ``deepest_category`` and the
+generators already use.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from pipeline.atomic import atomic_open
+
+from .loader import TAXONOMY_COLUMNS, iter_taxonomy_rows
+from .resolver import DEPTH_COLUMNS
+
+CACHE_MAGIC = b"TCOL2\n"
+# Placeholder in the int64 Catid array for ids kept in ``catid_text``.
+TEXT_CATID = -1
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("TAXONOMY_CACHE_DIR") or Path.home() / ".cache" / "truedata" / "taxonomy"
+)
+
+
+class RowView(Mapping):
+    """Read-only mapping view of one row in a :class:`TaxonomyColumns`."""
+
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store: "TaxonomyColumns", position: int):
+        self._store = store
+        self._position = position
+
+    def __getitem__(self, key: str) -> str:
+        return self._store.value(self._position, key)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        try:
+            return self._store.value(self._position, key)
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.headers)
+
+    def __len__(self) -> int:
+        return len(self._store.headers)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class TaxonomyColumns:
+    """Append-only columnar store with interned category names."""
+
+    def __init__(self, headers: Sequence[str] = TAXONOMY_COLUMNS):
+        self.headers: List[str] = list(headers)
+        if "Catid" not in self.headers:
+            self.headers.insert(0, "Catid")
+        self.catids = array("q")
+        self.catid_text: Dict[int, str] = {}
+        self.columns: Dict[str, array] = {h: array("I") for h in self.headers if h != "Catid"}
+        self.depths = array("b")
+        self.names: List[str] = [""]
+        self.name_ids: Dict[str, int] = {"": 0}
+        self._depth_columns = [
+            (depth, self.columns[column]) for depth, column in enumerate(DEPTH_COLUMNS) if column in self.columns
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, object]], headers: Optional[Sequence[str]] = None) -> "TaxonomyColumns":
+        iterator = iter(rows)
+        first = next(iterator, None)
+        if headers is None:
+            headers = [h for h in first if h] if first is not None else TAXONOMY_COLUMNS
+        store = cls(headers)
+        if first is not None:
+            store.append(first)
+            for row in iterator:
+                store.append(row)
+        return store
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TaxonomyColumns":
+        """Stream ``path`` into a store without materialising row dicts."""
+
+        return cls.from_rows(iter_taxonomy_rows(path))
+
+    def intern(self, value: str) -> int:
+        name_id = self.name_ids.get(value)
+        if name_id is None:
+            name_id = self.name_ids[value] = len(self.names)
+            self.names.append(value)
+        return name_id
+
+    def _append_catid(self, catid: str) -> None:
+        if catid.isascii() and catid.isdigit() and str(int(catid)) == catid and int(catid) < 2 ** 63:
+            self.catids.append(int(catid))
+            return
+        self.catid_text[len(self.catids)] = catid
+        self.catids.append(TEXT_CATID)
+
+    def append(self, row: Mapping[str, object]) -> None:
+        self._append_catid(str(row.get("Catid") or "").strip())
+        for header, column in self.columns.items():
+            value = row.get(header)
+            column.append(self.intern(str(value).strip()) if value else 0)
+        depth = -1
+        for level, column in self._depth_columns:
+            if column[-1]:
+                depth = level
+        self.depths.append(depth)
+
+    def __len__(self) -> int:
+        return len(self.depths)
+
+    def __getitem__(self, position: int) -> RowView:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return RowView(self, position)
+
+    def __iter__(self) -> Iterator[RowView]:
+        for position in range(len(self)):
+            yield RowView(self, position)
+
+    def catid(self, position: int) -> str:
+        value = self.catids[position]
+        if value == TEXT_CATID:
+            return self.catid_text[position % len(self.catids)]
+        return str(value)
+
+    def value(self, position: int, header: str) -> str:
+        if header == "Catid":
+            return self.catid(position)
+        return self.names[self.columns[header][position]]
+
+    def deepest(self, position: int) -> str:
+        """Same result as ``deepest_category(self[position])`` without a view."""
+
+        depth = self.depths[position]
+        if depth < 0:
+            return ""
+        return self.names[self.columns[DEPTH_COLUMNS[depth]][position]]
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the arrays (names table excluded)."""
+
+        total = sum(column.itemsize * len(column) for column in self.columns.values())
+        total += self.depths.itemsize * len(self.depths)
+        total += self.catids.itemsize * len(self.catids)
+        return total
+
+    def to_bytes(self) -> bytes:
+        """Serialise the store: magic, JSON header, names, then raw arrays."""
+
+        header = {
+            "headers": self.headers,
+            "rows": len(self),
+            "byteorder": sys.byteorder,
+            "names": len(self.names),
+        }
+        head = json.dumps(header).encode("utf-8")
+        parts = [CACHE_MAGIC, struct.pack("<I", len(head)), head]
+        names = "\0".join(self.names).encode("utf-8")
+        parts += [struct.pack("<Q", len(names)), names]
+        parts.append(self.catids.tobytes())
+        catid_text = json.dumps(sorted(self.catid_text.items())).encode("utf-8")
+        parts += [struct.pack("<Q", len(catid_text)), catid_text]
+        parts += [self.columns[h].tobytes() for h in self.headers if h != "Catid"]
+        parts.append(self.depths.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TaxonomyColumns":
+        if not data.startswith(CACHE_MAGIC):
+            raise ValueError("not a taxonomy column cache")
+        offset = len(CACHE_MAGIC)
+        (head_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + head_len])
+        offset += head_len
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("cache written on a machine with different byte order")
+        rows = header["rows"]
+
+        store = cls(header["headers"])
+        (names_len,) = struct.unpack_from("<Q", data, offset)
+        offset += 8
+        store.names = data[offset:offset + names_len].decode("utf-8").split("\0")
+        store.name_ids = {name: idx for idx, name in enumerate(store.names)}
+        offset += names_len
+
+        def take(typecode: str) -> array:
+            nonlocal offset
+            values = array(typecode)
+            size = values.itemsize * rows
+            values.frombytes(data[offset:offset + size])
+            offset += size
+            return values
+
+        store.catids = take("q")
+        (text_len,) = struct.unpack_from("<Q", data, offset)
+        offset += 8
+        store.catid_text = {position: catid for position, catid in json.loads(data[offset:offset + text_len])}
+        offset += text_len
+        for h in store.headers:
+            if h != "Catid":
+                store.columns[h] = take("I")
+        store._depth_columns = [
+            (depth, store.columns[column]) for depth, column in enumerate(DEPTH_COLUMNS) if column in store.columns
+        ]
+        store.depths = take("b")
+        if offset != len(data):
+            raise ValueError("truncated or oversized taxonomy column cache")
+        return store
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_taxonomy_columns(path: Path, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> TaxonomyColumns:
+    """Load ``path`` into a :class:`TaxonomyColumns`, caching XLSX conversions.
+
+    Parsing a workbook through openpyxl is slow, so the converted columns are
+    stored under ``cache_dir`` keyed by the workbook's resolved path and its
+    SHA-256. Editing the workbook changes the key, which invalidates the
+    entry; older entries for the same path are removed when a new one is
+    written, while workbooks elsewhere with the same file name keep theirs.
+    CSV input and ``cache_dir=None`` bypass the cache.
+    """
+
+    if cache_dir is None or path.suffix.lower() != ".xlsx":
+        return TaxonomyColumns.from_file(path)
+
+    path_key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    cache_path = Path(cache_dir) / f"{path_key}-{path.stem}-{file_digest(path)[:32]}.tcol"
+    if cache_path.exists():
+        try:
+            store = TaxonomyColumns.from_bytes(cache_path.read_bytes())
+        except (ValueError, KeyError, struct.error) as exc:
+            logging.warning("Ignoring unreadable taxonomy cache %s: %s", cache_path, exc)
+        else:
+            logging.info("Loaded %d rows from taxonomy cache %s", len(store), cache_path)
+            return store
+
+    store = TaxonomyColumns.from_file(path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(cache_path, "wb") as handle:
+            handle.write(store.to_bytes())
+        for stale in cache_path.parent.glob(f"{path_key}-*.tcol"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        logging.info("Cached %d taxonomy rows at %s", len(store), cache_path)
+    except OSError as exc:
+        logging.warning("Could not write taxonomy cache %s: %s", cache_path, exc)
+    return store
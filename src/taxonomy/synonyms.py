@@ -2,6 +2,8 @@ import json
 import re
 import pathlib
 
+from .compounds import CompoundSplitter
+
 HERE = pathlib.Path(__file__).parent
 EN = json.loads((HERE / "verbs_en.json").read_text("utf-8"))
 NL = json.loads((HERE / "verbs_nl.json").read_text("utf-8"))
@@ -18,14 +20,49 @@ BASIC_NL_SYNONYMS = {
     "printer": ["laser", "inkjet"],
 }
 
-def tokenize(text: str):
-    return re.findall(r"[a-z0-9]+", (text or "").lower())
+# Lexicon words shorter than this are kept whole ("knippers" is not knip+pers).
+KNOWN_COMPOUND_MIN = 10
+_SPLITTER = None
+
+def compound_splitter():
+    """Splitter over the NL lexicon (keys, lemmas and nouns), built once."""
+    global _SPLITTER
+    if _SPLITTER is None:
+        words = set()
+        for key, entry in NL.items():
+            words.add(key)
+            words.add(entry["lemma"])
+            words.update(entry.get("nouns", []))
+        _SPLITTER = CompoundSplitter(words)
+    return _SPLITTER
+
+def tokenize(text: str, split_compounds=False):
+    tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
+    if not split_compounds:
+        return tokens
+    splitter = compound_splitter()
+    out = []
+    for t in tokens:
+        if _expands(t) or (len(t) < KNOWN_COMPOUND_MIN and t in splitter.trie):
+            out.append(t)
+        else:
+            out.extend(splitter.split(t))
+    return out
+
+def _expands(token):
+    """True when the lexicons add more than inflections of ``token``."""
+    for lang in ("nl", "en"):
+        for e in expansion_index(lang).get(token, ()):
+            if not (e.startswith(token) or token.startswith(e)):
+                return True
+    return False
 
 def detect_lang(tokens):
     nl_sw = {"de", "het", "een", "en", "voor", "met", "op", "onder", "boven"}
     return "nl" if any(t in nl_sw for t in tokens) else "en"
 
-def expand_tokens(tokens):
+def expand_tokens_reference(tokens):
+    """Original per-call expansion, kept as the specification for the index."""
     lang = detect_lang(tokens)
     out = set(tokens)
     maps = (EN, BASIC_EN_SYNONYMS) if lang == "en" else (NL, BASIC_NL_SYNONYMS)
@@ -49,8 +86,62 @@ def expand_tokens(tokens):
         out.update(basemap.get(base, []))
     return list(dict.fromkeys(out))
 
-def build_queries(subject: str, max_terms=6):
-    tokens = tokenize(subject)
+def _closure(token, verbmap, basemap):
+    """Final expansion of a single token, in first-derived order."""
+    base = token[:-1] if token not in verbmap and token.endswith("s") and token[:-1] in verbmap else token
+    stage = {base: None}
+    if base in verbmap:
+        v = verbmap[base]
+        stage[v["lemma"]] = None
+        stage.update(dict.fromkeys(v.get("nouns", [])))
+        stage.update(dict.fromkeys(v.get("synonyms", [])))
+    out = {}
+    for t in stage:
+        base = t[:-1] if t.endswith("s") and t[:-1] in basemap else t
+        out[base] = None
+        out.update(dict.fromkeys(basemap.get(base, [])))
+    return tuple(out)
+
+def build_expansion_index(verbmap, basemap):
+    """Map every token whose expansion is not just itself to its closure.
+
+    Covers lexicon keys and their ``-s`` plurals for both maps; any other
+    token expands to itself.
+    """
+    index = {}
+    for key in list(verbmap) + list(basemap):
+        for token in (key, key + "s"):
+            if token not in index:
+                closure = _closure(token, verbmap, basemap)
+                if closure != (token,):
+                    index[token] = closure
+    return index
+
+_EXPANSION_INDEX = {}
+
+def expansion_index(lang):
+    index = _EXPANSION_INDEX.get(lang)
+    if index is None:
+        maps = (EN, BASIC_EN_SYNONYMS) if lang == "en" else (NL, BASIC_NL_SYNONYMS)
+        index = _EXPANSION_INDEX[lang] = build_expansion_index(*maps)
+    return index
+
+def expand_tokens(tokens):
+    """Expand ``tokens`` with lemmas, nouns and synonyms from the lexicons.
+
+    One lookup per token in the precomputed :func:`expansion_index`; results
+    come out in input-token order, so the same subject always yields the same
+    list. Returns the same set as :func:`expand_tokens_reference` for any
+    mix of tokens.
+    """
+    index = expansion_index(detect_lang(tokens))
+    out = {}
+    for t in tokens:
+        out.update(dict.fromkeys(index.get(t, (t,))))
+    return list(out)
+
+def build_queries(subject: str, max_terms=6, split_compounds=False):
+    tokens = tokenize(subject, split_compounds)
     expanded = expand_tokens(tokens)
     expanded.sort(key=len, reverse=True)
     for orig in tokens:
@@ -0,0 +1,149 @@
+"""Generate realistic synthetic taxonomies for scale and load testing.
+
+Rows are emitted in the same pre-order layout as ``category_tree_report.xlsx``:
+each row fills exactly one category column and its ancestors are the nearest
+preceding rows at shallower depths. Names are sampled per depth from a source
+export and the bundled lexicons, so the output exercises the same code paths
+(and subject repetition) as real data.
+"""
+
+import csv
+import random
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .loader import TAXONOMY_COLUMNS, load_taxonomy_rows
+from .resolver import DEPTH_COLUMNS
+from .synonyms import EN, NL
+
+# Share of rows per depth in the bundled category_tree_report.xlsx export.
+DEFAULT_DEPTH_WEIGHTS = (0.5, 3.5, 26.0, 49.0, 19.0, 2.0)
+
+NL_CONNECTORS = ("voor", "met", "&", "en")
+EN_CONNECTORS = ("for", "with", "&", "and")
+
+
+class Vocabulary:
+    """Per-depth category names plus lexicon head words for composition."""
+
+    def __init__(self, names_by_depth: Sequence[Sequence[str]], nl_words: Sequence[str], en_words: Sequence[str]):
+        self.names_by_depth = [list(names) for names in names_by_depth]
+        self.nl_words = list(nl_words)
+        self.en_words = list(en_words)
+        fallback = sorted({name for names in self.names_by_depth for name in names}) or ["Categorie"]
+        for depth, names in enumerate(self.names_by_depth):
+            if not names:
+                self.names_by_depth[depth] = fallback
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, str]]) -> "Vocabulary":
+        names_by_depth: List[set] = [set() for _ in DEPTH_COLUMNS]
+        for row in rows:
+            for depth, column in enumerate(DEPTH_COLUMNS):
+                value = (row.get(column) or "").strip()
+                if value:
+                    names_by_depth[depth].add(value)
+        en_words = sorted(word for word in EN if word.isalpha())
+        nl_words = sorted(word for word in NL if word.isalpha())
+        return cls([sorted(names) for names in names_by_depth], nl_words, en_words)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Vocabulary":
+        return cls.from_rows(load_taxonomy_rows(path))
+
+
+def parse_depth_weights(value: str) -> List[float]:
+    """Parse ``"1,4,26,49,19,2"`` into six non-negative weights."""
+
+    weights = [float(part) for part in value.split(",") if part.strip()]
+    if len(weights) != len(DEPTH_COLUMNS) or any(w < 0 for w in weights) or not any(weights):
+        raise ValueError(f"expected {len(DEPTH_COLUMNS)} non-negative weights, got {value!r}")
+    return weights
+
+
+def _compose(rnd: random.Random, base: str, words: Sequence[str], connectors: Sequence[str]) -> str:
+    word = rnd.choice(words)
+    connector = rnd.choice(connectors)
+    return f"{base} {connector} {word}"
+
+
+def generate_rows(
+    count: int,
+    vocabulary: Vocabulary,
+    seed: int = 0,
+    depth_weights: Sequence[float] = DEFAULT_DEPTH_WEIGHTS,
+    english_ratio: float = 0.1,
+    compose_ratio: float = 0.5,
+    first_catid: int = 1000,
+) -> Iterator[Dict[str, str]]:
+    """Yield ``count`` taxonomy rows in export order.
+
+    ``depth_weights`` sets the share of rows per depth (root first);
+    ``english_ratio`` is the fraction of names drawn from the English lexicon
+    and ``compose_ratio`` the fraction extended with a connector and a
+    lexicon word to widen the set of distinct subjects.
+    """
+
+    rnd = random.Random(seed)
+    weights = list(depth_weights)
+    catid = first_catid
+    open_depth = -1  # deepest depth that may receive a child
+    for _ in range(count):
+        allowed = min(open_depth + 1, len(DEPTH_COLUMNS) - 1)
+        candidates = weights[: allowed + 1]
+        if not any(candidates):
+            candidates = [0.0] * allowed + [1.0]
+        depth = rnd.choices(range(allowed + 1), weights=candidates)[0]
+        open_depth = depth
+
+        if vocabulary.en_words and rnd.random() < english_ratio:
+            name = rnd.choice(vocabulary.en_words).title()
+            if rnd.random() < compose_ratio:
+                name = _compose(rnd, name, vocabulary.en_words, EN_CONNECTORS)
+        else:
+            name = rnd.choice(vocabulary.names_by_depth[depth])
+            if vocabulary.nl_words and rnd.random() < compose_ratio:
+                name = _compose(rnd, name, vocabulary.nl_words, NL_CONNECTORS)
+
+        catid += 1 + rnd.randrange(3)
+        row = {column: "" for column in TAXONOMY_COLUMNS}
+        row["Catid"] = str(catid)
+        row[DEPTH_COLUMNS[depth]] = name
+        yield row
+
+
+def write_csv(rows: Iterable[Dict[str, str]], path: Path) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=TAXONOMY_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+    return written
+
+
+def write_xlsx(rows: Iterable[Dict[str, str]], path: Path) -> int:
+    """Write ``rows`` like the upstream export: integer Catids, empty cells as ``None``."""
+
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:  # pragma: no cover - import guard
+        raise SystemExit(
+            "Writing .xlsx files requires openpyxl. Install it with 'pip install openpyxl'."
+        ) from exc
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(TAXONOMY_COLUMNS)
+    written = 0
+    for row in rows:
+        catid: Optional[object] = row["Catid"]
+        if isinstance(catid, str) and catid.isdigit():
+            catid = int(catid)
+        sheet.append([catid] + [row[column] or None for column in TAXONOMY_COLUMNS[1:]])
+        written += 1
+    workbook.save(path)
+    return written
@@ -0,0 +1,34 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+from pipeline.atomic import SyncBatch, atomic_open, atomic_write_text
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "1.svg"
+    atomic_write_text(path, "<svg>old</svg>")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as handle:
+            handle.write("<svg>tru")
+            raise RuntimeError("interrupted")
+    assert path.read_text() == "<svg>old</svg>"
+    assert [p.name for p in tmp_path.iterdir()] == ["1.svg"]
+
+
+def test_sync_batch_flushes_every_n_files(tmp_path):
+    sync = SyncBatch(every=3)
+    for i in range(7):
+        atomic_write_text(tmp_path / f"{i}.svg", "<svg/>", sync=sync)
+    assert sync.synced == 6
+    sync.checkpoint()
+    assert sync.synced == 7
+
+
+def test_disabled_sync_batch_never_syncs(tmp_path):
+    sync = SyncBatch(every=0)
+    atomic_write_text(tmp_path / "1.svg", "<svg/>", sync=sync)
+    sync.checkpoint()
+    assert sync.synced == 0
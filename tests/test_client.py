@@ -0,0 +1,170 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from pipeline.client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    ResilientSession,
+)
+from pipeline.ratelimit import TokenBucket
+
+
+def make_response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp.url = "https://api.example.test/"
+    return resp
+
+
+class ScriptedSession(requests.Session):
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_retries_transient_errors_then_succeeds():
+    sleeps = []
+    fake = ScriptedSession([requests.ConnectionError("boom"), make_response(503), make_response(200)])
+    client = ResilientSession(session=fake, sleep=sleeps.append, rng=lambda: 1.0, backoff_base=0.5)
+    assert client.get("https://api.example.test/").status_code == 200
+    assert fake.calls == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_retry_after_header_is_honoured():
+    sleeps = []
+    fake = ScriptedSession([make_response(429, {"Retry-After": "2"}), make_response(200)])
+    client = ResilientSession(session=fake, sleep=sleeps.append)
+    client.get("https://api.example.test/")
+    assert sleeps == [2.0]
+
+
+def test_retry_after_is_capped_without_a_deadline():
+    sleeps = []
+    fake = ScriptedSession([make_response(503, {"Retry-After": "3600"}), make_response(200)])
+    client = ResilientSession(session=fake, sleep=sleeps.append, backoff_cap=8.0)
+    client.get("https://api.example.test/")
+    assert sleeps == [8.0]
+
+
+def test_client_errors_are_not_retried():
+    fake = ScriptedSession([make_response(404)])
+    client = ResilientSession(session=fake, sleep=lambda s: None)
+    with pytest.raises(requests.HTTPError):
+        client.get("https://api.example.test/")
+    assert fake.calls == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    fake = ScriptedSession([requests.Timeout("slow")] * 2)
+    client = ResilientSession(session=fake, sleep=lambda s: None, max_retries=0, breaker_threshold=2)
+    for _ in range(2):
+        with pytest.raises(requests.Timeout):
+            client.get("https://api.example.test/")
+    with pytest.raises(CircuitOpenError):
+        client.get("https://api.example.test/")
+    assert fake.calls == 2
+
+
+def test_breaker_half_opens_after_reset_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] = 11.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_breaker_admits_a_single_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 11.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] = 22.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_slot_is_released_when_the_probe_has_no_verdict():
+    now = [0.0]
+    fake = ScriptedSession([requests.Timeout("slow"), ValueError("bad params")])
+    client = ResilientSession(session=fake, sleep=lambda s: None, max_retries=0, breaker_threshold=1)
+    client.breakers["api.example.test"] = CircuitBreaker(1, 10, clock=lambda: now[0])
+    with pytest.raises(requests.Timeout):
+        client.get("https://api.example.test/")
+    now[0] = 11.0
+    with pytest.raises(ValueError):
+        client.get("https://api.example.test/")
+    assert client.breakers["api.example.test"].allow()
+
+
+def test_deadline_stops_retries():
+    now = [0.0]
+    deadline = Deadline(1.0, clock=lambda: now[0])
+
+    def advance(seconds):
+        now[0] += seconds
+
+    fake = ScriptedSession([requests.ConnectionError("boom")] * 5)
+    client = ResilientSession(session=fake, sleep=advance, rng=lambda: 1.0, backoff_base=0.75)
+    with pytest.raises(DeadlineExceeded):
+        client.get("https://api.example.test/", deadline=deadline)
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_throttling_slows_the_limiter_without_opening_the_circuit():
+    responses = [make_response(429, {"Retry-After": "0"}) for _ in range(3)] + [make_response(200)]
+    fake = ScriptedSession(responses)
+    client = ResilientSession(
+        session=fake,
+        sleep=lambda s: None,
+        breaker_threshold=2,
+        max_retries=3,
+        rate_limit=50,
+    )
+    assert client.get("https://api.example.test/").status_code == 200
+    limiter = client.limiter_for("https://api.example.test/")
+    assert limiter.throttled == 3
+    assert limiter.rate < 50
+
+
+def test_throttled_retry_waits_only_in_the_limiter():
+    now = [0.0]
+    sleeps = []
+
+    def advance(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    for headers, waited in (({"Retry-After": "2"}, 2.0), ({}, 1 / 25)):
+        now[0], sleeps[:] = 0.0, []
+        fake = ScriptedSession([make_response(429, headers), make_response(200)])
+        client = ResilientSession(session=fake, sleep=advance, rng=lambda: 1.0, rate_limit=50)
+        client.limiters["api.example.test"] = TokenBucket(50, 1, clock=lambda: now[0], sleep=advance)
+        assert client.get("https://api.example.test/").status_code == 200
+        assert sleeps == [pytest.approx(waited)]
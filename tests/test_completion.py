@@ -0,0 +1,26 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.completion import CompletionIndex
+
+
+def test_index_joins_files_with_passed_manifest_rows(tmp_path):
+    (tmp_path / "babymobiel").mkdir()
+    (tmp_path / "babymobiel" / "thin_1.svg").write_text("<svg/>")
+    (tmp_path / "babymobiel" / "thin_2.svg").write_text("<svg/>")
+    (tmp_path / "babymobiel" / "3.svg").write_text("<svg/>")
+    (tmp_path / "manifest.csv").write_text("Catid\n")
+
+    index = CompletionIndex.build(tmp_path, "thin_", {"1", "3", "4"})
+
+    assert ("babymobiel", "1") in index
+    assert ("babymobiel", "2") not in index  # no passed manifest row
+    assert ("babymobiel", "3") not in index  # wrong style prefix
+    assert ("babymobiel", "4") not in index  # no file
+    assert ("wipstoel", "1") not in index  # file is in another category
+    assert len(index) == 1
+
+
+def test_missing_style_dir_is_empty(tmp_path):
+    assert len(CompletionIndex.build(tmp_path / "missing", "", {"1"})) == 0
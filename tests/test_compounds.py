@@ -0,0 +1,27 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from taxonomy.compounds import CompoundSplitter, Trie
+from taxonomy.synonyms import build_queries, tokenize
+
+
+def test_trie_prefix_ends_longest_first():
+    trie = Trie(["baby", "babys", "bad"])
+    assert "baby" in trie and "bab" not in trie
+    assert trie.prefix_ends("babyschommel") == [5, 4]
+
+
+def test_splitter_uses_linkers_and_plurals():
+    splitter = CompoundSplitter(["baby", "schommel", "stoel", "verzorging", "set", "knip"])
+    assert splitter.split("babyschommelstoelen") == ("baby", "schommel", "stoelen")
+    assert splitter.split("verzorgingssets") == ("verzorging", "sets")
+    assert splitter.split("knippers") == ("knippers",)
+    assert splitter.split("baby") == ("baby",)
+
+
+def test_tokenize_splits_only_when_flagged():
+    assert tokenize("Babyschommelstoelen") == ["babyschommelstoelen"]
+    assert tokenize("Babyschommelstoelen", split_compounds=True) == ["baby", "schommelstoelen"]
+    assert tokenize("schroeven en boren", split_compounds=True) == ["schroeven", "en", "boren"]
+    assert build_queries("Accessoires voor babymobiels", split_compounds=True)[0].split()[:2] == ["mobiel", "baby"]
@@ -0,0 +1,44 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+from pipeline.counter_rng import CounterRandom, RngMismatch, fold_seed, resolve_rng, write_rng_file
+
+
+def test_sequence_matches_splitmix64_reference():
+    rng = CounterRandom(0)
+    assert [rng.next64() for _ in range(3)] == [
+        0xE220A8397B1DCDAF,
+        0x6E789E6AA1B965F4,
+        0x06C45D188009454F,
+    ]
+
+
+def test_random_and_uniform_follow_the_counter():
+    seed = int("ab" * 32, 16)
+    first, second = CounterRandom(seed), CounterRandom(seed)
+    values = [first.random() for _ in range(1000)]
+    assert all(0.0 <= value < 1.0 for value in values)
+    assert len(set(values)) == 1000
+    assert second.uniform(-4, 4) == -4 + 8 * values[0]
+    assert second.counter == 1
+
+
+def test_fold_seed_keeps_one_word_seeds_and_mixes_longer_ones():
+    assert fold_seed(0) == 0
+    assert fold_seed(12345) == 12345
+    word = int("ab" * 8, 16)
+    assert fold_seed(int("ab" * 32, 16)) not in (0, word)
+    assert fold_seed((word << 64) | 1) != fold_seed((1 << 64) | word)
+
+
+def test_resolve_rng_uses_and_enforces_the_recorded_generator(tmp_path):
+    assert resolve_rng(None, tmp_path) == "mt"
+    assert resolve_rng("counter", tmp_path) == "counter"
+    write_rng_file(tmp_path, "counter")
+    assert resolve_rng(None, tmp_path) == "counter"
+    assert resolve_rng("counter", tmp_path) == "counter"
+    with pytest.raises(RngMismatch):
+        resolve_rng("mt", tmp_path)
@@ -0,0 +1,77 @@
+import sys
+import csv
+import importlib.util
+import pathlib
+from collections import defaultdict
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.hash_index import HashEntry, HashIndex, batch_name, geometry_hash
+from taxonomy.semantic import SemanticScorer
+
+SCRIPTS = pathlib.Path(__file__).resolve().parents[1] / 'scripts'
+
+
+def test_geometry_hash_ignores_digits_past_three_decimals():
+    assert geometry_hash('<circle cx="1.23456" />') == geometry_hash('<circle cx="1.2349" />')
+    assert geometry_hash('<circle cx="1.234" />') != geometry_hash('<circle cx="1.235" />')
+    assert len(geometry_hash("<svg />")) == 16
+
+
+def test_record_reports_other_batches_and_persists(tmp_path):
+    index = HashIndex(tmp_path / "hashes.sqlite")
+    assert index.record("aa", "/old", "1", "1.svg") == []
+    assert index.record("aa", "/old", "2", "2.svg") == [HashEntry("/old", "1", "1.svg")]
+    # Re-recording the same icon does not report itself.
+    assert index.record("aa", "/old", "1", "1.svg") == [HashEntry("/old", "2", "2.svg")]
+    index.close()
+
+    index = HashIndex(tmp_path / "hashes.sqlite")
+    assert index.record_svg("/new", "1", "1.svg", "<svg />") == []
+    assert index.record("aa", "/new", "3", "3.svg", limit=1) == [HashEntry("/old", "1", "1.svg")]
+    assert len(index) == 4
+
+
+def test_remove_and_remove_batch(tmp_path):
+    index = HashIndex(tmp_path / "hashes.sqlite")
+    for catid in ("1", "2", "3"):
+        index.record("aa", "/old", catid, f"{catid}.svg")
+    index.record("aa", "/new", "1", "1.svg")
+    index.remove("/old", ["2", "9"])
+    assert [entry.catid for entry in index.lookup("aa")] == ["1", "1", "3"]
+    index.remove_batch("/old")
+    assert index.lookup("aa") == [HashEntry("/new", "1", "1.svg")]
+    assert index.lookup("aa", exclude=("/new", "1")) == []
+
+
+def test_batch_name_is_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert batch_name(pathlib.Path("out")) == str(tmp_path.resolve() / "out")
+
+
+def test_validate_indexes_nested_generate_icons_layout(tmp_path):
+    if str(SCRIPTS) not in sys.path:
+        sys.path.append(str(SCRIPTS))
+    spec = importlib.util.spec_from_file_location("validate_outputs", SCRIPTS / "validate_outputs.py")
+    validate = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(validate)
+
+    style_dir = tmp_path / "original"
+    svg = '<svg viewBox="0 0 256 256"><circle cx="1" /></svg>'
+    rows = [("1001", "luiers"), ("1002", "kinderwagens")]
+    style_dir.mkdir()
+    with (style_dir / "manifest.csv").open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Catid", "category", "title_selected", "concept_notes"])
+        for catid, category in rows:
+            writer.writerow([catid, category, category, "downloaded from svgapi (Icon)"])
+            (style_dir / category).mkdir()
+            (style_dir / category / f"test-{catid}.svg").write_text(svg, "utf-8")
+
+    index = HashIndex(tmp_path / "hashes.sqlite")
+    report = []
+    validate.process_dir(style_dir, report, defaultdict(list), SemanticScorer(), 0.5, set(), index, {})
+    assert [row["catid"] for row in report] == ["1002", "1001"]
+    assert report[1]["duplicate_of"] == str(pathlib.Path(batch_name(style_dir)) / "kinderwagens" / "test-1002.svg")
+    assert [(entry.catid, entry.file) for entry in index.lookup(geometry_hash(svg))] == [
+        ("1001", "luiers/test-1001.svg"), ("1002", "kinderwagens/test-1002.svg"),
+    ]
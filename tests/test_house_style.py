@@ -0,0 +1,121 @@
+import sys
+import csv
+import hashlib
+import importlib.util
+import pathlib
+import xml.etree.ElementTree as ET
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+from taxonomy.diff import snapshot
+from taxonomy.store import TaxonomyColumns
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location(
+    "generate_house_style_icons", ROOT / "scripts" / "generate_house_style_icons.py"
+)
+house = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(house)
+
+
+def read_rows(limit=40):
+    with (ROOT / "categories_250.csv").open(newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))[:limit]
+
+
+def write_rows(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def outputs(out_dir):
+    return {p.name: p.read_bytes() for p in sorted(out_dir.iterdir()) if p.suffix in (".svg", ".csv")}
+
+
+def full_run(tmp_path, rows, name, rng="mt"):
+    out = tmp_path / name
+    house.generate_icons(write_rows(tmp_path / f"{name}.csv", rows), out, cache_dir=None, rng=rng)
+    return outputs(out)
+
+
+def update(tmp_path, old_rows, new_rows):
+    out = tmp_path / "watched"
+    previous = snapshot(house.generate_icons(write_rows(tmp_path / "old.csv", old_rows), out, cache_dir=None))
+    entries = house.read_manifest_entries(out)
+    house.update_changed_rows(TaxonomyColumns.from_rows(new_rows), out, previous, entries)
+    return outputs(out)
+
+
+def test_update_after_reorder_matches_full_run(tmp_path):
+    rows = read_rows()
+    assert update(tmp_path, rows, rows[::-1]) == full_run(tmp_path, rows[::-1], "full")
+
+
+def test_update_after_edit_matches_full_run(tmp_path):
+    rows = read_rows()
+    edited = [dict(row) for row in rows[:20] + rows[21:]]
+    deepest = [column for column, value in edited[10].items() if column != "Catid" and value][-1]
+    edited[10][deepest] += " Deluxe"
+    edited.insert(5, dict(rows[3], Catid="999999"))
+    assert update(tmp_path, rows, edited) == full_run(tmp_path, edited, "full")
+
+
+def test_listed_update_writes_every_rendered_row(tmp_path):
+    rows = read_rows()
+    edited = [dict(row) for row in rows]
+    deepest = [column for column, value in edited[10].items() if column != "Catid" and value][-1]
+    edited[10][deepest] = "Verfrollers"
+    out = tmp_path / "listed"
+    house.generate_icons(write_rows(tmp_path / "old.csv", rows), out, cache_dir=None)
+    # The list names another row; the renamed one must still get its new icon.
+    house.update_listed_rows(write_rows(tmp_path / "new.csv", edited), out, {rows[0]["Catid"]}, cache_dir=None)
+    assert outputs(out) == full_run(tmp_path, edited, "full")
+
+
+def test_listed_update_keeps_the_recorded_rng(tmp_path):
+    rows = read_rows(10)
+    out = tmp_path / "counter"
+    csv_path = write_rows(tmp_path / "rows.csv", rows)
+    house.generate_icons(csv_path, out, cache_dir=None, rng="counter")
+    with pytest.raises(house.RngMismatch):
+        house.update_listed_rows(csv_path, out, {rows[0]["Catid"]}, cache_dir=None, rng="mt")
+    house.update_listed_rows(csv_path, out, {rows[0]["Catid"]}, cache_dir=None)
+    assert outputs(out) == full_run(tmp_path, rows, "full", rng="counter")
+
+
+def reference_svg(shapes):
+    """The ElementTree serialisation ``svg_from_shapes`` replaced."""
+
+    root = ET.Element("svg", house.HOUSE_STYLE)
+    for tag, attrs in shapes:
+        root.append(ET.Element(tag, attrs))
+    signature = "|".join(
+        f"{tag}:" + ",".join(f"{key}={attrs[key]}" for key in sorted(attrs)) for tag, attrs in shapes
+    )
+    return ET.tostring(root, encoding="unicode"), hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+
+def test_svg_from_shapes_matches_elementtree_for_every_template():
+    templates = [getattr(house, name) for name in dir(house) if name.startswith("icon_")]
+    subjects = [house.row_subject(row) for row in read_rows(250)]
+    assert house.icon_generic in templates
+    for rng in ("mt", "counter"):
+        cases = [(template, f"{template.__name__}-{n}", "Baby") for template in templates for n in range(3)]
+        cases += [(house.pick_template(subject), subject, subject) for subject in subjects]
+        for template, catid, subject in cases:
+            shapes, _ = template(house.IconContext(subject, house.sha_seed(catid), rng))
+            svg_text, primitives, path_hash = house.svg_from_shapes(shapes)
+            assert (svg_text, path_hash) == reference_svg(shapes), (template.__name__, catid, rng)
+            assert primitives == list(dict.fromkeys(shape.tag for shape in shapes))
+
+
+def test_escape_attr_matches_elementtree():
+    text = 'M0 0 & <a> "b"\r\n\tc\''
+    element = ET.tostring(ET.Element("path", {"d": text}), encoding="unicode")
+    assert element == f'<path d="{house.escape_attr(text)}" />'
+    assert house.path(text).markup() == element
+    assert house.escape_attr("M0 0 L1 1") == "M0 0 L1 1"
@@ -0,0 +1,50 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from pipeline.icon_service import IconServer, IconService
+
+
+def make_service(cache_size=2):
+    calls = []
+
+    def render(catid, subject):
+        calls.append(catid)
+        return f"<svg><title>{subject}</title></svg>"
+
+    return IconService({"1": "Babymobiel", "2": "Wipstoel", "3": "Box"}, render, cache_size), calls
+
+
+def test_rendered_icons_are_cached_and_evicted():
+    service, calls = make_service(cache_size=2)
+    first = service.get("1")
+    assert service.get("1") == first
+    service.get("2")
+    service.get("3")
+    service.get("1")
+    assert calls == ["1", "2", "3", "1"]
+    assert service.get("missing") is None
+    assert service.stats() == {"rows": 3, "cached": 2, "hits": 1, "misses": 5}
+
+
+def test_http_etag_and_not_found():
+    service, _ = make_service()
+    with IconServer(service) as server:
+        response = requests.get(f"{server.base_url}/icons/1.svg", timeout=5)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/svg+xml"
+        assert response.text == "<svg><title>Babymobiel</title></svg>"
+        etag = response.headers["ETag"]
+
+        cached = requests.get(f"{server.base_url}/icons/1.svg", headers={"If-None-Match": etag}, timeout=5)
+        assert cached.status_code == 304
+        assert cached.content == b""
+        other = requests.get(f"{server.base_url}/icons/2.svg", headers={"If-None-Match": etag}, timeout=5)
+        assert other.status_code == 200
+
+        assert requests.get(f"{server.base_url}/icons/9.svg", timeout=5).status_code == 404
+        assert requests.get(f"{server.base_url}/healthz", timeout=5).json()["rows"] == 3
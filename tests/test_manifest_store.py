@@ -0,0 +1,52 @@
+import sys
+import csv
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.manifest_store import ManifestStore
+
+FIELDS = ['Catid', 'category', 'path_hash', 'width', 'validation_passed']
+
+
+def test_upsert_replaces_in_place_and_appends_rows_without_catid(tmp_path):
+    store = ManifestStore(tmp_path / "manifest.sqlite", FIELDS)
+    store.upsert({'Catid': '1', 'path_hash': 'a', 'validation_passed': 'FALSE'})
+    store.upsert({'Catid': '2', 'path_hash': 'a', 'width': 24, 'validation_passed': 'TRUE'})
+    store.upsert({'Catid': '', 'path_hash': 'b'})
+    store.upsert({'Catid': '', 'path_hash': 'b'})
+    store.upsert({'Catid': '1', 'path_hash': 'c', 'validation_passed': 'TRUE'})
+    store.close()
+
+    store = ManifestStore(tmp_path / "manifest.sqlite", FIELDS)
+    assert [(row['Catid'], row['path_hash']) for row in store.rows()] == [('1', 'c'), ('2', 'a'), ('', 'b'), ('', 'b')]
+    assert store.get('2')['width'] == '24'
+    assert store.completed_catids() == {'1', '2'}
+    assert store.duplicate_hashes() == {'b': ['', '']}
+    assert store.delete(['2', '9']) == 1
+    assert [row['Catid'] for row in store.rows()] == ['1', '', '']
+    store.upsert({'Catid': '3'})
+    store.upsert({'Catid': '2'})
+    store.reorder(['2', '1', '3'])
+    assert [row['Catid'] for row in store.rows()] == ['2', '1', '3', '', '']
+
+
+def test_export_matches_csv_writer(tmp_path):
+    rows = [
+        {'Catid': '7', 'category': 'baby', 'path_hash': 'x', 'width': 24.5, 'validation_passed': 'TRUE'},
+        {'Catid': '8', 'category': 'baby, "wip"', 'path_hash': '', 'width': None, 'validation_passed': 'FALSE'},
+    ]
+    expected = tmp_path / "expected.csv"
+    with expected.open('w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+    store = ManifestStore(tmp_path / "manifest.sqlite", FIELDS)
+    store.upsert_many(rows)
+    assert store.export_csv(tmp_path / "manifest.csv") == 2
+    assert (tmp_path / "manifest.csv").read_bytes() == expected.read_bytes()
+
+    reimported = ManifestStore(tmp_path / "copy.sqlite", FIELDS)
+    assert reimported.import_csv(tmp_path / "manifest.csv") == 2
+    assert list(reimported.rows()) == list(store.rows())
@@ -0,0 +1,43 @@
+import sys
+import json
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.metrics import RunMetrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stage_and_row_timing(tmp_path):
+    clock = FakeClock()
+    metrics = RunMetrics(slowest=2, clock=clock)
+    for catid, seconds in (("1", 0.5), ("2", 2.0), ("3", 1.0)):
+        with metrics.row(catid, f"subject {catid}"):
+            with metrics.stage("search"):
+                clock.now += seconds
+    metrics.cache("search", True)
+    metrics.cache("search", False)
+    metrics.add_bytes(2048)
+
+    data = json.loads(metrics.write(tmp_path / "run_metrics.json").read_text("utf-8"))
+    assert data["rows"] == 3
+    assert data["stages"]["search"] == {"count": 3, "total_seconds": 3.5, "mean_ms": 1166.667, "max_ms": 2000.0}
+    assert [row["Catid"] for row in data["slowest_rows"]] == ["2", "3"]
+    assert data["caches"]["search"]["hit_rate"] == 0.5
+    assert data["bytes_downloaded"] == 2048
+
+
+def test_summary_table_lists_stages():
+    metrics = RunMetrics()
+    with metrics.stage("write"):
+        pass
+    metrics.count("rows_ok")
+    table = metrics.summary_table()
+    assert table.splitlines()[1].startswith("write")
+    assert "rows_ok=1" in table
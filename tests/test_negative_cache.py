@@ -0,0 +1,69 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.negative_cache import NegativeCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_persist_per_limit_and_expire(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "negative.json"
+    cache = NegativeCache.load(path, ttl=60, clock=clock)
+    cache.add("babymobiel", 50)
+    cache.save()
+
+    reloaded = NegativeCache.load(path, ttl=60, clock=clock)
+    assert reloaded.contains("babymobiel", 50)
+    assert not reloaded.contains("babymobiel", 10)
+
+    clock.now += 61
+    assert not reloaded.contains("babymobiel", 50)
+    assert len(NegativeCache.load(path, ttl=60, clock=clock)) == 0
+
+
+def test_entries_are_kept_per_endpoint(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "negative.json"
+    stub = NegativeCache.load(path, ttl=60, clock=clock, endpoint="127.0.0.1:8797/abc")
+    stub.add("babymobiel", 50)
+    stub.save()
+
+    real = NegativeCache.load(path, ttl=60, clock=clock, endpoint="api.svgapi.com/abc")
+    assert len(real) == 0 and not real.contains("babymobiel", 50)
+    real.add("kinderwagen", 50)
+    real.save()
+    assert NegativeCache.load(path, ttl=60, clock=clock, endpoint="127.0.0.1:8797/abc").contains("babymobiel", 50)
+
+
+def test_concurrent_runs_keep_each_others_entries(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "negative.json"
+    first = NegativeCache.load(path, ttl=60, clock=clock)
+    second = NegativeCache.load(path, ttl=60, clock=clock)
+    first.add("babymobiel", 50)
+    clock.now += 10
+    second.add("babymobiel", 50)
+    second.add("kinderwagen", 50)
+    second.save()
+    first.save()
+
+    merged = NegativeCache.load(path, ttl=60, clock=clock)
+    assert merged.contains("babymobiel", 50) and merged.contains("kinderwagen", 50)
+    clock.now += 55
+    assert NegativeCache.load(path, ttl=60, clock=clock).contains("babymobiel", 50)
+
+
+def test_zero_ttl_records_nothing(tmp_path):
+    cache = NegativeCache(tmp_path / "negative.json", ttl=0)
+    cache.add("babymobiel", 50)
+    cache.save()
+    assert len(cache) == 0
+    assert not (tmp_path / "negative.json").exists()
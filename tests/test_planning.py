@@ -0,0 +1,70 @@
+import sys
+import importlib.util
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+from pipeline.planning import LRUCache, SubjectPlan, subject_key
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_rows_group_by_stripped_subject():
+    plan = SubjectPlan(["Babyfles", " Babyfles ", "babyfles", "Bad  thermometer", "Bad thermometer"])
+    assert plan.rows == 5
+    assert len(plan) == 4
+    assert plan.groups[subject_key("Babyfles ")] == [0, 1]
+    assert plan.key(2) != plan.key(0)
+    assert plan.key(3) != plan.key(4)
+
+
+class EmptySearches:
+    """Session stand-in whose searches all come back without icons."""
+
+    content = b'{"icons": []}'
+
+    def get(self, url, params=None, deadline=None):
+        return self
+
+    def json(self):
+        return {"icons": []}
+
+
+def test_differently_cased_rows_keep_their_own_queries():
+    pytest.importorskip("requests")
+    spec = importlib.util.spec_from_file_location("generate_icons", ROOT / "scripts" / "generate_icons.py")
+    icons = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(icons)
+
+    rows = [("1", "Baby  Bed"), ("2", "kinder bed"), ("3", "baby bed")]
+    for ordered in (rows, rows[::-1]):
+        plan = SubjectPlan(subject for _, subject in ordered)
+        caches = icons.new_fetch_caches()
+        for position, (catid, subject) in enumerate(ordered):
+            shared = plan.state(position)
+            icons.fetch_icon_svg(subject, catid, EmptySearches(), "key", 50, shared=shared, caches=caches)
+            own, fallbacks = icons.search_query_groups(subject)
+            assert shared["queries"] == own + fallbacks
+            assert shared["fallbacks"] == frozenset(fallbacks)
+
+
+def test_group_state_is_shared_and_freed_after_last_row():
+    plan = SubjectPlan(["Luiers", "Babyfles", "Luiers "])
+    plan.state(0)["template"] = "diaper"
+    plan.done(0)
+    assert "template" not in plan.state(1)
+    plan.done(1)
+    assert plan.state(2)["template"] == "diaper"
+    plan.done(2)
+    assert plan._state == {}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", [])
+    cache.put("b", [1])
+    assert cache.get("a") == []
+    cache.put("c", [2])
+    assert cache.get("b") is None
+    assert len(cache) == 2
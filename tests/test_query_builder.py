@@ -2,7 +2,7 @@ import sys
 import pathlib
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
 
-from taxonomy.resolver import deepest_category
+from taxonomy.resolver import TaxonomyTree, deepest_category
 
 
 def test_deepest_category_prefers_deepest_non_empty():
@@ -26,3 +26,36 @@ def test_deepest_category_fallback_to_root():
         "Sub-sub-sub-sub-sub category": "",
     }
     assert deepest_category(row) == "Root"
+
+
+def tree_rows():
+    layout = [
+        ("1", 0, "Baby & kind"),
+        ("2", 1, "Babyverzorging"),
+        ("3", 2, "Babybadjes"),
+        ("4", 2, "Babyzeep"),
+        ("5", 1, "Babyveiligheid"),
+        ("6", 3, "Traphekjes"),
+        ("7", 0, "Bouw"),
+    ]
+    columns = ["Root category", "Sub category", "Sub-sub category", "Sub-sub-sub category"]
+    return [{"Catid": catid, columns[depth]: name} for catid, depth, name in layout]
+
+
+def test_taxonomy_tree_parents_and_paths():
+    tree = TaxonomyTree(tree_rows())
+    assert len(tree) == 7
+    assert tree.depth("4") == 2
+    assert tree.parent("4") == "2"
+    assert tree.parent("1") is None
+    assert tree.ancestors("4") == ["1", "2"]
+    assert tree.path("4") == ["Baby & kind", "Babyverzorging", "Babyzeep"]
+    assert tree.children("1") == ["2", "5"]
+    assert tree.children("7") == []
+
+
+def test_taxonomy_tree_skipped_level_attaches_to_nearest_ancestor():
+    tree = TaxonomyTree(tree_rows())
+    assert tree.depth("6") == 3
+    assert tree.parent("6") == "5"
+    assert tree.ancestors("7") == []
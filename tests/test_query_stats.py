@@ -0,0 +1,48 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.query_stats import QueryStats, query_shape
+
+
+def test_shapes_and_persistence(tmp_path):
+    stats = QueryStats()
+    stats.record("schommelstoel baby", False)
+    stats.record("baby icon", True, fallback=True)
+    stats.record("baby", False)
+    assert query_shape("a b c d e f g") == "6-term"
+    assert stats.shapes == {"1-term": [0, 1], "2-term": [0, 1], "fallback": [1, 1]}
+    path = tmp_path / "stats" / "query_stats.json"
+    stats.save(path)
+    loaded = QueryStats.load(path)
+    assert loaded.shapes == stats.shapes and loaded.terms == stats.terms
+
+
+def test_stats_are_kept_per_endpoint(tmp_path):
+    path = tmp_path / "query_stats.json"
+    stub = QueryStats(endpoint="127.0.0.1:8797/abc")
+    stub.record("stoel", False)
+    stub.save(path)
+    real = QueryStats.load(path, "api.svgapi.com/abc")
+    assert real.shapes == {}
+    real.record("stoel", True)
+    real.save(path)
+    assert QueryStats.load(path, "127.0.0.1:8797/abc").shapes == {"1-term": [0, 1]}
+    assert QueryStats.load(path, "api.svgapi.com/abc").shapes == {"1-term": [1, 1]}
+
+
+def test_order_prefers_hitting_shapes_and_keeps_fallbacks_last():
+    stats = QueryStats(min_samples=5, explore_every=10 ** 9)
+    for idx in range(30):
+        stats.record(f"lang gezocht woord{idx}", False)
+        stats.record(f"los{idx}", True)
+    queries = ["stoel baby kind", "stoel baby", "stoel", "baby icon", "baby"]
+    assert stats.order(queries, ["baby icon", "baby"]) == ["stoel", "stoel baby", "baby icon", "baby"]
+    # A subject's own "baby" query is ranked like any other one-term query.
+    assert stats.order(["baby kamer kind", "baby", "baby icon"], ["baby icon"]) == ["baby", "baby icon"]
+
+
+def test_order_without_history_keeps_original_order():
+    queries = ["stoel baby", "stoel", "baby icon"]
+    assert QueryStats().order(queries) == queries
+    assert QueryStats().order([]) == []
@@ -0,0 +1,68 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from pipeline.ratelimit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_bucket(rate=10, burst=2, **kwargs):
+    clock = FakeClock()
+    return TokenBucket(rate, burst=burst, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_burst_then_paced_at_rate():
+    bucket, clock = make_bucket(rate=10, burst=2)
+    for _ in range(2):
+        assert bucket.acquire()
+    assert clock.now == 100.0
+    for _ in range(5):
+        assert bucket.acquire()
+    assert abs(clock.now - 100.5) < 1e-9
+
+
+def test_acquire_times_out_without_waiting():
+    bucket, clock = make_bucket(rate=1, burst=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(timeout=0.5)
+    assert clock.now == 100.0
+
+
+def test_throttle_halves_rate_once_per_cooldown_and_honours_retry_after():
+    bucket, clock = make_bucket(rate=40, burst=5)
+    bucket.on_throttle(2.0)
+    bucket.on_throttle(2.0)
+    assert bucket.rate == 20
+    assert bucket.throttled == 2
+    assert bucket.acquire()
+    assert clock.now >= 102.0
+    clock.now += 0.5
+    bucket.on_throttle()
+    assert bucket.rate == 10
+
+
+def test_rate_recovers_after_successes():
+    bucket, clock = make_bucket(rate=40, rate_step=8)
+    bucket.on_throttle(1.0)
+    bucket.on_success()
+    clock.now = 101.0
+    bucket.on_success()
+    assert bucket.rate == 20  # no credit for the Retry-After pause
+    for _ in range(20):
+        clock.now += 0.1
+        bucket.on_success()
+    assert 35 <= bucket.rate < 40
+    for _ in range(200):
+        clock.now += 0.1
+        bucket.on_success()
+    assert bucket.rate == 40
@@ -0,0 +1,57 @@
+import sys
+import importlib.util
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from taxonomy.semantic import SemanticScorer, affixes, stem
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_stem_and_affixes():
+    assert stem("stoelen") == "stoel"
+    assert stem("jumpers") == "jumper"
+    assert stem("bus") == "bus"
+    assert "jumper" in affixes("babyjumpers")
+    assert "baby" in affixes("babyjumpers")
+
+
+def test_score_is_share_of_subject_words_matched():
+    scorer = SemanticScorer()
+    assert scorer.score("Babyjumpers", "Doorway jumper hoop") == 1.0
+    assert scorer.score("Accessoires voor babymobiels", "Baby mobile with hanging toys") == 0.5
+    assert scorer.score("Slotcilinders", "Paint roller") == 0.0
+    assert scorer.score("voor en", "Paint roller") is None
+    assert scorer.score("Slotcilinders", "") is None
+
+
+def test_score_many_reuses_interned_words():
+    scorer = SemanticScorer()
+    pairs = [("Babyjumpers", "Doorway jumper hoop")] * 3 + [("Dakplaten", "Doorway jumper hoop")]
+    assert scorer.score_many(pairs) == [1.0, 1.0, 1.0, 0.0]
+    interned = len(scorer.ids)
+    scorer.score_many(pairs)
+    assert len(scorer.ids) == interned
+
+
+def test_template_keywords_match_subject_words():
+    scorer = SemanticScorer()
+    assert scorer.score("Kinderwagens en buggy's", "Stroller silhouette") == 0.0
+    assert scorer.score("Kinderwagens en buggy's", "Stroller silhouette", ("kinderwagen",)) == 0.5
+    assert scorer.score("Kinderwagens en buggy's", "Stroller silhouette", ("kinderwagen", "buggy")) == 1.0
+
+
+def test_bundled_house_style_run_mostly_passes():
+    scripts = ROOT / "scripts"
+    if str(scripts) not in sys.path:
+        sys.path.append(str(scripts))
+    spec = importlib.util.spec_from_file_location("validate_outputs", scripts / "validate_outputs.py")
+    validate = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(validate)
+
+    manifest = validate.load_manifest(ROOT / "output" / "test5")
+    scores = validate.semantic_scores(manifest, SemanticScorer())
+    verdicts = {catid: validate.sem_match(score, 0.5) for catid, score in scores.items()}
+    assert 0.7 <= sum(v == "PASS" for v in verdicts.values()) / len(verdicts) <= 0.95
+    generic = [catid for catid, row in manifest.items() if row["concept_notes"].startswith("Abstract emblem")]
+    assert generic and all(verdicts[catid] == "FAIL" for catid in generic)
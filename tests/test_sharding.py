@@ -0,0 +1,62 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+from pipeline.sharding import (
+    Shard,
+    ShardMergeError,
+    check_shard_set,
+    merge_manifest_rows,
+    parse_shard,
+    shard_of,
+)
+
+
+def split(catids, count):
+    shards = {i: [] for i in range(count)}
+    for catid in catids:
+        shards[shard_of(catid, count)].append({'Catid': catid})
+    return shards
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == Shard(2, 4)
+    for text in ("4/4", "-1/4", "1", "a/b", "0/0"):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+
+def test_every_catid_has_exactly_one_owner():
+    catids = [str(i) for i in range(1000)]
+    owners = [[s for s in range(4) if Shard(s, 4).owns(c)] for c in catids]
+    assert all(len(o) == 1 for o in owners)
+    assert {o[0] for o in owners} == {0, 1, 2, 3}
+
+
+def test_merge_restores_input_order():
+    catids = [str(i) for i in range(50)]
+    assert merge_manifest_rows(catids, split(catids, 3), 3) == [{'Catid': c} for c in catids]
+
+
+def test_merge_reports_gaps_and_overlaps():
+    catids = [str(i) for i in range(50)]
+    shards = split(catids, 3)
+    missing = shards[0].pop(3)
+    with pytest.raises(ShardMergeError, match=f"missing .*{missing['Catid']}"):
+        merge_manifest_rows(catids, shards, 3)
+
+    shards = split(catids, 3)
+    stray = shards[1][0]
+    shards[2].append(stray)
+    with pytest.raises(ShardMergeError, match=f"{stray['Catid']} in shard 2"):
+        merge_manifest_rows(catids, shards, 3)
+
+
+def test_shard_set_must_be_complete():
+    assert check_shard_set([Shard(1, 2), Shard(0, 2)]) == 2
+    with pytest.raises(ShardMergeError):
+        check_shard_set([Shard(0, 3), Shard(2, 3)])
+    with pytest.raises(ShardMergeError):
+        check_shard_set([Shard(0, 2), Shard(0, 2), Shard(1, 2)])
@@ -0,0 +1,93 @@
+import sys
+import pathlib
+
+import pytest
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from taxonomy.loader import load_taxonomy_rows
+from taxonomy.resolver import deepest_category
+from taxonomy.store import TaxonomyColumns, load_taxonomy_columns
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_row_views_match_dict_rows():
+    rows = load_taxonomy_rows(ROOT / "categories_250.csv")
+    store = TaxonomyColumns.from_file(ROOT / "categories_250.csv")
+    assert len(store) == len(rows)
+    for position, (view, row) in enumerate(zip(store, rows)):
+        assert dict(view) == {key: (value or "").strip() for key, value in row.items()}
+        assert deepest_category(view) == deepest_category(row)
+        assert store.deepest(position) == deepest_category(row)
+
+
+def test_names_are_interned_once():
+    rows = [{"Catid": str(i), "Root category": "Baby & kind"} for i in range(100)]
+    store = TaxonomyColumns.from_rows(rows)
+    assert store.names == ["", "Baby & kind"]
+    assert store.nbytes() < 100 * 40
+
+
+def test_non_numeric_catids_keep_the_int64_array():
+    rows = [{"Catid": catid, "Root category": ""} for catid in ("12", "007", "A-1", "", "13")]
+    store = TaxonomyColumns.from_rows(rows)
+    assert [view["Catid"] for view in store] == ["12", "007", "A-1", "", "13"]
+    assert store.catids.typecode == "q"
+    assert store.catid_text == {1: "007", 2: "A-1", 3: ""}
+    assert store.catid(-2) == ""
+    assert store[-1].get("Root category") == ""
+    assert store[-1].get("missing", "x") == "x"
+
+
+def test_bytes_round_trip():
+    for catids in (("1", "2", "3"), ("12", "007", "A-1")):
+        rows = [{"Catid": c, "Root category": "Wonen", "Sub category": "Bank" * i} for i, c in enumerate(catids)]
+        store = TaxonomyColumns.from_rows(rows)
+        copy = TaxonomyColumns.from_bytes(store.to_bytes())
+        assert [dict(view) for view in copy] == [dict(view) for view in store]
+        assert [copy.deepest(i) for i in range(len(copy))] == [store.deepest(i) for i in range(len(store))]
+
+
+def test_xlsx_cache_invalidates_on_change(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    from taxonomy import store as store_module
+    from taxonomy.synthetic import write_xlsx
+
+    rows = [{"Catid": "1", "Root category": "Wonen"}, {"Catid": "2", "Root category": "Tuin"}]
+    full = [dict({c: "" for c in store_module.TAXONOMY_COLUMNS}, **row) for row in rows]
+    workbook = tmp_path / "tree.xlsx"
+    cache_dir = tmp_path / "cache"
+    write_xlsx(full, workbook)
+
+    first = load_taxonomy_columns(workbook, cache_dir)
+    assert len(list(cache_dir.glob("*-tree-*.tcol"))) == 1
+
+    def no_parse(path):
+        raise AssertionError("workbook parsed despite cache")
+
+    monkeypatch.setattr(store_module.TaxonomyColumns, "from_file", classmethod(lambda cls, path: no_parse(path)))
+    cached = load_taxonomy_columns(workbook, cache_dir)
+    assert [dict(view) for view in cached] == [dict(view) for view in first]
+    monkeypatch.undo()
+
+    full[1]["Root category"] = "Tuin & terras"
+    write_xlsx(full, workbook)
+    changed = load_taxonomy_columns(workbook, cache_dir)
+    assert changed.deepest(1) == "Tuin & terras"
+    assert len(list(cache_dir.glob("*-tree-*.tcol"))) == 1
+
+
+def test_xlsx_cache_is_per_path(tmp_path):
+    pytest.importorskip("openpyxl")
+    from taxonomy import store as store_module
+    from taxonomy.synthetic import write_xlsx
+
+    cache_dir = tmp_path / "cache"
+    for year, name in (("2024", "Wonen"), ("2025", "Tuin")):
+        row = dict({c: "" for c in store_module.TAXONOMY_COLUMNS}, Catid="1", **{"Root category": name})
+        (tmp_path / year).mkdir()
+        write_xlsx([row], tmp_path / year / "tree.xlsx")
+        load_taxonomy_columns(tmp_path / year / "tree.xlsx", cache_dir)
+    assert len(list(cache_dir.glob("*.tcol"))) == 2
+    assert not list(cache_dir.glob(".*.tmp"))
+    assert load_taxonomy_columns(tmp_path / "2024" / "tree.xlsx", cache_dir).deepest(0) == "Wonen"
@@ -0,0 +1,40 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from pipeline.stub_server import StubConfig, SvgapiStub
+
+
+def search(stub, query, limit=10):
+    return requests.get(f"{stub.base_url}/v1/testkey/list/", params={"search": query, "limit": limit}, timeout=5)
+
+
+def test_recorded_search_and_download():
+    with SvgapiStub() as stub:
+        payload = search(stub, "baby").json()
+        assert [icon["id"] for icon in payload["icons"]] == ["33329", "40112", "41003"]
+        svg = requests.get(payload["icons"][0]["url"], timeout=5)
+        assert svg.status_code == 200
+        assert svg.text.startswith("<svg")
+
+
+def test_unrecorded_queries_are_deterministic():
+    with SvgapiStub(StubConfig(miss_rate=0.5)) as stub:
+        first = search(stub, "zwemluier klassiek").json()["icons"]
+        second = search(stub, "zwemluier klassiek").json()["icons"]
+        assert first == second
+        assert search(stub, "baby", limit=1).json()["icons"][0]["slug"] == "baby"
+
+
+def test_error_injection_and_throttling():
+    with SvgapiStub(StubConfig(error_rate=1.0)) as stub:
+        assert search(stub, "baby").status_code == 503
+    with SvgapiStub(StubConfig(rate_limit=0.001, burst=1)) as stub:
+        assert search(stub, "baby").status_code == 200
+        throttled = search(stub, "baby")
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "1"
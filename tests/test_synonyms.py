@@ -1,8 +1,19 @@
+import random
 import sys
 import pathlib
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
 
-from taxonomy.synonyms import build_queries
+from taxonomy.synonyms import (
+    BASIC_EN_SYNONYMS,
+    BASIC_NL_SYNONYMS,
+    EN,
+    NL,
+    build_queries,
+    detect_lang,
+    expand_tokens,
+    expand_tokens_reference,
+    tokenize,
+)
 
 def test_en_verb_expansion():
     q = build_queries("drill screws")
@@ -29,3 +40,56 @@ def test_nl_additional_verbs():
     top = q[0].split()
     assert any(t in top for t in ["handzaag", "decoupeerzaag"])
     assert any(t in top for t in ["schuurmachine", "schuurpapier"])
+
+
+def _lexicon_tokens(verbmap, basemap):
+    tokens = set()
+    for key, entry in verbmap.items():
+        tokens.update([key, key + "s", entry["lemma"]])
+        tokens.update(entry.get("nouns", []))
+        tokens.update(entry.get("synonyms", []))
+    for key, values in basemap.items():
+        tokens.update([key, key + "s"])
+        tokens.update(values)
+    return sorted(t for t in tokens if tokenize(t) == [t])
+
+
+def _plural_crossings(verbmap):
+    """``(plural, key)`` pairs where ``key`` names a plural the reference strips as input.
+
+    These are the inputs where the reference's set iteration order could
+    matter, so they are checked as multi-token inputs in both orders.
+    """
+    for key, entry in verbmap.items():
+        for token in [entry["lemma"]] + entry.get("nouns", []) + entry.get("synonyms", []):
+            if token not in verbmap and token.endswith("s") and token[:-1] in verbmap and token[:-1] != key:
+                yield token, key
+
+
+def test_expansion_index_matches_reference_over_lexicon():
+    for marker, verbmap, basemap in (("and", EN, BASIC_EN_SYNONYMS), ("voor", NL, BASIC_NL_SYNONYMS)):
+        for token in _lexicon_tokens(verbmap, basemap):
+            for tokens in ([token], [marker, token]):
+                if detect_lang(tokens) != detect_lang([marker]):
+                    continue
+                got = expand_tokens(tokens)
+                assert len(got) == len(set(got))
+                assert set(got) == set(expand_tokens_reference(tokens)), tokens
+
+
+def test_expansion_index_matches_reference_across_tokens():
+    rng = random.Random(0)
+    for marker, verbmap, basemap in (("and", EN, BASIC_EN_SYNONYMS), ("voor", NL, BASIC_NL_SYNONYMS)):
+        lexicon = _lexicon_tokens(verbmap, basemap)
+        inputs = [[marker] + rng.sample(lexicon, 3) for _ in range(2000)]
+        for plural, key in _plural_crossings(verbmap):
+            inputs += [[marker, plural, key], [marker, key, plural]]
+        for tokens in inputs:
+            assert set(expand_tokens(tokens)) == set(expand_tokens_reference(tokens)), tokens
+
+
+def test_expansion_is_deterministic_and_ordered_by_input():
+    tokens = tokenize("Schroeven en boren")
+    assert expand_tokens(tokens) == expand_tokens(list(tokens))
+    assert expand_tokens(tokens)[0] == "schroeven"
+    assert expand_tokens(["onbekendwoord"]) == ["onbekendwoord"]
@@ -0,0 +1,42 @@
+import sys
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from taxonomy.loader import TAXONOMY_COLUMNS, load_taxonomy_rows
+from taxonomy.synthetic import DEPTH_COLUMNS, Vocabulary, generate_rows, write_csv
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def vocabulary():
+    return Vocabulary.from_file(ROOT / "categories_250.csv")
+
+
+def test_same_seed_same_rows():
+    vocab = vocabulary()
+    first = list(generate_rows(500, vocab, seed=7))
+    assert first == list(generate_rows(500, vocab, seed=7))
+    assert first != list(generate_rows(500, vocab, seed=8))
+
+
+def test_rows_form_a_valid_preorder_tree():
+    rows = list(generate_rows(2000, vocabulary(), seed=1, depth_weights=(1, 1, 1, 1, 1, 1)))
+    previous = -1
+    seen_depths = set()
+    for row in rows:
+        filled = [depth for depth, column in enumerate(DEPTH_COLUMNS) if row[column]]
+        assert len(filled) == 1
+        assert filled[0] <= previous + 1
+        previous = filled[0]
+        seen_depths.add(filled[0])
+    assert seen_depths == set(range(6))
+    assert len({row["Catid"] for row in rows}) == len(rows)
+
+
+def test_csv_round_trips_through_loader(tmp_path):
+    rows = list(generate_rows(50, vocabulary(), seed=3, english_ratio=1.0))
+    target = tmp_path / "synthetic.csv"
+    assert write_csv(rows, target) == 50
+    loaded = load_taxonomy_rows(target)
+    assert list(loaded[0]) == TAXONOMY_COLUMNS
+    assert loaded == rows
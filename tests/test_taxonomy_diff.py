@@ -0,0 +1,86 @@
+import sys
+import csv
+import pathlib
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
+
+from taxonomy.diff import (
+    compare_taxonomies,
+    csv_entries,
+    diff_snapshots,
+    placements,
+    read_catid_filter,
+    row_entries,
+    row_hash,
+    snapshot,
+)
+from taxonomy.resolver import TaxonomyTree
+from taxonomy.store import TaxonomyColumns
+
+OLD_EXPORT = [
+    {"Catid": "1", "Root category": "Baby & kind"},
+    {"Catid": "2", "Root category": "Baby & kind", "Sub category": "Babymobielen"},
+    {"Catid": "3", "Root category": "Baby & kind", "Sub category": "Babyverzorging"},
+    {"Catid": "4", "Root category": "Baby & kind", "Sub category": "Babyverzorging", "Sub-sub category": "Babyzeep"},
+    {"Catid": "5", "Root category": "Baby & kind", "Sub category": "Wipstoelen"},
+]
+
+
+def test_diff_by_catid_and_row_hash():
+    old = snapshot([
+        {"Catid": "1", "Root category": "Baby & kind"},
+        {"Catid": "2", "Sub category": "Babymobielen"},
+        {"Catid": "3", "Sub category": "Wipstoelen"},
+    ])
+    new = snapshot([
+        {"Catid": "1", "Root category": "Baby & kind"},
+        {"Catid": "3", "Sub category": "Schommelstoelen"},
+        {"Catid": "4", "Sub category": "Boxen"},
+    ])
+    changes = diff_snapshots(old, new)
+    assert (changes.added, changes.removed, changes.changed) == (["4"], ["2"], ["3"])
+    assert changes.summary() == "1 added, 1 changed, 1 removed"
+    assert not diff_snapshots(new, dict(new))
+
+
+def test_row_hash_matches_for_columnar_rows():
+    row = {"Catid": "7", "Root category": "", "Sub category": "Babymobielen"}
+    store = TaxonomyColumns.from_rows([row], headers=list(row))
+    assert row_hash(store[0]) == row_hash(row)
+
+
+def test_compare_classifies_added_removed_renamed_and_moved():
+    new_export = [
+        {"Catid": "1", "Root category": "Baby & kind"},
+        {"Catid": "2", "Root category": "Baby & kind", "Sub category": "Babymobiles"},
+        {"Catid": "4", "Root category": "Baby & kind", "Sub category": "Babyzeep"},
+        {"Catid": "5", "Root category": "Baby & kind", "Sub category": "Wipstoelen"},
+        {"Catid": "6", "Root category": "Baby & kind", "Sub category": "Wipstoelen", "Sub-sub category": "Hoezen"},
+    ]
+    changes = compare_taxonomies(OLD_EXPORT, new_export)
+    assert (changes.added, changes.removed, changes.renamed, changes.moved) == (["6"], ["3"], ["2"], ["4"])
+    assert changes.catids() == ["6", "2", "4", "3"]
+    assert changes.summary() == "1 added, 1 removed, 1 renamed, 1 moved"
+    assert not compare_taxonomies(OLD_EXPORT, OLD_EXPORT)
+
+
+def test_csv_entries_match_row_entries(tmp_path):
+    path = tmp_path / "export.csv"
+    headers = ["Catid", "Root category", "Sub category", "Sub-sub category"]
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=headers, restval="")
+        writer.writeheader()
+        writer.writerows(OLD_EXPORT)
+    assert list(csv_entries(path)) == list(row_entries(OLD_EXPORT))
+    assert placements(csv_entries(path))["4"] == ("Babyzeep", 2, "3")
+
+
+def test_placements_follow_the_taxonomy_tree():
+    tree = TaxonomyTree(OLD_EXPORT)
+    assert placements(row_entries(OLD_EXPORT)) == {catid: tree.placement(catid) for catid in tree.index}
+    assert tree.placement("1") == ("Baby & kind", 0, "")
+
+
+def test_read_catid_filter_skips_blank_and_comment_lines(tmp_path):
+    path = tmp_path / "changed.txt"
+    path.write_text("# from taxonomy_diff.py\n2084\n\n 7123 \n2084\n", encoding="utf-8")
+    assert read_catid_filter(path) == {"2084", "7123"}